@@ -0,0 +1,21 @@
+import pytest
+from benchmarks.harness import compare_with_baseline
+
+
+def pytest_addoption(parser):
+    parser.addoption("--update-baselines", action="store_true", default=False,
+                     help="Store the results of the benchmarks as their new baselines instead of comparing with them.")
+
+
+@pytest.fixture
+def baseline(request, capsys):
+    """Function that compares the results of a benchmark with its baseline, and fails on regressions"""
+    update = request.config.getoption("--update-baselines")
+
+    def compare(name, results):
+        with capsys.disabled():
+            print("\n{0}: {1}".format(name, results))
+        regressions = compare_with_baseline(name, results, update)
+        assert not regressions, "Regressions in {0}: {1}".format(name, "; ".join(regressions))
+
+    return compare
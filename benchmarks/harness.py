@@ -0,0 +1,82 @@
+import json
+import os
+import time
+import tracemalloc
+
+
+baselines_dir = os.path.join(os.path.dirname(__file__), "baselines")
+
+# how much worse than the baseline a result may be before it counts as a regression, as a fraction of the
+# baseline. Throughput depends on the machine, so it gets the most leeway.
+tolerances = dict(checks_per_second=0.5, requests_per_check=0.0, peak_memory_kib_per_check=0.25)
+
+
+def measure(run, n_checks, mocker, repeat=5, n_traced=5):
+    """Measure how fast run checks repositories, how many requests it makes per check, and how much memory it
+    allocates at most per check.
+
+    Args:
+        run: Function that checks the number of repositories that it is called with.
+        n_checks: Number of repositories to time run with.
+        mocker: The :py:class:`requests_mock.Mocker` that answers the requests of run.
+        repeat: How often to time run. The fastest time counts, as the others were slowed down by something
+            else.
+        n_traced: How often to trace the memory of run checking a single repository. The highest peak counts.
+
+    Returns: A dictionary of checks_per_second, requests_per_check and peak_memory_kib_per_check
+    """
+    # the first run pays for compiling regular expressions and the like
+    run(n_checks)
+    mocker.reset_mock()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(n_checks)
+        timings.append(time.perf_counter() - start)
+    requests_per_check = mocker.call_count / (repeat * n_checks)
+
+    # tracing slows everything down, so it gets runs of its own, of one check each so that the peak is that of
+    # a single repository
+    peaks = []
+    for _ in range(n_traced):
+        tracemalloc.start()
+        try:
+            run(1)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+
+    return dict(checks_per_second=round(n_checks / min(timings), 1),
+                requests_per_check=round(requests_per_check, 2),
+                peak_memory_kib_per_check=round(max(peaks) / 1024, 1))
+
+
+def compare_with_baseline(name, results, update=False):
+    """Compare results with the baseline results of benchmark name in baselines/, or make them the baseline.
+
+    Returns: A list of the ways in which results are worse than the baseline, beyond the tolerances.
+    """
+    filename = os.path.join(baselines_dir, name + ".json")
+    if update:
+        os.makedirs(baselines_dir, exist_ok=True)
+        with open(filename, "wt") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+        return []
+
+    if not os.path.exists(filename):
+        return ["There is no baseline for {0}, make one with --update-baselines.".format(name)]
+
+    with open(filename, "rt") as f:
+        baseline = json.load(f)
+
+    regressions = []
+    if results["checks_per_second"] < baseline["checks_per_second"] * (1 - tolerances["checks_per_second"]):
+        regressions.append("{0} checks per second, down from {1}"
+                           .format(results["checks_per_second"], baseline["checks_per_second"]))
+    for metric, description in [("requests_per_check", "requests per check"),
+                                ("peak_memory_kib_per_check", "KiB of memory at most per check")]:
+        if results[metric] > baseline[metric] * (1 + tolerances[metric]):
+            regressions.append("{0} {1}, up from {2}".format(results[metric], description, baseline[metric]))
+    return regressions
@@ -0,0 +1,33 @@
+"""Responses for the URLs that a full check touches, on top of those that the mockers in tests/ provide"""
+
+readme = "# badge\n\n" + \
+         "[![PyPI](https://img.shields.io/pypi/v/badge.svg)](https://pypi.org/project/badge/)\n" + \
+         "[![DOI](https://zenodo.org/badge/DOI/10.5281/zenodo.4014731.svg)]" + \
+         "(https://doi.org/10.5281/zenodo.4014731)\n" + \
+         "[![fair-software.eu](https://img.shields.io/badge/fair--software.eu-" + \
+         "%E2%97%8F%20%20%E2%97%8F%20%20%E2%97%8F%20%20%E2%97%8F%20%20%E2%97%8B-yellow)]" + \
+         "(https://fair-software.eu)\n\n" + \
+         "Lorem ipsum dolor sit amet, consectetur adipiscing elit.\n" * 200
+
+filenames = ["README.md", "LICENSE", "CITATION.cff", "setup.py", ".zenodo.json"]
+
+
+def complete_github_badge(m):
+    """Add what a check of https://github.com/fair-software/badge needs to the mocker from
+    tests/github/fair_software/badge/mocker.py"""
+    m.get("https://api.github.com/repos/fair-software/badge/contents",
+          json=[dict(name=filename, type="file") for filename in filenames] + [dict(name="docs", type="dir")])
+    m.get("https://raw.githubusercontent.com/fair-software/badge/master/README.md", text=readme)
+    m.head("https://api.github.com/repos/fair-software/badge/license")
+    return m
+
+
+def complete_gitlab_badge_test(m):
+    """Add what a check of https://gitlab.com/jspaaks/badge-test needs to the mocker from
+    tests/gitlab/jspaaks/badge_test/mocker.py"""
+    m.get("https://gitlab.com/api/v4/projects/jspaaks%2Fbadge-test/repository/tree",
+          json=[dict(name=filename, type="blob") for filename in filenames] + [dict(name="docs", type="tree")])
+    m.get("https://gitlab.com/jspaaks/badge-test/-/raw/master/README.md", text=readme)
+    m.get("https://gitlab.com/api/v4/projects/jspaaks%2Fbadge-test?license=true",
+          json=dict(license=dict(key="apache-2.0", name="Apache License 2.0")))
+    return m
@@ -0,0 +1,37 @@
+from howfairis import Compliance
+from howfairis import NullReporter
+from howfairis import Session
+from howfairis.batch import check_repositories
+from howfairis.batch import check_repository
+from benchmarks.harness import measure
+from benchmarks.mocks import complete_gitlab_badge_test
+from tests.gitlab.jspaaks.badge_test.mocker import mocker
+
+
+url = "https://gitlab.com/jspaaks/badge-test"
+expected_compliance = Compliance(repository=True, license_=True, registry=True, citation=True, checklist=False)
+
+
+def test_gitlab_single(mocker, baseline):
+    complete_gitlab_badge_test(mocker)
+    n_checks = 20
+
+    def run(n):
+        for _ in range(n):
+            result = check_repository(url, session=Session(), reporter=NullReporter())
+            assert result.ok and result.compliance == expected_compliance
+
+    with mocker:
+        baseline("gitlab_single", measure(run, n_checks, mocker))
+
+
+def test_gitlab_batch(mocker, baseline):
+    complete_gitlab_badge_test(mocker)
+    n_checks = 100
+
+    def run(n):
+        results = list(check_repositories([url] * n, max_workers=8, reporter=NullReporter()))
+        assert all(result.ok and result.compliance == expected_compliance for result in results)
+
+    with mocker:
+        baseline("gitlab_batch", measure(run, n_checks, mocker))
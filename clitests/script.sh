@@ -11,37 +11,24 @@ howfairis --help
 howfairis --version
 howfairis --show-default-config
 
-DURATION=20
+# howfairis waits by itself when the rate limits of GitHub or GitLab are reached
 
 # github
 howfairis https://github.com/fair-software/badge-test
-sleep $DURATION
 howfairis https://github.com/fair-software/badge-test -p force/00100
-sleep $DURATION
 howfairis https://github.com/fair-software/badge-test -p force/10110
-sleep $DURATION
 howfairis https://github.com/fair-software/badge-test -p force/11110
-sleep $DURATION
 howfairis https://github.com/fair-software/badge-test -p force/11111
-sleep $DURATION
 howfairis https://github.com/fair-software/badge-test -p force/uu1uu
-sleep $DURATION
 howfairis https://github.com/fair-software/badge-test -p include_comments
-sleep $DURATION
 
 
 # gitlab
 howfairis https://gitlab.com/jspaaks/badge-test
-sleep $DURATION
 howfairis https://gitlab.com/jspaaks/badge-test -p force/00100
-sleep $DURATION
 howfairis https://gitlab.com/jspaaks/badge-test -p force/10110
-sleep $DURATION
 howfairis https://gitlab.com/jspaaks/badge-test -p force/11110
-sleep $DURATION
 howfairis https://gitlab.com/jspaaks/badge-test -p force/11111
-sleep $DURATION
 howfairis https://gitlab.com/jspaaks/badge-test -p force/uu1uu
-sleep $DURATION
 howfairis https://gitlab.com/jspaaks/badge-test -p include_comments
 
@@ -3,7 +3,13 @@ from .checker import Checker
 from .code_repository_platforms import Platform
 from .compliance import Compliance
 from .config import Config
+from .organisation import Organisation
 from .repo import Repo
+from .reporters import CollectingReporter
+from .reporters import ConsoleReporter
+from .reporters import NullReporter
+from .reporters import Reporter
+from .session import Session
 
 
 __author__ = "https://github.com/jspaaks"
@@ -12,8 +18,14 @@ __email__ = 'j.spaaks@esciencecenter.nl'
 __all__ = [
     "__version__",
     "Checker",
+    "CollectingReporter",
     "Compliance",
     "Config",
+    "ConsoleReporter",
+    "NullReporter",
+    "Organisation",
     "Platform",
-    "Repo"
+    "Repo",
+    "Reporter",
+    "Session"
 ]
@@ -0,0 +1,310 @@
+import asyncio
+import io
+import json
+import requests
+from howfairis.async_config import AsyncConfig
+from howfairis.async_repo import AsyncRepo
+from howfairis.async_repo import new_client
+from howfairis.batch import BatchResult
+from howfairis.checker import Checker
+from howfairis.code_repository_platforms import Platform
+from howfairis.compliance import Compliance
+from howfairis.mixins.registry_mixin import MarkerScanner
+from howfairis.mixins.registry_mixin import marketplace_markers
+from howfairis.ratelimit import RateLimiter
+from howfairis.readme import Readme
+from howfairis.readme import readme_filenames
+from howfairis.reporters import CollectingReporter
+from howfairis.reporters import ConsoleReporter
+
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+# pylint: disable=invalid-overridden-method
+class AsyncChecker(Checker):
+    """Asynchronous counterpart of :py:class:`Checker`, for use from asyncio code.
+
+    Construct it with ``await AsyncChecker.create(...)``, which lists the files of the repository and retrieves
+    the README without blocking the event loop. The checks run the same sub-checks as those of
+    :py:class:`Checker`, and the sub-checks that need the network are coroutines that make their requests with
+    the client of the repo, so the :py:class:`Compliance` and :py:attr:`Checker.sub_checks` are the same. A
+    sub-check whose request times out or fails for another reason than that a file does not exist is reported
+    as unfinished. The five recommendations and all of their sub-checks run at the same time, and are reported
+    in the same order as by :py:class:`Checker`.
+
+    Args:
+        config: Configuration to use
+        repo: Repository to check
+        reporter: :py:class:`howfairis.reporters.Reporter` to send the progress and the state of each sub-check
+            to, like for :py:class:`Checker`.
+
+    """
+
+    def __init__(self, config: AsyncConfig, repo: AsyncRepo, reporter=None):
+        super().__init__(config, repo, reporter=reporter)
+        self._collectors = dict()
+
+    @property
+    def _reporter(self):
+        # checks that run at the same time each report to a reporter of their own, which is replayed afterwards
+        collector = self._collectors.get(_current_task())
+        return self.reporter if collector is None else collector
+
+    @classmethod
+    async def create(cls, config: AsyncConfig, repo: AsyncRepo, reporter=None):
+        """Create a checker, list the files of the repository and retrieve its README.
+
+        Returns: An :py:class:`AsyncChecker`
+        """
+        checker = cls(config, repo, reporter)
+        await checker._async_prefetch()
+        return checker
+
+    async def _async_prefetch(self):
+        try:
+            self.files.filenames = await self.repo.list_files()
+        except asyncio.TimeoutError:
+            # the files are then asked for one by one, as when the directory could not be listed
+            self.files.filenames = None
+        try:
+            self.readme = await self._async_get_readme()
+        except (asyncio.TimeoutError, aiohttp.ClientResponseError) as e:
+            # whether the README has a badge is unknown, see Checker._eval_badge
+            self._reporter.message("Could not retrieve the README: {0!r}".format(e))
+            self.readme = Readme(filename=None, text=None, fmt=None)
+            self._readme_failed = True
+
+    async def _async_get_readme(self):
+        filenames = self.files.filenames
+        if filenames is None:
+            candidates = readme_filenames
+        else:
+            candidates = [f for f in readme_filenames if f in filenames]
+        if len(candidates) > 0:
+            # all requests are in flight at the same time, like those of Checker._get_first_readme
+            tasks = [asyncio.ensure_future(self.repo.fetch_text(self.repo.raw_url_format_string.format(f)))
+                     for f in candidates]
+            await asyncio.wait(tasks)
+            # take the candidates in order of preference, the first one that exists wins
+            for readme_filename, task in zip(candidates, tasks):
+                text = task.result()
+                if text is not None:
+                    return self._make_readme(readme_filename, text)
+
+        self._reporter.message("Did not find a README file at " + self.repo.get_location(""))
+
+        return Readme(filename=None, text=None, fmt=None)
+
+    def _get_readme(self):
+        # the README is retrieved asynchronously by create()
+        return Readme(filename=None, text=None, fmt=None)
+
+    async def _async_run_checks(self, checks):
+        # the counterpart of Checker._run_checks, for coroutines
+        async def run(check):
+            task = _current_task()
+            collector = CollectingReporter()
+            self._collectors[task] = collector
+            try:
+                return await check, collector
+            finally:
+                del self._collectors[task]
+
+        reporter = self._reporter
+        results = []
+        # gather keeps the order of checks, regardless of which finished first, and so does the replay
+        for result, collector in await asyncio.gather(*[run(check) for check in checks]):
+            collector.replay(reporter)
+            results.append(result)
+        return results
+
+    async def _async_run_sub_checks(self, sub_checks):
+        return await self._async_run_checks([self._async_run_sub_check(sub_check) for sub_check in sub_checks])
+
+    async def _async_run_sub_check(self, sub_check):
+        state = await self._async_get_sub_check_state(sub_check)
+        self.sub_checks[sub_check.__name__] = state
+        return state
+
+    async def _async_get_sub_check_state(self, sub_check):
+        check_name = sub_check.__name__
+        is_settled, state = self._get_settled_state(check_name)
+        if is_settled:
+            return state
+        try:
+            state = sub_check()
+            # the sub-checks that need the network return a coroutine
+            return await state if asyncio.iscoroutine(state) else state
+        except (asyncio.TimeoutError, aiohttp.ClientResponseError, requests.Timeout, requests.HTTPError):
+            return self._set_unfinished(check_name)
+
+    async def check_five_recommendations(self):
+        """Check the repo against the five FAIR software recommendations
+
+        Returns: A :py:class:`Compliance`
+        """
+        self._unfinished = set()
+        self.sub_checks = dict()
+        repository, license_, registry, citation, checklist = await self._async_run_checks([self.check_repository(),
+                                                                                            self.check_license(),
+                                                                                            self.check_registry(),
+                                                                                            self.check_citation(),
+                                                                                            self.check_checklist()])
+        return Compliance(repository=repository,
+                          license_=license_,
+                          registry=registry,
+                          citation=citation,
+                          checklist=checklist,
+                          unfinished=sorted(self._unfinished))
+
+    async def check_repository(self):
+        force_state = self._force_state(self.config.force_repository, 1, "repository")
+        if isinstance(force_state, bool):
+            return force_state
+        results = await self._async_run_sub_checks(self._repository_sub_checks())
+        return True in results
+
+    async def check_license(self):
+        force_state = self._force_state(self.config.force_license, 2, "license")
+        if isinstance(force_state, bool):
+            return force_state
+        results = await self._async_run_sub_checks(self._license_sub_checks())
+        return True in results
+
+    async def check_registry(self):
+        force_state = self._force_state(self.config.force_registry, 3, "registry")
+        if isinstance(force_state, bool):
+            return force_state
+        results = await self._async_run_sub_checks(self._registry_sub_checks())
+        return True in results
+
+    async def check_citation(self):
+        force_state = self._force_state(self.config.force_citation, 4, "citation")
+        if isinstance(force_state, bool):
+            return force_state
+        results = await self._async_run_sub_checks(self._citation_sub_checks())
+        return True in results
+
+    async def check_checklist(self):
+        force_state = self._force_state(self.config.force_checklist, 5, "checklist")
+        if isinstance(force_state, bool):
+            return force_state
+        results = await self._async_run_sub_checks(self._checklist_sub_checks())
+        return True in results
+
+    async def _eval_file_exists(self, filename, check_name):
+        exists = self.files.exists(filename)
+        if exists is None:
+            # the directory could not be listed, ask for the file itself
+            exists = await self.repo.is_found(self.repo.raw_url_format_string.format(filename))
+        self._reporter.sub_check(check_name, exists)
+        return exists
+
+    async def has_open_repository(self):
+        if self.files.filenames is not None:
+            # the files could be listed, so the repository is accessible
+            self._reporter.sub_check("has_open_repository", True)
+            return True
+
+        if self.repo.platform == Platform.GITHUB:
+            url = self.repo.api
+        else:
+            url = self.repo.api + "/repository/tree"
+
+        r = await self.repo.is_found(url)
+        self._reporter.sub_check("has_open_repository", r)
+        return r
+
+    async def has_license(self):
+        r = False
+
+        if self.repo.platform == Platform.GITHUB:
+            r = await self.repo.is_found(self.repo.api + "/license")
+
+        if self.repo.platform == Platform.GITLAB:
+            text = await self.repo.fetch_text(self.repo.api, params=dict(license="true"))
+            try:
+                r = None if text is None else self._gitlab_project_has_license(json.loads(text))
+            except ValueError:
+                r = None
+            if r is None:
+                # the API did not tell, fall back on the project page
+                url = "https://gitlab.com/{0}/{1}".format(self.repo.owner, self.repo.repo)
+                html = await self.repo.fetch_text(url)
+                r = self._gitlab_html_has_license(html)
+
+        self._reporter.sub_check("has_license", r)
+        return r
+
+    async def is_on_github_marketplace(self):
+        r = False
+
+        if self.repo.platform == Platform.GITHUB and self._may_be_github_action() is not False:
+            scanner = MarkerScanner(marketplace_markers)
+            r = await self.repo.scan(self.repo.url, scanner) and scanner.found_all
+
+        self._reporter.sub_check("is_on_github_marketplace", r)
+        return r
+
+
+def _current_task():
+    # asyncio.current_task is new in Python 3.7
+    if hasattr(asyncio, "current_task"):
+        return asyncio.current_task()
+    return asyncio.Task.current_task()  # pylint: disable=no-member
+
+
+# pylint: disable=too-many-arguments
+async def check_repository_async(url, client, branch=None, path=None, remote_config_file=None, config_file=None,
+                                 ignore_remote_config=False, rate_limiter=None):
+    """Asynchronous counterpart of :py:func:`howfairis.batch.check_repository`. Pass the same
+    :py:class:`howfairis.ratelimit.RateLimiter` as rate_limiter to checks that share a quota.
+
+    Returns: A :py:class:`howfairis.batch.BatchResult`
+    """
+    result = BatchResult(url)
+    output = io.StringIO()
+    reporter = ConsoleReporter(output)
+    try:
+        repo = await AsyncRepo.create(url, branch, path, remote_config_file, client=client, rate_limiter=rate_limiter)
+        config = await AsyncConfig.create(repo, config_file, ignore_remote_config, reporter)
+        checker = await AsyncChecker.create(config, repo, reporter)
+        result.compliance = await checker.check_five_recommendations()
+        result.sub_checks = checker.sub_checks
+        result.readme = checker.readme
+        result.badge = result.compliance.calc_badge(checker.readme.fmt)
+    except Exception as e:  # pylint: disable=broad-except
+        result.error = e
+    result.output = output.getvalue()
+    return result
+
+
+async def check_repositories_async(urls, client=None, max_concurrency=100, **kwargs):
+    """Check many repositories concurrently from a single event loop.
+
+    Args:
+        urls: Iterable of repository URLs.
+        client: :py:class:`aiohttp.ClientSession` to share between all checks. If None, one is created
+            and closed again when all checks are done.
+        max_concurrency: Number of repositories that are checked at the same time.
+        **kwargs: Passed on to :py:func:`check_repository_async` for each URL. All checks share one
+            :py:class:`howfairis.ratelimit.RateLimiter`, unless kwargs has one.
+
+    Returns: A list with one :py:class:`howfairis.batch.BatchResult` per URL, in the order of urls.
+    """
+    if client is None:
+        async with new_client() as client:
+            return await check_repositories_async(urls, client, max_concurrency, **kwargs)
+
+    kwargs.setdefault("rate_limiter", RateLimiter())
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def check(url):
+        async with semaphore:
+            return await check_repository_async(url, client, **kwargs)
+
+    return await asyncio.gather(*[check(url) for url in urls])
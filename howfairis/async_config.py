@@ -0,0 +1,50 @@
+from howfairis.async_repo import AsyncRepo
+from howfairis.config import Config
+
+
+class AsyncConfig(Config):
+    """Asynchronous counterpart of :py:class:`Config`, for use from asyncio code.
+
+    Construct it with ``await AsyncConfig.create(...)``, which retrieves the configuration file on the remote
+    without blocking the event loop.
+
+    Args:
+        repo: Repository which is used to fetch config from
+        config_filename: Default is ".howfairis.yml"
+        ignore_remote_config: If true then does not try to merge config from remote repository.
+        reporter: :py:class:`howfairis.reporters.Reporter` to tell which configuration files are used.
+    """
+
+    @classmethod
+    async def create(cls, repo: AsyncRepo, config_filename=None, ignore_remote_config=False, reporter=None):
+        """Create a config, including the configuration from the remote.
+
+        Returns: An :py:class:`AsyncConfig`
+        """
+        config = cls(None, config_filename, reporter=reporter)
+        config._repo = await AsyncConfig._async_load_repo_config(repo, ignore_remote_config, config.reporter)
+        config._merged = config._merge_configurations()
+        return config
+
+    @staticmethod
+    async def _async_load_repo_config(repo, ignore_remote_config, reporter):
+        if repo is None:
+            return dict()
+
+        if ignore_remote_config is True:
+            return dict()
+
+        if repo.config_file is None:
+            config_filename = ".howfairis.yml"
+        else:
+            config_filename = repo.config_file
+
+        raw_url = repo.raw_url_format_string.format(config_filename)
+        text = await repo.fetch_text(raw_url)
+        if text is None:
+            if repo.config_file is not None:
+                raise Exception("Could not find the configuration file {0}".format(raw_url))
+            return dict()
+        reporter.message("Using the configuration file {0}".format(raw_url))
+
+        return Config._parse_repo_config(text, raw_url, reporter)
@@ -0,0 +1,184 @@
+import asyncio
+import json
+import random
+from howfairis.code_repository_platforms import Platform
+from howfairis.file_index import FileIndex
+from howfairis.ratelimit import RateLimiter
+from howfairis.ratelimit import RateLimitExceeded
+from howfairis.repo import Repo
+from howfairis.session import Session
+
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncRepo(Repo):
+    """Asynchronous counterpart of :py:class:`Repo`, for use from asyncio code.
+
+    Construct it with ``await AsyncRepo.create(...)``, which looks up the default branch without blocking
+    the event loop. If a branch is given, the default branch is not looked up at all.
+
+    Requests are scheduled by a :py:class:`RateLimiter` and sent again after a failure like those of a
+    :py:class:`Session`. How long they may take is up to the client, see :py:func:`new_client`.
+
+    Args:
+        url: URL of repository. For example https://github.com/fair-software/howfairis
+        branch: Branch to checkout. Defaults to default branch of the repository platform.
+            Can also be a commit SHA-1 hash or tag.
+        path: Path inside repository. Defaults to root.
+        config_file: Name of the configuration file to control the behavior of the howfairis package.
+        client: :py:class:`aiohttp.ClientSession` used for all requests about this repository. See
+            :py:func:`new_client`.
+        rate_limiter: :py:class:`RateLimiter` that schedules the requests. Pass the same one to repos that
+            share a quota. Defaults to a new one.
+        retries: How often to send a request again after it failed because of the connection or a server error.
+        backoff: Seconds to wait at most before the first new attempt.
+
+    """
+    def __init__(self, url: str, branch=None, path=None, config_file=None, client=None, rate_limiter=None,
+                 retries=2, backoff=0.5):
+        self.client = client
+        self.rate_limiter = RateLimiter() if rate_limiter is None else rate_limiter
+        self.retries = retries
+        self.backoff = backoff
+        super().__init__(url, branch, path, config_file)
+
+    @classmethod
+    async def create(cls, url: str, branch=None, path=None, config_file=None, client=None, rate_limiter=None):
+        """Create a repo and resolve its default branch.
+
+        Returns: An :py:class:`AsyncRepo`
+        """
+        assert client is not None, "Expected an aiohttp client session, see howfairis.async_repo.new_client()."
+        repo = cls(url, branch, path, config_file, client, rate_limiter)
+        if branch is None:
+            repo.default_branch = await repo._async_get_default_branch()
+        return repo
+
+    async def _async_get_default_branch(self):
+        fallback_branch = 'main'
+        # GitHub API and GitLab API work the same
+        async with await self._request("GET", self.api) as response:
+            if response.status == 404:
+                return fallback_branch
+            # any other failure, such as a server error, does not mean that there is no default branch
+            response.raise_for_status()
+            data = await response.json()
+        return data.get("default_branch", fallback_branch)
+
+    def _get_default_branch(self):
+        # the default branch is looked up asynchronously by create()
+        return None
+
+    async def _request(self, method, url, **kwargs):
+        # the counterpart of Session._send_over_network; only GET and HEAD requests are made, so all may be retried
+        n_throttled = 0
+        n_failed = 0
+        while True:
+            await asyncio.sleep(self.rate_limiter.reserve(url))
+            try:
+                response = await self.client.request(method, url, **kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if n_failed >= self.retries:
+                    raise
+                n_failed += 1
+                await self._back_off(n_failed)
+                continue
+
+            if self.rate_limiter.update_from_headers(url, response.status, response.headers):
+                n_throttled += 1
+                response.release()
+                if n_throttled >= Session.max_throttled_attempts:
+                    raise RateLimitExceeded("Request for {0} was throttled {1} times in a row."
+                                            .format(url, n_throttled))
+                continue
+
+            if response.status in Session.retry_status_codes and n_failed < self.retries:
+                n_failed += 1
+                response.release()
+                await self._back_off(n_failed)
+                continue
+
+            return response
+
+    async def _back_off(self, n_failed):
+        # full jitter, like Session
+        await asyncio.sleep(random.uniform(0, self.backoff * 2 ** (n_failed - 1)))
+
+    async def fetch_text(self, url, params=None):
+        """Retrieve the body at url. Raises :py:class:`aiohttp.ClientResponseError` if the request failed for
+        another reason than that the body does not exist, such as a server error.
+
+        Returns: The body as text, or None if it could not be found.
+        """
+        async with await self._request("GET", url, params=params) as response:
+            if response.status == 404:
+                return None
+            response.raise_for_status()
+            return await response.text()
+
+    async def scan(self, url, scanner):
+        """Feed the body at url to scanner chunk by chunk, until the scanner has seen enough. Raises like
+        :py:meth:`fetch_text`.
+
+        Returns: Whether the body could be found.
+        """
+        async with await self._request("GET", url) as response:
+            if response.status == 404:
+                return False
+            response.raise_for_status()
+            async for chunk in response.content.iter_chunked(scanner.chunk_size):
+                if scanner.feed(chunk):
+                    break
+        return True
+
+    async def is_found(self, url):
+        """Whether the body at url can be found. Does not download the body. Raises like :py:meth:`fetch_text`."""
+        async with await self._request("HEAD", url, allow_redirects=True) as response:
+            status = response.status
+            if status not in [404, 405, 501]:
+                response.raise_for_status()
+        if status in [405, 501]:
+            # the host does not support HEAD, hang up on a GET as soon as the headers are in
+            async with await self._request("GET", url) as response:
+                status = response.status
+                if status != 404:
+                    response.raise_for_status()
+        return status != 404
+
+    async def list_files(self):
+        """Names of the files in the directory at the path of the repository, like :py:class:`FileIndex` lists
+        them.
+
+        Returns: A set, or None if the directory could not be listed.
+        """
+        if self.platform == Platform.GITHUB:
+            text = await self.fetch_text(self.api + "/contents" + self.path, params=dict(ref=self.ref))
+            return None if text is None else FileIndex.parse_github_contents(json.loads(text))
+
+        params = dict(ref=self.ref, path=self.path.lstrip("/"), per_page=100, page=1)
+        filenames = set()
+        while True:
+            async with await self._request("GET", self.api + "/repository/tree", params=params) as response:
+                if response.status >= 400:
+                    return None
+                filenames.update(FileIndex.parse_gitlab_tree(await response.json()))
+                next_page = response.headers.get("X-Next-Page", "")
+            if next_page == "":
+                return filenames
+            params["page"] = int(next_page)
+
+
+def new_client(**kwargs):
+    """Create an :py:class:`aiohttp.ClientSession`. The caller is responsible for closing it.
+
+    Unless kwargs say otherwise, connections and reads time out like those of a :py:class:`Session`. Must be
+    called from within a running event loop.
+    """
+    if aiohttp is None:
+        raise ImportError("The asynchronous API needs aiohttp. Install it with: pip install howfairis[async]")
+    kwargs.setdefault("timeout", aiohttp.ClientTimeout(sock_connect=5, sock_read=30))
+    return aiohttp.ClientSession(**kwargs)
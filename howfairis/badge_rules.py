@@ -0,0 +1,89 @@
+import re
+
+
+# For each badge check, the patterns of which at least one has to occur in the README for the check to pass
+rules = {
+    # registry
+    "has_ascl_badge": [r"https://img\.shields\.io/badge/ascl.*"],
+    "has_bintray_badge": [r"https://api\.bintray\.com/packages/.*/.*/.*/images/download\.svg",
+                          r"https://img\.shields\.io/bintray/.*"],
+    "has_conda_badge": [r"https://anaconda\.org/.*/.*/badges/downloads\.svg",
+                        r"https://anaconda\.org/.*/.*/badges/installer/conda\.svg",
+                        r"https://anaconda\.org/.*/.*/badges/latest_release_date\.svg",
+                        r"https://anaconda\.org/.*/.*/badges/latest_release_relative_date\.svg",
+                        r"https://anaconda\.org/.*/.*/badges/platforms\.svg",
+                        r"https://anaconda\.org/.*/.*/badges/version\.svg",
+                        r"https://img\.shields\.io/conda/.*"],
+    "has_cran_badge": [r"https://cranlogs\.r-pkg\.org/badges/.*",
+                       r"https://www\.r-pkg\.org/badges/.*",
+                       r"https://img\.shields\.io/cran/.*"],
+    "has_crates_badge": [r"https://badgen.net/crates/v/.*",
+                         r"https://img\.shields\.io/crates/.*"],
+    "has_maven_badge": [r"https://badgen.net/maven/v/maven-central/.*",
+                        r"https://img\.shields\.io/maven-central/.*",
+                        r"https://img\.shields\.io/maven-metadata/.*"],
+    "has_npm_badge": [r"https://badge.fury.io/js/.*",
+                      r"https://badgen.net/npm/v/.*",
+                      r"https://img\.shields\.io/npm/.*"],
+    "has_pypi_badge": [r"https://pypi\.python\.org/pypi/",
+                       r"https://badge\.fury\.io/py/.*\.svg",
+                       r"https://badgen\.net/pypi/v/.*",
+                       r"https://img\.shields\.io/pypi/.*"],
+    "has_rsd_badge": [r"https://img\.shields\.io/badge/RSD-.*",
+                      r"https://img\.shields\.io/badge/rsd-.*"],
+    # citation
+    "has_zenodo_badge": [r"https://zenodo\.org/badge/DOI/10\.5281/zenodo\.[0-9]*\.svg",
+                         r"https://zenodo\.org/badge/[0-9]*\.svg"],
+    # checklist
+    "has_core_infrastructures_badge": [r"https://bestpractices\.coreinfrastructure\.org/projects/[0-9]*/badge"]
+}
+
+
+class BadgeMatcher:
+    """Finds out which of the badge rules match the links in a README
+
+    The patterns are grouped by the host they start with, so only the links to hosts that serve badges are
+    looked at, and each of those only against the few patterns for its host.
+
+    Args:
+        badge_rules: Dictionary of check name to list of patterns, like :py:data:`rules`. Every pattern has
+            to start with https:// and a literal host name.
+
+    """
+
+    def __init__(self, badge_rules):
+        self._n_checks = len(badge_rules)
+        self._rules_by_host = dict()
+        for check_name, regexes in badge_rules.items():
+            for regex in regexes:
+                host = BadgeMatcher._get_host(regex)
+                self._rules_by_host.setdefault(host, []).append((check_name, re.compile(regex)))
+
+    @staticmethod
+    def _get_host(regex):
+        matched = re.match(r"https://((?:[a-z0-9-]|\\?\.)+)/", regex)
+        if matched is None:
+            raise ValueError("Pattern {0} does not start with a host name.".format(regex))
+        return matched.group(1).replace("\\.", ".")
+
+    def match(self, links):
+        """Names of the checks for which at least one pattern matches one of the links.
+
+        Args:
+            links: Dictionary of host name to list of URLs, like the one made by
+                :py:func:`howfairis.links.index_links`.
+
+        Returns: A set of check names
+        """
+        matched = set()
+        for host, host_rules in self._rules_by_host.items():
+            for url in links.get(host, []):
+                for check_name, pattern in host_rules:
+                    if check_name not in matched and pattern.match(url) is not None:
+                        matched.add(check_name)
+            if len(matched) == self._n_checks:
+                break
+        return matched
+
+
+matcher = BadgeMatcher(rules)
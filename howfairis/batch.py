@@ -0,0 +1,163 @@
+import io
+import time
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+from concurrent.futures import wait
+import requests
+from howfairis.checker import Checker
+from howfairis.config import Config
+from howfairis.profiling import measure
+from howfairis.repo import Repo
+from howfairis.reporters import ConsoleReporter
+from howfairis.session import Session
+from howfairis.session import within_deadline
+
+
+class BatchResult:
+    """Outcome of checking one repository as part of a batch
+
+    Attributes:
+        url: URL of the repository that was checked
+        compliance (Optional[Compliance]): The calculated compliance, None if the check failed.
+        badge (Optional[str]): Badge for the calculated compliance, formatted like the README.
+        readme (Optional[Readme]): README retrieved from the repository.
+        branch (Optional[str]): Branch, tag or commit that was checked, the default branch if none was given.
+        sha (Optional[str]): Commit SHA-1 hash that was checked, if it was looked up.
+        sub_checks (dict): State of each sub-check that was run, by check name, like
+            :py:attr:`Checker.sub_checks`.
+        output (str): Everything the check reported while running, as it would have been printed.
+        error (Optional[Exception]): Exception that stopped the check, None if it completed.
+    """
+
+    def __init__(self, url, compliance=None, badge=None, readme=None, output="", error=None):
+        self.url = url
+        self.compliance = compliance
+        self.badge = badge
+        self.readme = readme
+        self.branch = None
+        self.sha = None
+        self.sub_checks = dict()
+        self.output = output
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def as_dict(self):
+        """Everything about the result that can be represented in JSON, leaving out the output.
+
+        Returns: A dictionary
+        """
+        return dict(url=self.url,
+                    branch=self.branch,
+                    sha=self.sha,
+                    compliance=None if self.compliance is None else self.compliance.as_dict(),
+                    sub_checks=dict(sorted(self.sub_checks.items())),
+                    unfinished=[] if self.compliance is None else self.compliance.unfinished,
+                    readme=None if self.readme is None else self.readme.filename,
+                    badge=self.badge,
+                    error=None if self.error is None else "{0}: {1}".format(type(self.error).__name__, self.error))
+
+
+# pylint: disable=too-many-arguments
+def check_repository(url, branch=None, path=None, remote_config_file=None, config_file=None,
+                     ignore_remote_config=False, session=None, parallel=False, result_cache=None, deadline=None,
+                     prefetched=None, checkout=None, offline=False, with_sha=False, reporter=None, profile=None):
+    """Run the Repo -> Config -> Checker pipeline for a single repository.
+
+    Anything that goes wrong is recorded on the result instead of being raised. If prefetched is a
+    :py:class:`howfairis.github_graphql.RepositoryData`, only the requests that it does not answer are made.
+    If with_sha is True, the commit SHA-1 hash that was checked is recorded as well, which takes an extra
+    request if it is not known already. What the check reports is kept in :py:attr:`BatchResult.output`, unless
+    a :py:class:`howfairis.reporters.Reporter` is given to send it to instead. If profile is a
+    :py:class:`howfairis.profiling.Profile`, the check is measured as phase check_repository, and its sub-checks
+    and the steps around them each as a phase of their own. The deadline, if any, covers retrieving the
+    configuration file on the remote as well as the checks.
+
+    Returns: A :py:class:`BatchResult`
+    """
+    result = BatchResult(url)
+    output = io.StringIO()
+    if reporter is None:
+        reporter = ConsoleReporter(output)
+    deadline_at = None if deadline is None else time.monotonic() + deadline
+    with measure("check_repository", profile), within_deadline(deadline_at):
+        try:
+            repo = Repo(url, branch, path, remote_config_file, session, checkout)
+            if prefetched is not None:
+                prefetched.apply_to_repo(repo)
+                config_filename = ".howfairis.yml" if remote_config_file is None else remote_config_file
+                if remote_config_file is None and prefetched.filenames is not None and \
+                        config_filename not in prefetched.filenames:
+                    # there is no configuration file to retrieve
+                    ignore_remote_config = True
+            if result_cache is not None:
+                # the configuration file is part of what a cached result is for, so read it at the commit too
+                repo.pin()
+            config = Config(repo, config_file, ignore_remote_config, reporter)
+            checker = Checker(config, repo, parallel, result_cache, deadline, offline, reporter)
+            if prefetched is not None:
+                prefetched.apply_to_checker(checker)
+            result.compliance = checker.check_five_recommendations()
+            result.sub_checks = checker.sub_checks
+            result.readme = checker.readme
+            result.badge = result.compliance.calc_badge(checker.readme.fmt)
+            try:
+                result.branch = repo.default_branch if branch is None else branch
+                if with_sha:
+                    result.sha = repo.sha
+            except (requests.Timeout, requests.HTTPError):
+                # the compliance is known, only which commit it is for is not
+                pass
+        except Exception as e:  # pylint: disable=broad-except
+            result.error = e
+    result.output = output.getvalue()
+    return result
+
+
+def get_pool_maxsize(max_workers, parallel=False):
+    """Number of connections per host that a :py:class:`Session` should keep alive for max_workers threads that
+    each check a repository. With parallel, a check has up to nine requests in flight: one for each of the other
+    recommendations, and one for each sub-check of citation, which run at the same time as well. Connections are
+    only made when needed, so a pool that is larger than what is used costs nothing.
+    """
+    return max_workers * (9 if parallel else 1)
+
+
+def check_repositories(urls, max_workers=8, session=None, graphql=None, **kwargs):
+    """Check many repositories concurrently on a pool of threads.
+
+    Args:
+        urls: Iterable of repository URLs. It is consumed lazily, so it can be a generator or an open file.
+        max_workers: Number of repositories that are checked at the same time.
+        session: :py:class:`requests.Session` shared by all checks. Defaults to a new :py:class:`Session` with
+            a connection pool that is large enough for max_workers threads, see :py:func:`get_pool_maxsize`.
+        graphql: :py:class:`howfairis.github_graphql.GitHubGraphQL` to retrieve most of what the checks of
+            GitHub repositories need with one query per batch of repositories. Defaults to using only the
+            REST API and raw file downloads.
+        **kwargs: Passed on to :py:func:`check_repository` for each URL.
+
+    Yields:
+        One :py:class:`BatchResult` per URL, in the order in which the checks finish.
+    """
+    if session is None:
+        session = Session(pool_maxsize=get_pool_maxsize(max_workers, kwargs.get("parallel", False)))
+    kwargs["session"] = session
+    max_pending = 2 * max_workers
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = set()
+        if graphql is None:
+            prefetched = ((url, None) for url in urls)
+        else:
+            prefetched = graphql.prefetch(urls, kwargs.get("branch"), kwargs.get("path"))
+        for url, data in prefetched:
+            pending.add(executor.submit(check_repository, url, prefetched=data, **kwargs))
+            if len(pending) < max_pending:
+                continue
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+        for future in as_completed(pending):
+            yield future.result()
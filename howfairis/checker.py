@@ -1,18 +1,27 @@
-import inspect
+import functools
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import requests
-from colorama import Fore
-from colorama import Style
 from howfairis.compliance import Compliance
 from howfairis.config import Config
+from howfairis.file_index import FileIndex
 from howfairis.mixins import ChecklistMixin
 from howfairis.mixins import CitationMixin
 from howfairis.mixins import LicenseMixin
 from howfairis.mixins import RegistryMixin
 from howfairis.mixins import RepositoryMixin
+from howfairis.profiling import measure
+from howfairis.profiling import propagate
 from howfairis.readme import Readme
+from howfairis.readme import readme_filenames
 from howfairis.readme_format import ReadmeFormat
 from howfairis.repo import Repo
+from howfairis.reporters import CollectingReporter
+from howfairis.reporters import ConsoleReporter
+from howfairis.session import get_deadline
+from howfairis.session import within_deadline
 
 
 class Checker(RepositoryMixin, LicenseMixin, RegistryMixin, CitationMixin, ChecklistMixin):
@@ -21,9 +30,32 @@ class Checker(RepositoryMixin, LicenseMixin, RegistryMixin, CitationMixin, Check
     Args:
         config: Configuration to use
         repo: Repository to check
+        parallel: Whether to make the network requests of independent checks at the same time. The output
+            is the same as when running the checks one after another.
+        result_cache: :py:class:`ResultCache` to look up the compliance of a commit that was checked before,
+            and to store newly calculated compliance in. The files are then read at the commit, see
+            :py:func:`Repo.pin`.
+        offline: Whether to skip the checks that can only be done by asking the platform of the repository,
+            which are listed in :py:attr:`Checker.network_checks`. The license is then looked for among the
+            files of the checkout instead. Requires that the repo has a checkout.
+        deadline: Seconds that :py:func:`Checker.check_five_recommendations` may take. Requests get no more
+            time than is left, also when called in a :py:func:`howfairis.session.within_deadline` block with an
+            earlier deadline. Checks that have not started when the deadline is reached are skipped, as are
+            checks whose requests time out and checks that need a README or configuration file that timed out.
+            They are listed in :py:attr:`Compliance.unfinished`. Defaults to no deadline.
+        reporter: :py:class:`howfairis.reporters.Reporter` to send the progress and the state of each sub-check
+            to. Defaults to a :py:class:`howfairis.reporters.ConsoleReporter` that writes to stdout. Use a
+            :py:class:`howfairis.reporters.NullReporter` when only the results matter.
 
     Attributes:
-        readme (Readme): Retrieved README from the repository.
+        files (FileIndex): Files in the directory at the path of the repository.
+        known_states (dict): States of sub-checks that are known already, for example from a GraphQL query, by
+            check name. These sub-checks are not run, their known state is used instead.
+        readme (Readme): Retrieved README from the repository. Retrieved on first use.
+        sub_checks (dict): State of each sub-check that was run by
+            :py:func:`Checker.check_five_recommendations`, by check name. The state is None for a sub-check that
+            did not finish, also when one of its requests failed for another reason than that what it asked for
+            does not exist. Empty if the compliance was taken from the result cache.
         compliance (Optional[Compliance]): The current compliance.
             Filled after :py:func:`Checker.check_five_recommendations` is called.
         badge_url (Optional[str]): URL of badge image for the current compliance.
@@ -33,72 +65,276 @@ class Checker(RepositoryMixin, LicenseMixin, RegistryMixin, CitationMixin, Check
 
     """
 
-    def __init__(self, config: Config, repo: Repo):
+    # sub-checks that need the platform of the repository, even if the files are read from a checkout
+    network_checks = ["has_open_repository", "is_on_github_marketplace"]
+
+    def __init__(self, config: Config, repo: Repo, parallel=False, result_cache=None, deadline=None,
+                 offline=False, reporter=None):
         super().__init__()
+        if offline and repo.checkout is None:
+            raise ValueError("Checking offline requires a checkout of the repository.")
         self.compliance = None
         self.config = config
+        self.deadline = deadline
+        self.files = FileIndex(repo)
+        self.known_states = dict()
+        self.offline = offline
+        self.parallel = parallel
         self.repo = repo
-        self.readme = self._get_readme()
-
-    def _eval_regexes(self, regexes, check_name=None):
-        if check_name is None:
-            # get name of the function who's calling me
-            check_name = inspect.stack()[1].function
-        if self.readme.text is None:
-            self._print_state(check_name=check_name, state=False)
+        self.reporter = ConsoleReporter() if reporter is None else reporter
+        self.result_cache = result_cache
+        self.sub_checks = dict()
+        self._readme = None
+        self._readme_failed = False
+        self._deadline_at = None
+        self._local = threading.local()
+        self._unfinished = set()
+
+    @property
+    def _reporter(self):
+        # checks that run at the same time each report to a reporter of their own, which is replayed afterwards
+        reporter = getattr(self._local, "reporter", None)
+        return self.reporter if reporter is None else reporter
+
+    @property
+    def readme(self):
+        if self._readme is None:
+            with measure("readme"):
+                try:
+                    self._readme = self._get_readme()
+                except (requests.Timeout, requests.HTTPError) as e:
+                    # whether the README has a badge is unknown, see _eval_badge
+                    self._reporter.message("Could not retrieve the README: {0}".format(e))
+                    self._readme_failed = True
+                    self._readme = Readme(filename=None, text=None, fmt=None)
+        return self._readme
+
+    @readme.setter
+    def readme(self, readme):
+        self._readme = readme
+        self._readme_failed = False
+
+    def _eval_badge(self, check_name):
+        badges = self.readme.badges
+        if self._readme_failed:
+            # makes the sub-check unfinished rather than failed
+            raise requests.Timeout("Could not retrieve the README.")
+        r = check_name in badges
+        self._reporter.sub_check(check_name, r)
+        return r
+
+    def _eval_file_exists(self, filename, check_name):
+        exists = self.files.exists(filename)
+        if exists is None:
+            # the directory could not be listed, ask for the file itself
+            exists = self._is_found(self.repo.raw_url_format_string.format(filename))
+        self._reporter.sub_check(check_name, exists)
+        return exists
+
+    def _is_found(self, url):
+        # only the status code matters, so don't download the body
+        response = self.repo.session.head(url, allow_redirects=True)
+        if response.status_code in [405, 501]:
+            # the host does not support HEAD, hang up on a GET as soon as the headers are in
+            with self.repo.session.get(url, stream=True) as response:
+                return Checker._is_found_response(response)
+        return Checker._is_found_response(response)
+
+    @staticmethod
+    def _is_found_response(response):
+        if response.status_code == 404:
             return False
-        for regex in regexes:
-            if re.compile(regex).search(self.readme.text) is not None:
-                self._print_state(check_name=check_name, state=True)
-                return True
-        self._print_state(check_name=check_name, state=False)
-        return False
+        # any other failure, such as a server error, says nothing about whether it exists
+        response.raise_for_status()
+        return True
 
     def _get_readme(self):
+        filenames = self.files.filenames
+        if filenames is None:
+            # the directory could not be listed, try all names at once
+            readme = self._get_first_readme(readme_filenames)
+        else:
+            readme = self._get_first_readme([f for f in readme_filenames if f in filenames])
+
+        if readme is None:
+            self._reporter.message("Did not find a README file at " + self.repo.get_location(""))
+            return Readme(filename=None, text=None, fmt=None)
+
+        return readme
+
+    def _get_first_readme(self, candidates):
+        if len(candidates) == 0:
+            return None
+
+        deadline_at = get_deadline()
+
+        def get_text(readme_filename):
+            # the deadline of this thread holds for the probes as well
+            with within_deadline(deadline_at):
+                return self.repo.get_text(readme_filename)
+
+        # all requests are in flight at the same time, so waiting for all of them takes about as long as
+        # waiting for one, and none of them outlives the checker
+        with ThreadPoolExecutor(max_workers=len(candidates)) as executor:
+            get_text = propagate(get_text)
+            futures = [executor.submit(get_text, readme_filename) for readme_filename in candidates]
+        # take the candidates in order of preference, the first one that exists wins
+        for readme_filename, future in zip(candidates, futures):
+            text = future.result()
+            if text is not None:
+                return self._make_readme(readme_filename, text)
+        return None
+
+    def _make_readme(self, readme_filename, text):
         def remove_comments(text):
             return re.sub(r"<!--.*?-->", "", text, flags=re.DOTALL)
 
-        for readme_filename in ["README.rst", "README.md"]:
-            raw_url = self.repo.raw_url_format_string.format(readme_filename)
+        extension = readme_filename.rpartition(".")[2].lower() if "." in readme_filename else ""
+        if extension in ["md", "markdown"]:
+            readme_fmt = ReadmeFormat.MARKDOWN
+        elif extension == "rst":
+            readme_fmt = ReadmeFormat.RESTRUCTUREDTEXT
+        else:
+            readme_fmt = None
+
+        if self.config.include_comments is not True:
+            text = remove_comments(text)
+
+        return Readme(filename=readme_filename, text=text, fmt=readme_fmt)
+
+    def _run_checks(self, checks):
+        if not self.parallel:
+            return [check() for check in checks]
+
+        def run(check):
+            collector = CollectingReporter()
+            self._local.reporter = collector
             try:
-                response = requests.get(raw_url)
-                # If the response was successful, no Exception will be raised
-                response.raise_for_status()
-            except requests.HTTPError:
-                continue
+                with within_deadline(self._deadline_at):
+                    return check(), collector
+            finally:
+                self._local.reporter = None
 
-            if readme_filename == "README.md":
-                readme_fmt = ReadmeFormat.MARKDOWN
-            elif readme_filename == "README.rst":
-                readme_fmt = ReadmeFormat.RESTRUCTUREDTEXT
-            else:
-                readme_fmt = None
+        reporter = self._reporter
+        results = []
+        with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+            # the sub-checks are measured as part of the profile of this thread, if any
+            run = propagate(run)
+            futures = [executor.submit(run, check) for check in checks]
+            # replay what each check reported in the order of checks, regardless of which finished first
+            for future in futures:
+                result, collector = future.result()
+                collector.replay(reporter)
+                results.append(result)
+        return results
 
-            if self.config.include_comments is True:
-                text = response.text
-            else:
-                text = remove_comments(response.text)
+    def _run_sub_checks(self, sub_checks, concurrently=False):
+        if concurrently:
+            return self._run_checks([functools.partial(self._run_sub_check, sub_check) for sub_check in sub_checks])
+        return [self._run_sub_check(sub_check) for sub_check in sub_checks]
 
-            return Readme(filename=readme_filename, text=text, fmt=readme_fmt)
+    def _run_sub_check(self, sub_check):
+        state = self._get_sub_check_state(sub_check)
+        self.sub_checks[sub_check.__name__] = state
+        return state
 
-        print("Did not find a README[.md|.rst] file at " + raw_url.replace(readme_filename, ""))
+    def _get_sub_check_state(self, sub_check):
+        check_name = sub_check.__name__
+        is_settled, state = self._get_settled_state(check_name)
+        if is_settled:
+            return state
+        try:
+            with measure(check_name):
+                return sub_check()
+        except (requests.Timeout, requests.HTTPError):
+            return self._set_unfinished(check_name)
 
-        return Readme(filename=None, text=None, fmt=None)
+    def _get_settled_state(self, check_name):
+        # whether the sub-check does not need to run, and its state if so
+        if check_name in self.known_states:
+            self._reporter.sub_check(check_name, self.known_states[check_name])
+            return True, self.known_states[check_name]
+        if self.offline and check_name in self.network_checks:
+            self._reporter.sub_check_skipped(check_name, "offline")
+            return True, False
+        if self._deadline_at is not None and time.monotonic() >= self._deadline_at:
+            return True, self._set_unfinished(check_name)
+        return False, None
 
-    @staticmethod
-    def _print_state(check_name="", state=None, indent=6):
-        if state is True:
-            print(" " * indent + Style.BRIGHT + Fore.GREEN + "\u2713 " + Style.RESET_ALL + check_name)
-        elif state is False:
-            print(" " * indent + Style.BRIGHT + Fore.RED + "\u00D7 " + Style.RESET_ALL + check_name)
+    def _set_unfinished(self, check_name):
+        self._unfinished.add(check_name)
+        self._reporter.sub_check(check_name, None)
+        return None
+
+    def _force_state(self, force_state, number, name):
+        if force_state not in [True, False, None]:
+            raise ValueError("Unexpected configuration value for force_{0}.".format(name))
+        self._reporter.recommendation(number, name, force_state)
+        return force_state
 
     def check_five_recommendations(self):
         """Check the repo against the five FAIR software recommendations
 
         After being called the :py:attr:`.Checker.compliance` property will be filled the the result of the check.
         """
-        return Compliance(repository=self.check_repository(),
-                          license_=self.check_license(),
-                          registry=self.check_registry(),
-                          citation=self.check_citation(),
-                          checklist=self.check_checklist())
+        deadline_at = None if self.deadline is None else time.monotonic() + self.deadline
+        if not self.config.is_complete:
+            # the configuration file on the remote could not be retrieved, so none of the checks can be trusted
+            deadline_at = time.monotonic()
+        self._unfinished = set()
+        self.sub_checks = dict()
+
+        with within_deadline(deadline_at):
+            self._deadline_at = get_deadline()
+            key = self._get_result_cache_key()
+            if key is None:
+                return self._check_five_recommendations()
+
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                self._reporter.message("Using the result of an earlier check of commit {0}".format(self.repo.sha))
+                if cached.readme is not None:
+                    self.readme = cached.readme
+                if cached.default_branch is not None and self.repo.branch is None:
+                    self.repo.default_branch = cached.default_branch
+                return cached.compliance
+
+            # what is stored is for the commit, so read its files rather than those of the branch
+            self.repo.pin()
+            compliance = self._check_five_recommendations()
+            if not compliance.is_partial:
+                self.result_cache.put(key, compliance, self.readme, self._get_known_default_branch())
+            return compliance
+
+    def _get_known_default_branch(self):
+        # stored with a result, so that a cache hit does not need to look it up
+        if self.repo.branch is not None:
+            return None
+        try:
+            return self.repo.default_branch
+        except (requests.Timeout, requests.HTTPError):
+            return None
+
+    def _get_result_cache_key(self):
+        if self.result_cache is None or not self.config.is_complete:
+            return None
+        try:
+            return self.result_cache.key(self.repo, self.config, self.offline)
+        except (requests.Timeout, requests.HTTPError):
+            # the commit could not be looked up in time, so the result is neither looked up nor stored
+            return None
+
+    def _check_five_recommendations(self):
+        # retrieve the README before any of the checks need it, also when they run at the same time
+        _ = self.readme
+        repository, license_, registry, citation, checklist = self._run_checks([self.check_repository,
+                                                                                self.check_license,
+                                                                                self.check_registry,
+                                                                                self.check_citation,
+                                                                                self.check_checklist])
+        return Compliance(repository=repository,
+                          license_=license_,
+                          registry=registry,
+                          citation=citation,
+                          checklist=checklist,
+                          unfinished=sorted(self._unfinished))
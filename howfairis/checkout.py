@@ -0,0 +1,112 @@
+import os
+import re
+import subprocess
+
+
+class Checkout:
+    """Repository on the local file system, either a working copy or a bare git repository
+
+    Files are read from the working copy as they are on disk, unless a ref is given. For a bare repository, or
+    when a ref is given, they are read from the git objects of that ref, with the git command line tool.
+
+    Args:
+        directory: Root directory of the working copy, or the directory of the bare repository.
+        ref: Branch, tag or commit to read the files of. Defaults to the files on disk for a working copy, and to
+            HEAD for a bare repository.
+
+    """
+
+    def __init__(self, directory, ref=None):
+        if not os.path.isdir(directory):
+            raise FileNotFoundError("{0} is not a directory.".format(directory))
+        self.directory = directory
+        self.ref = ref
+        self.is_bare = not os.path.exists(os.path.join(directory, ".git")) and \
+            os.path.isfile(os.path.join(directory, "HEAD")) and \
+            os.path.isdir(os.path.join(directory, "objects"))
+
+    @property
+    def _uses_git_objects(self):
+        return self.is_bare or self.ref is not None
+
+    def _git(self, *args):
+        if self.is_bare:
+            command = ["git", "--git-dir", self.directory]
+        else:
+            command = ["git", "-C", self.directory]
+        try:
+            completed = subprocess.run(command + list(args), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                       check=True)
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        return completed.stdout
+
+    def list_files(self, path=""):
+        """Names of the files in the directory at path.
+
+        Returns: A set of file names, or None if path is not a directory.
+        """
+        path = path.strip("/")
+        if self._uses_git_objects:
+            listing = self._git("ls-tree", "-z", "{0}:{1}".format(self.ref or "HEAD", path))
+            if listing is None:
+                return None
+            filenames = set()
+            for entry in listing.decode("utf-8").split("\0"):
+                if entry == "":
+                    continue
+                info, name = entry.split("\t", 1)
+                if info.split(" ")[1] == "blob":
+                    filenames.add(name)
+            return filenames
+
+        directory = os.path.join(self.directory, path)
+        if not os.path.isdir(directory):
+            return None
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries if entry.is_file()}
+
+    def read_text(self, path):
+        """Text of the file at path.
+
+        Returns: The text, or None if there is no such file.
+        """
+        path = path.strip("/")
+        if self._uses_git_objects:
+            content = self._git("cat-file", "blob", "{0}:{1}".format(self.ref or "HEAD", path))
+            return None if content is None else content.decode("utf-8", errors="replace")
+
+        filename = os.path.join(self.directory, path)
+        if not os.path.isfile(filename):
+            return None
+        with open(filename, "rb") as f:
+            return f.read().decode("utf-8", errors="replace")
+
+    def get_branch(self):
+        """Name of the branch that HEAD points to, or None if HEAD is detached or unknown."""
+        name = self._git("symbolic-ref", "--short", "-q", "HEAD")
+        if name is None:
+            return None
+        return name.decode("utf-8").strip() or None
+
+    def get_sha(self):
+        """Commit SHA-1 hash of the ref, or of HEAD if no ref was given. None if it could not be determined, or if
+        the files on disk are read and differ from those of HEAD."""
+        if not self._uses_git_objects and self._git("status", "--porcelain") != b"":
+            return None
+        sha = self._git("rev-parse", "--verify", "-q", (self.ref or "HEAD") + "^{commit}")
+        if sha is None:
+            return None
+        return sha.decode("utf-8").strip()
+
+    def get_remote_url(self, remote="origin"):
+        """URL of remote as a https:// URL of a GitHub or GitLab repository, or None if it is not one."""
+        url = self._git("config", "--get", "remote.{0}.url".format(remote))
+        if url is None:
+            return None
+        url = url.decode("utf-8").strip()
+        matched = re.match(r"^(?:https://|ssh://git@|git@)(github\.com|gitlab\.com)[:/]([^/]+)/(.+?)(?:\.git)?/?$",
+                           url)
+        if matched is None:
+            return None
+        return "https://{0}/{1}/{2}".format(*matched.groups())
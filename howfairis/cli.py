@@ -1,27 +1,94 @@
+import functools
+import json
 import os
 import sys
+import time
 import click
 from colorama import init as init_terminal_colors
 from howfairis.__version__ import __version__
+from howfairis.batch import check_repositories
+from howfairis.batch import check_repository
+from howfairis.batch import get_pool_maxsize
 from howfairis.checker import Checker
+from howfairis.checkout import Checkout
 from howfairis.config import Config
+from howfairis.github_graphql import GitHubGraphQL
+from howfairis.http_cache import HttpCache
+from howfairis.organisation import Organisation
+from howfairis.profiling import Profile
+from howfairis.profiling import RunProfiler
+from howfairis.profiling import measure
+from howfairis.profiling import write_profile
 from howfairis.repo import Repo
+from howfairis.reporters import NullReporter
+from howfairis.result_cache import ResultCache
+from howfairis.session import Session
+from howfairis.session import within_deadline
 
 
 # pylint: disable=too-many-arguments
 @click.command(context_settings=dict(help_option_names=["-h", "--help"]))
+@click.option("--base-url", "base_urls", multiple=True, type=click.STRING, metavar="BASE_URL=REPLACEMENT",
+              help="Send the requests for URLs that start with BASE_URL to REPLACEMENT instead, for example " +
+                   "https://api.github.com=http://localhost:8000/api.github.com to use a mirror or a fake " +
+                   "server. Can be given more than once.")
 @click.option("-b", "--branch", default=None, type=click.STRING,
               help="Which git branch to use. Also accepts other git references like SHA or tag.")
+@click.option("--cache-dir", default=None, type=click.Path(file_okay=False),
+              help="Directory for persistent caches of HTTP responses and of results per commit. Cached " +
+                   "responses are revalidated with conditional requests, which do not count against the " +
+                   "GitHub API rate limit. A commit that was checked before is not checked again.")
+@click.option("--checkout", default=None, type=click.Path(exists=True, file_okay=False),
+              help="Directory with a working copy or a bare git repository of the repository at URL. Files " +
+                   "are read from there instead of being downloaded. URL defaults to the GitHub or GitLab URL " +
+                   "of its remote origin. Not for use with --input-file or the URL of an organisation.")
 @click.option("-c", "--config-file", default=None, type=click.Path(),
               help="Name of the configuration file to control howfairis'es behavior. The configuration " +
                    "file needs to be present on the local system and can include a relative path.")
+@click.option("--connect-timeout", default=5, type=click.FloatRange(min=0), show_default=True,
+              help="Seconds to wait for a connection to GitHub or GitLab to be made.")
+@click.option("--deadline", default=None, type=click.FloatRange(min=0),
+              help="Seconds that checking a repository may take, including retrieving its configuration file. " +
+                   "Checks that did not finish in time are reported as such, and do not count as compliant.")
 @click.option("-d", "--show-default-config", default=False, is_flag=True,
               help="Show default configuration and exit.")
+@click.option("-f", "--input-file", default=None, type=click.File("rt"),
+              help="File with one repository URL per line, or - to read from stdin. Checks all of them " +
+                   "and prints one result per repository. Blank lines and lines starting with # are skipped.")
+@click.option("--format", "output_format", default="text", type=click.Choice(["text", "jsonl"]),
+              show_default=True,
+              help="Format of the output. jsonl prints nothing but one JSON object per repository, on a line of " +
+                   "its own, as soon as the repository is done. It has the compliance with each recommendation, " +
+                   "the state of each check, the branch and commit that were checked, and the badge. The exit " +
+                   "code is then only non-zero if a repository could not be checked.")
+@click.option("--github-token", default=None, type=click.STRING, envvar="GITHUB_TOKEN",
+              help="GitHub token for the GraphQL API. When checking many repositories, most of what the " +
+                   "checks of GitHub repositories need is then retrieved with one query per 25 repositories. " +
+                   "Defaults to the value of the GITHUB_TOKEN environment variable.")
 @click.option("-i", "--ignore-remote-config", default=False, is_flag=True,
               help="Ignore any configuration files on the remote.")
+@click.option("-j", "--jobs", default=8, type=click.IntRange(min=1), show_default=True,
+              help="Number of repositories to check at the same time when using --input-file or the URL of " +
+                   "an organisation, group or user.")
+@click.option("--offline", default=False, is_flag=True,
+              help="With --checkout, skip the checks that need GitHub or GitLab, and look for a license file " +
+                   "in the checkout instead of asking the platform. Makes no requests at all.")
+@click.option("--parallel", default=False, is_flag=True,
+              help="Make the network requests of independent checks at the same time. Does not change " +
+                   "the output, only how long it takes.")
 @click.option("-p", "--path", default=None, type=click.STRING,
               help="Relative path (on the remote). Use this if you want howfairis to look for a " +
                    "README and a configuration file in a subdirectory.")
+@click.option("--read-timeout", default=30, type=click.FloatRange(min=0), show_default=True,
+              help="Seconds to wait for GitHub or GitLab to send the next part of a response. Requests that " +
+                   "time out or fail because of a server error are retried twice.")
+@click.option("--profile", "show_profile", default=False, is_flag=True,
+              help="Measure how long each check takes, and how many requests, bytes, cache hits and retries it " +
+                   "needs. The measurements are printed to stderr when done, the slowest first.")
+@click.option("--profile-dir", default=None, type=click.Path(file_okay=False),
+              help="Implies --profile. Directory to also write the measurements to, as profile.json, and to " +
+                   "write a cProfile profile of the whole run to, as howfairis.pstats, and a tracemalloc " +
+                   "snapshot, as howfairis.tracemalloc.")
 @click.option("-r", "--remote-config-file", default=None, type=click.STRING,
               help="Name of the configuration file to control howfairis'es behavior. The configuration " +
                    "file needs to be on the remote, and takes into account the value of " +
@@ -32,10 +99,15 @@ from howfairis.repo import Repo
               help="Show version and exit.")
 @click.argument("url", required=False)
 def cli(url=None, branch=None, config_file=None, remote_config_file=None, path=None,
-        show_trace=False, version=False, ignore_remote_config=False, show_default_config=False):
-    # pylint: disable=too-many-locals
+        show_trace=False, version=False, ignore_remote_config=False, show_default_config=False,
+        input_file=None, jobs=8, parallel=False, cache_dir=None, connect_timeout=5, read_timeout=30,
+        deadline=None, github_token=None, checkout=None, offline=False, output_format="text", show_profile=False,
+        profile_dir=None, base_urls=()):
+    # pylint: disable=too-many-locals,too-many-branches,too-many-statements
 
-    """Determine compliance with recommendations from fair-software.eu for the GitHub or GitLab repository at URL."""
+    """Determine compliance with recommendations from fair-software.eu for the GitHub or GitLab repository at URL,
+    for each public repository of the organisation, group or user at URL, or for each repository listed in
+    --input-file."""
 
     if version is True:
         print("version: {0}".format(__version__))
@@ -53,7 +125,71 @@ def cli(url=None, branch=None, config_file=None, remote_config_file=None, path=N
         sys.tracebacklimit = 0
 
     init_terminal_colors()
+
+    is_batch = input_file is not None or url is not None and Organisation.is_organisation_url(url)
+    if is_batch:
+        # a checkout is that of a single repository
+        assert checkout is None and offline is False, "Expected --checkout and --offline to be used for a single " + \
+                                                      "repository, not with --input-file or the URL of an " + \
+                                                      "organisation, group or user."
+    assert not offline or checkout is not None, "Expected --offline to be used together with --checkout."
+
+    http_cache = None if cache_dir is None else HttpCache(cache_dir)
+    result_cache = None if cache_dir is None else ResultCache(cache_dir)
+    session = Session(pool_maxsize=get_pool_maxsize(jobs, parallel), cache=http_cache,
+                      connect_timeout=connect_timeout, read_timeout=read_timeout, base_urls=_parse_base_urls(base_urls))
+
+    profile = None
+    if show_profile is True or profile_dir is not None:
+        profile = Profile()
+        run_profiler = None if profile_dir is None else RunProfiler(profile_dir)
+        if run_profiler is not None:
+            run_profiler.start()
+        # also when exiting early
+        click.get_current_context().call_on_close(functools.partial(_finish_profile, profile, run_profiler,
+                                                                    profile_dir))
+
+    if is_batch:
+        if input_file is not None:
+            assert url is None, "Expected either a URL or an input file, not both."
+            urls = _read_urls(input_file)
+        else:
+            urls = Organisation(url, session).get_repository_urls()
+        n_failed = 0
+        graphql = None if github_token is None else GitHubGraphQL(github_token, session)
+        with measure("run", profile):
+            for result in check_repositories(urls, max_workers=jobs, session=session, graphql=graphql,
+                                             branch=branch, path=path,
+                                             remote_config_file=remote_config_file, config_file=config_file,
+                                             ignore_remote_config=ignore_remote_config, parallel=parallel,
+                                             result_cache=result_cache, deadline=deadline,
+                                             with_sha=output_format == "jsonl",
+                                             reporter=NullReporter() if output_format == "jsonl" else None,
+                                             profile=profile):
+                if output_format == "jsonl":
+                    _print_json_line(result)
+                else:
+                    _print_batch_result(result)
+                if not result.ok:
+                    n_failed += 1
+        if n_failed > 0:
+            if output_format == "text":
+                print("Could not check {0} repositories.".format(n_failed))
+            sys.exit(1)
+        return
+
+    if url is None and checkout is not None:
+        url = Checkout(checkout).get_remote_url()
+        assert url is not None, "Could not derive the URL from the remote origin of the checkout, please pass URL."
     assert url is not None, "Expected URL to not be emtpy."
+
+    if output_format == "jsonl":
+        result = check_repository(url, branch, path, remote_config_file, config_file, ignore_remote_config, session,
+                                  parallel, result_cache, deadline, checkout=checkout, offline=offline,
+                                  with_sha=True, reporter=NullReporter(), profile=profile)
+        _print_json_line(result)
+        sys.exit(0 if result.ok else 1)
+
     print("Checking compliance with fair-software.eu...")
 
     if url is not None:
@@ -65,6 +201,9 @@ def cli(url=None, branch=None, config_file=None, remote_config_file=None, path=N
     if path is not None:
         print("path: " + path)
 
+    if checkout is not None:
+        print("checkout: " + checkout)
+
     if ignore_remote_config is True:
         print("Ignoring any configuration files on the remote.")
         assert remote_config_file is None, "When ignoring any configuration files on the remote, you" + \
@@ -76,16 +215,26 @@ def cli(url=None, branch=None, config_file=None, remote_config_file=None, path=N
     if config_file is not None:
         print("Local configuration file: " + config_file)
 
-    repo = Repo(url, branch, path, remote_config_file)
-    config = Config(repo, config_file, ignore_remote_config)
+    deadline_at = None if deadline is None else time.monotonic() + deadline
+    with measure("check_repository", profile), within_deadline(deadline_at):
+        repo = Repo(url, branch, path, remote_config_file, session, checkout)
+        if result_cache is not None:
+            # the configuration file is part of what a cached result is for, so read it at the commit too
+            repo.pin()
+        config = Config(repo, config_file, ignore_remote_config)
 
-    checker = Checker(config, repo)
-    current_compliance = checker.check_five_recommendations()
-    badge = current_compliance.calc_badge(checker.readme.fmt)
+        checker = Checker(config, repo, parallel, result_cache, deadline, offline)
+        current_compliance = checker.check_five_recommendations()
+        badge = current_compliance.calc_badge(checker.readme.fmt)
 
     print("\nCalculated compliance: " + " ".join(current_compliance.as_unicode()) + "\n")
 
-    if checker.readme.text is None:
+    if current_compliance.is_partial:
+        print("Not all checks finished in time, the compliance may be higher. Did not finish: " +
+              ", ".join(current_compliance.unfinished))
+        sys.exit(1)
+
+    if checker.readme.filename is None:
         sys.exit(1)
 
     previous_compliance = checker.readme.get_compliance()
@@ -115,5 +264,48 @@ def cli(url=None, branch=None, config_file=None, remote_config_file=None, path=N
     sys.exit(1)
 
 
+def _parse_base_urls(values):
+    base_urls = dict()
+    for value in values:
+        base_url, separator, replacement = value.partition("=")
+        assert separator == "=" and base_url != "" and replacement != "", \
+            "Expected --base-url to be like BASE_URL=REPLACEMENT, not {0}".format(value)
+        base_urls[base_url] = replacement
+    return base_urls
+
+
+def _print_batch_result(result):
+    print("url: " + result.url)
+    print(result.output, end="")
+    if result.ok:
+        print("Calculated compliance: " + " ".join(result.compliance.as_unicode()) + "\n")
+        if result.compliance.is_partial:
+            print("Did not finish: " + ", ".join(result.compliance.unfinished) + "\n")
+    else:
+        print("Error: {0}\n".format(result.error))
+    sys.stdout.flush()
+
+
+def _finish_profile(profile, run_profiler, profile_dir):
+    if run_profiler is not None:
+        run_profiler.stop()
+    if profile_dir is not None:
+        write_profile(profile, profile_dir)
+    print(profile.format_table(), file=sys.stderr)
+
+
+def _print_json_line(result):
+    print(json.dumps(result.as_dict()))
+    sys.stdout.flush()
+
+
+def _read_urls(lines):
+    for line in lines:
+        line = line.strip()
+        if line == "" or line.startswith("#"):
+            continue
+        yield line
+
+
 if __name__ == "__main__":
     cli()
@@ -14,11 +14,12 @@ class Compliance:
         checklist: Whether a software quality checklist is used
         compliant_symbol: Unicode symbol used in badge when compliant
         noncompliant_symbol: Unicode symbol used in badge when non-compliant
+        unfinished: Names of the checks that did not finish, for example because the deadline was reached.
+            A recommendation is only compliant if one of its checks that did finish passed.
     """
 
     def __init__(self, repository=False, license_=False, registry=False, citation=False, checklist=False,
-                 compliant_symbol="\u25CF", noncompliant_symbol="\u25CB"):
-        self._index = 0
+                 compliant_symbol="\u25CF", noncompliant_symbol="\u25CB", unfinished=None):
         self.checklist = checklist
         self.citation = citation
         self.compliant_symbol = compliant_symbol
@@ -26,6 +27,7 @@ class Compliance:
         self.noncompliant_symbol = noncompliant_symbol
         self.registry = registry
         self.repository = repository
+        self.unfinished = [] if unfinished is None else unfinished
 
     def __eq__(self, other):
         return self.count(True) == other.count(True)
@@ -43,15 +45,13 @@ class Compliance:
         return self.count(True) != other.count(True)
 
     def __iter__(self):
-        return self
+        # a new iterator each time, so that iterating is safe from several threads at once
+        return iter(self._state)
 
-    def __next__(self):
-        if self._index < 5:
-            result = self._state[self._index]
-            self._index += 1
-            return result
-        self._index = 0
-        raise StopIteration
+    @property
+    def is_partial(self):
+        """Whether some of the checks did not finish."""
+        return len(self.unfinished) > 0
 
     @property
     def _state(self):
@@ -72,6 +72,14 @@ class Compliance:
                 compliance_unicode[i] = self.noncompliant_symbol
         return compliance_unicode
 
+    def as_dict(self):
+        """Whether the repository is compliant with each of the 5 recommendations, by recommendation.
+
+        Returns: A dictionary
+        """
+        return dict(repository=self.repository, license=self.license, registry=self.registry,
+                    citation=self.citation, checklist=self.checklist)
+
     def calc_badge(self, fmt):
         score = self.count(True)
 
@@ -90,7 +98,8 @@ class Compliance:
         if fmt == ReadmeFormat.MARKDOWN:
             return "[![fair-software.eu]({0})]({1})".format(badge_url, "https://fair-software.eu")
 
-        return None
+        # a README without markup, such as README.txt, can only refer to the badge by its URL
+        return badge_url
 
     def count(self, value):
         return self._state.count(value)
@@ -1,9 +1,16 @@
+import hashlib
+import json
 import os
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
 import requests
 from ruamel.yaml import YAML
 from voluptuous.error import Invalid
 from voluptuous.error import MultipleInvalid
+from howfairis.profiling import measure
 from howfairis.repo import Repo
+from howfairis.reporters import ConsoleReporter
 from howfairis.schema import validate_against_schema
 
 
@@ -14,33 +21,41 @@ class Config:
         repo: Repository which is used to fetch config from
         config_filename: Default is ".howfairis.yml"
         ignore_remote_config: If true then does not try to merge config from remote repository.
+        reporter: :py:class:`howfairis.reporters.Reporter` to tell which configuration files are used. Defaults
+            to a :py:class:`howfairis.reporters.ConsoleReporter` that writes to stdout.
+
+    Attributes:
+        is_complete (bool): False if retrieving the configuration file on the remote failed, in which case the
+            configuration is that without it, and :py:class:`Checker` finishes none of its checks.
     """
 
-    def __init__(self, repo: Repo, config_filename=None, ignore_remote_config=False):
-        self._default = Config._load_default_config()
-        self._repo = Config._load_repo_config(repo, ignore_remote_config)
+    def __init__(self, repo: Repo, config_filename=None, ignore_remote_config=False, reporter=None):
+        self.reporter = ConsoleReporter() if reporter is None else reporter
+        self._default = Config._load_default_config(self.reporter)
+        self.is_complete = True
+        with measure("config"):
+            try:
+                self._repo = Config._load_repo_config(repo, ignore_remote_config, self.reporter)
+            except (requests.Timeout, requests.HTTPError) as e:
+                self.reporter.message("Could not retrieve the configuration file on the remote: {0}".format(e))
+                self._repo = dict()
+                self.is_complete = False
         self._user = Config._load_user_config(config_filename)
         self._merged = self._merge_configurations()
 
     @staticmethod
-    def _load_default_config():
-        pkg_root = os.path.dirname(__file__)
-        config_filename = os.path.join(pkg_root, "data", ".howfairis.yml")
-        with open(config_filename, "rt") as f:
-            text = f.read()
-        default_config = YAML(typ="safe").load(text)
-        if default_config is None:
-            default_config = dict()
-        try:
-            validate_against_schema(default_config)
-        except (Invalid, MultipleInvalid):
-            print(
+    def _load_default_config(reporter):
+        parsed = _get_default_parsed_config()
+        if parsed.is_empty:
+            return empty_config
+        if parsed.error is not None:
+            reporter.message(
                 "Default configuration file should follow the schema for it to be considered.")
-            return dict()
-        return default_config
+            return empty_config
+        return parsed.config
 
     @staticmethod
-    def _load_repo_config(repo, ignore_remote_config):
+    def _load_repo_config(repo, ignore_remote_config, reporter):
         if repo is None:
             return dict()
 
@@ -52,32 +67,31 @@ class Config:
         else:
             config_filename = repo.config_file
 
-        raw_url = repo.raw_url_format_string.format(config_filename)
-        try:
-            response = requests.get(raw_url)
-            # If the response was successful, no Exception will be raised
-            response.raise_for_status()
-            print("Using the configuration file {0}".format(raw_url))
-        except requests.HTTPError as e:
+        location = repo.get_location(config_filename)
+        text = repo.get_text(config_filename)
+        if text is None:
             if repo.config_file is not None:
                 raise Exception(
-                    "Could not find the configuration file {0}".format(raw_url)) from e
+                    "Could not find the configuration file {0}".format(location))
             return dict()
+        reporter.message("Using the configuration file {0}".format(location))
+
+        return Config._parse_repo_config(text, location, reporter)
 
+    @staticmethod
+    def _parse_repo_config(text, raw_url, reporter):
         try:
-            repo_config = YAML(typ="safe").load(response.text)
+            parsed = parse_config(text)
         except Exception as e:
             raise Exception(
                 "Problem loading YAML configuration from file {0}".format(raw_url)) from e
 
-        try:
-            validate_against_schema(repo_config)
-        except (Invalid, MultipleInvalid):
-            print(
+        if parsed.error is not None:
+            reporter.message(
                 "Repository's configuration file should follow the schema for it to be considered.")
-            return dict()
+            return empty_config
 
-        return repo_config
+        return parsed.config
 
     @staticmethod
     def _load_user_config(config_filename):
@@ -91,15 +105,13 @@ class Config:
 
         with open(p, "rt") as f:
             text = f.read()
-        user_config = YAML(typ="safe").load(text)
-        if user_config is None:
-            user_config = dict()
-        try:
-            validate_against_schema(user_config)
-        except Exception as e:
+        parsed = parse_config(text)
+        if parsed.is_empty:
+            return empty_config
+        if parsed.error is not None:
             raise Exception(
-                "User configuration file should follow the schema.") from e
-        return user_config
+                "User configuration file should follow the schema.") from parsed.error
+        return parsed.config
 
     def _merge_configurations(self):
         """Configuration dictionary based on merger of
@@ -114,6 +126,12 @@ class Config:
         m.update(self._user)
         return m
 
+    @property
+    def digest(self):
+        """SHA-256 hash of the merged configuration, to tell apart results obtained with different configurations"""
+        text = json.dumps(self._merged, sort_keys=True)
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
     @property
     def force_repository(self):
         return self._merged.get("force_repository")
@@ -137,3 +155,76 @@ class Config:
     @property
     def include_comments(self):
         return self._merged.get("include_comments")
+
+
+# shared by all configurations without settings of their own
+empty_config = MappingProxyType(dict())
+
+
+class ParsedConfig:
+    """Outcome of parsing and validating the text of a configuration file
+
+    Args:
+        text: YAML text of the configuration file
+
+    Attributes:
+        config (Optional[Mapping]): Read-only configuration, or None if text does not follow the schema.
+        is_empty (bool): Whether text has no YAML document at all.
+        error (Optional[voluptuous.Invalid]): Why text does not follow the schema, or None if it does.
+
+    """
+
+    def __init__(self, text):
+        loaded = YAML(typ="safe").load(text)
+        self.is_empty = loaded is None
+        self.error = None
+        try:
+            validate_against_schema(loaded)
+        except (Invalid, MultipleInvalid) as e:
+            self.error = e
+        self.config = None if self.error is not None else MappingProxyType(dict(loaded))
+
+
+# the most recently used outcomes, by SHA-256 hash of the text
+_parsed_configs = OrderedDict()
+_parsed_configs_lock = threading.Lock()
+max_parsed_configs = 1024
+
+
+def parse_config(text):
+    """Parse and validate text, once per distinct text in the whole process, so that many repositories with
+    the same configuration file, or many checks with the same local configuration file, share the work.
+    Raises whatever the YAML parser raises if text is not YAML.
+
+    Returns: A :py:class:`ParsedConfig`, which must not be modified
+    """
+    key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    with _parsed_configs_lock:
+        parsed = _parsed_configs.get(key)
+        if parsed is not None:
+            _parsed_configs.move_to_end(key)
+            return parsed
+
+    # parsed outside the lock; a text that two threads parse at the same time is parsed twice, harmlessly
+    parsed = ParsedConfig(text)
+    with _parsed_configs_lock:
+        _parsed_configs[key] = parsed
+        if len(_parsed_configs) > max_parsed_configs:
+            _parsed_configs.popitem(last=False)
+    return parsed
+
+
+_default_parsed_config = None
+_default_parsed_config_lock = threading.Lock()
+
+
+def _get_default_parsed_config():
+    # the default configuration comes with the package and does not change, so it is read once per process
+    global _default_parsed_config  # pylint: disable=global-statement
+    with _default_parsed_config_lock:
+        if _default_parsed_config is None:
+            pkg_root = os.path.dirname(__file__)
+            config_filename = os.path.join(pkg_root, "data", ".howfairis.yml")
+            with open(config_filename, "rt") as f:
+                _default_parsed_config = ParsedConfig(f.read())
+        return _default_parsed_config
@@ -0,0 +1,100 @@
+import threading
+import requests
+from howfairis.code_repository_platforms import Platform
+from howfairis.profiling import measure
+
+
+class FileIndex:
+    """Names of the files in the directory at the path of a repository
+
+    The directory listing is retrieved on first use, with the GitHub contents API or the GitLab repository
+    tree API, or from the checkout of the repository, after which any number of questions about which files
+    exist are answered from memory.
+
+    Args:
+        repo: Repository to list the files of
+
+    """
+
+    def __init__(self, repo):
+        self.repo = repo
+        self._filenames = None
+        self._is_retrieved = False
+        self._lock = threading.Lock()
+
+    @property
+    def filenames(self):
+        """Set of file names in the directory, or None if the directory could not be listed."""
+        with self._lock:
+            if not self._is_retrieved:
+                with measure("file_index"):
+                    self._filenames = self._get_filenames()
+                self._is_retrieved = True
+        return self._filenames
+
+    @filenames.setter
+    def filenames(self, filenames):
+        with self._lock:
+            self._filenames = filenames
+            self._is_retrieved = True
+
+    def exists(self, filename):
+        """Whether filename exists in the directory.
+
+        Returns: True or False, or None if the directory could not be listed.
+        """
+        if self.filenames is None:
+            return None
+        return filename in self.filenames
+
+    def _get_filenames(self):
+        if self.repo.checkout is not None:
+            filenames = self.repo.checkout.list_files(self.repo.path)
+            # a path that does not exist in the checkout has no files
+            return set() if filenames is None else filenames
+        ref = self.repo.ref
+        if self.repo.platform == Platform.GITHUB:
+            return self._get_github_filenames(ref)
+        if self.repo.platform == Platform.GITLAB:
+            return self._get_gitlab_filenames(ref)
+        return None
+
+    def _get_github_filenames(self, ref):
+        url = self.repo.api + "/contents" + self.repo.path
+        try:
+            response = self.repo.session.get(url, params=dict(ref=ref))
+            # If the response was successful, no Exception will be raised
+            response.raise_for_status()
+        except requests.HTTPError:
+            return None
+        return FileIndex.parse_github_contents(response.json())
+
+    def _get_gitlab_filenames(self, ref):
+        url = self.repo.api + "/repository/tree"
+        params = dict(ref=ref, path=self.repo.path.lstrip("/"), per_page=100, page=1)
+        filenames = set()
+        while True:
+            try:
+                response = self.repo.session.get(url, params=params)
+                # If the response was successful, no Exception will be raised
+                response.raise_for_status()
+            except requests.HTTPError:
+                return None
+            filenames.update(FileIndex.parse_gitlab_tree(response.json()))
+            next_page = response.headers.get("X-Next-Page", "")
+            if next_page == "":
+                return filenames
+            params["page"] = int(next_page)
+
+    @staticmethod
+    def parse_github_contents(entries):
+        """Names of the files in a response of the GitHub contents API, or None if it is not about a directory."""
+        if not isinstance(entries, list):
+            # the path is a file, not a directory
+            return None
+        return {entry["name"] for entry in entries if entry["type"] in ["file", "symlink"]}
+
+    @staticmethod
+    def parse_gitlab_tree(entries):
+        """Names of the files in a page of a response of the GitLab repository tree API."""
+        return {entry["name"] for entry in entries if entry["type"] == "blob"}
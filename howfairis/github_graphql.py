@@ -0,0 +1,172 @@
+import json
+import requests
+from howfairis.code_repository_platforms import Platform
+from howfairis.profiling import measure
+from howfairis.readme import readme_filenames
+from howfairis.repo import Repo
+from howfairis.session import get_default_session
+
+
+class RepositoryData:
+    """What the checks need to know about a GitHub repository, as retrieved by :py:class:`GitHubGraphQL`
+
+    Attributes:
+        default_branch (str): Default branch of the repository.
+        sha (Optional[str]): Commit SHA-1 hash that the branch that is checked points to.
+        is_private (bool): Whether the repository is private.
+        has_license (bool): Whether GitHub detected a license.
+        filenames (Optional[set]): Names of the files in the directory at the path of the repository.
+        readme_filename (Optional[str]): Name of the most preferred README in that directory.
+        readme_text (Optional[str]): Text of that README.
+    """
+
+    def __init__(self, default_branch=None, sha=None, is_private=False, has_license=False, filenames=None,
+                 readme_filename=None, readme_text=None):
+        self.default_branch = default_branch
+        self.sha = sha
+        self.is_private = is_private
+        self.has_license = has_license
+        self.filenames = filenames
+        self.readme_filename = readme_filename
+        self.readme_text = readme_text
+
+    def apply_to_repo(self, repo):
+        """Tell repo what is known about it already, so that it does not need to ask the REST API."""
+        if self.default_branch is not None:
+            repo.default_branch = self.default_branch
+        if self.sha is not None:
+            repo.sha = self.sha
+
+    def apply_to_checker(self, checker):
+        """Tell checker what is known already, so that it only makes the requests that GraphQL cannot answer."""
+        checker.files.filenames = self.filenames
+        checker.known_states["has_open_repository"] = not self.is_private
+        checker.known_states["has_license"] = self.has_license
+        if self.readme_filename is not None:
+            # pylint: disable=protected-access
+            checker.readme = checker._make_readme(self.readme_filename, self.readme_text)
+
+
+class GitHubGraphQL:
+    """Retrieves what the checks need to know about many GitHub repositories at once, with one GraphQL query per
+    batch of repositories
+
+    For each repository, the query asks for the default branch, the commit, the license, the files in the
+    directory at the path of the repository and the text of the READMEs, each under its own alias. The GraphQL
+    API does not allow anonymous use, so a token is needed.
+
+    Args:
+        token: GitHub token to authenticate with. It is only sent to endpoint.
+        session: :py:class:`requests.Session` to send the queries with. Defaults to the session shared by the
+            whole process.
+        endpoint: URL of the GraphQL API.
+        batch_size: Number of repositories per query.
+
+    """
+
+    def __init__(self, token, session=None, endpoint="https://api.github.com/graphql", batch_size=25):
+        self.token = token
+        self.session = get_default_session() if session is None else session
+        self.endpoint = endpoint
+        self.batch_size = batch_size
+
+    def fetch(self, repos):
+        """Retrieve the data of repos with a single query.
+
+        Args:
+            repos: List of :py:class:`Repo` on GitHub.
+
+        Returns: A list with a :py:class:`RepositoryData` per repo, or None for a repo that was not found.
+        """
+        if len(repos) == 0:
+            return []
+        with measure("graphql"):
+            response = self.session.post(self.endpoint, json=dict(query=GitHubGraphQL._make_query(repos)),
+                                         headers={"Authorization": "bearer " + self.token})
+        response.raise_for_status()
+        data = response.json().get("data") or dict()
+        return [GitHubGraphQL._parse_repository(data.get("r{0}".format(i))) for i in range(len(repos))]
+
+    def prefetch(self, urls, branch=None, path=None):
+        """Retrieve the data of the GitHub repositories among urls, batch_size repositories at a time.
+
+        Args:
+            urls: Iterable of repository URLs. It is consumed lazily, one batch at a time.
+            branch: Branch to check in every repository, like for :py:class:`Repo`.
+            path: Path inside every repository, like for :py:class:`Repo`.
+
+        Yields:
+            A tuple of each URL and its :py:class:`RepositoryData`, in the order of urls. The data is None if it
+            could not be retrieved, for example because the URL is not of a GitHub repository.
+        """
+        batch = []
+        for url in urls:
+            batch.append(url)
+            if len(batch) == self.batch_size:
+                yield from self._prefetch_batch(batch, branch, path)
+                batch = []
+        yield from self._prefetch_batch(batch, branch, path)
+
+    def _prefetch_batch(self, urls, branch, path):
+        repos = dict()
+        for url in urls:
+            try:
+                repo = Repo(url, branch, path, session=self.session)
+            except (AssertionError, ValueError):
+                # left for the checks to report
+                continue
+            if repo.platform == Platform.GITHUB:
+                repos[url] = repo
+        try:
+            fetched = dict(zip(repos.keys(), self.fetch(list(repos.values()))))
+        except (requests.RequestException, ValueError):
+            # the checks will make their usual requests instead
+            fetched = dict()
+        for url in urls:
+            yield url, fetched.get(url)
+
+    @staticmethod
+    def _make_query(repos):
+        fields = []
+        for i, repo in enumerate(repos):
+            ref = "HEAD" if repo.branch is None else repo.branch
+            directory = repo.path.strip("/")
+            prefix = ref + ":" + ("" if directory == "" else directory + "/")
+            readmes = ["readme{0}: object(expression: {1}) {{ ... on Blob {{ text }} }}"
+                       .format(j, json.dumps(prefix + readme_filename))
+                       for j, readme_filename in enumerate(readme_filenames)]
+            fields.append("r{0}: repository(owner: {1}, name: {2}) {{ ".format(i, json.dumps(repo.owner),
+                                                                               json.dumps(repo.repo)) +
+                          "defaultBranchRef { name } isPrivate licenseInfo { spdxId } " +
+                          "commit: object(expression: {0}) {{ oid }} ".format(json.dumps(ref)) +
+                          "tree: object(expression: {0}) {{ ... on Tree {{ entries {{ name type }} }} }} "
+                          .format(json.dumps(prefix)) +
+                          " ".join(readmes) + " }")
+        return "query { " + " ".join(fields) + " }"
+
+    @staticmethod
+    def _parse_repository(node):
+        if node is None:
+            return None
+        default_branch = (node.get("defaultBranchRef") or dict()).get("name")
+        sha = (node.get("commit") or dict()).get("oid")
+        tree = node.get("tree") or dict()
+        if "entries" in tree:
+            filenames = {entry["name"] for entry in tree["entries"] if entry["type"] == "blob"}
+        else:
+            filenames = None
+        readme_filename = None
+        readme_text = None
+        for j, filename in enumerate(readme_filenames):
+            blob = node.get("readme{0}".format(j)) or dict()
+            if blob.get("text") is not None:
+                readme_filename = filename
+                readme_text = blob["text"]
+                break
+        return RepositoryData(default_branch=default_branch,
+                              sha=sha,
+                              is_private=node.get("isPrivate") is True,
+                              has_license=node.get("licenseInfo") is not None,
+                              filenames=filenames,
+                              readme_filename=readme_filename,
+                              readme_text=readme_text)
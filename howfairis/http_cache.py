@@ -0,0 +1,201 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+class CachedResponse:
+    """Response as stored in the :py:class:`HttpCache`
+
+    Attributes:
+        status_code: HTTP status code, either 200 or 404.
+        headers: Response headers.
+        content: Response body, or None if only the status and headers are stored, as for a HEAD request or a
+            streamed body that was not read to the end.
+        stored_at: Time at which the response was last fetched or revalidated, in seconds since the epoch.
+    """
+
+    def __init__(self, status_code, headers, content, stored_at):
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.stored_at = stored_at
+
+    @property
+    def has_body(self):
+        return self.content is not None
+
+    @property
+    def etag(self):
+        return self.headers.get("ETag")
+
+    @property
+    def last_modified(self):
+        return self.headers.get("Last-Modified")
+
+    def to_response(self, request):
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.reason = "OK" if self.status_code == 200 else "Not Found"
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        # pylint: disable=protected-access
+        response._content = b"" if self.content is None or request.method == "HEAD" else self.content
+        # so that the body can be iterated over as well, like that of a streamed response
+        response._content_consumed = True
+        response.from_cache = True
+        return response
+
+
+class HttpCache:
+    """Persistent cache of HTTP responses, stored in a SQLite database on disk
+
+    Successful responses are stored together with their ETag and Last-Modified headers. Within ttl seconds
+    they are used as is, after that they are revalidated with a conditional request. A 304 Not Modified
+    answer does not count against the GitHub API rate limit. Responses with status 404 are stored as well,
+    since most of the files that howfairis looks for do not exist; they are used for negative_ttl seconds
+    and then fetched again. Of HEAD requests, and of streamed bodies that are not read to the end, only the
+    status and headers are stored, which answer later HEAD requests but not GET requests.
+
+    Responses to requests with credentials are stored apart from those without, per set of credentials.
+
+    Args:
+        directory: Directory to keep the cache in. Defaults to $XDG_CACHE_HOME/howfairis or ~/.cache/howfairis.
+        ttl: Number of seconds a successful response is used without revalidating it.
+        negative_ttl: Number of seconds a 404 response is used without asking again.
+        max_size: Maximum total size of the stored responses in bytes. When it is exceeded, the least recently
+            used responses are evicted.
+
+    """
+
+    # the body is stored decoded, so these no longer describe it
+    _dropped_headers = ["content-encoding", "content-length", "transfer-encoding"]
+
+    # what one user may see is not shown to another
+    _credential_headers = ["Authorization", "PRIVATE-TOKEN"]
+
+    def __init__(self, directory=None, ttl=600, negative_ttl=3600, max_size=100 * 1024 ** 2):
+        if directory is None:
+            directory = default_cache_directory()
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(os.path.join(directory, "http-cache.sqlite"), timeout=30,
+                                           check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("CREATE TABLE IF NOT EXISTS responses ("
+                                     "key TEXT PRIMARY KEY, status_code INTEGER, headers TEXT, content BLOB, "
+                                     "size INTEGER, stored_at REAL, accessed_at REAL)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+            self._total_size = self._count_total_size()
+
+    @classmethod
+    def key(cls, request):
+        """Cache key for a prepared request. Responses for the same URL differ by Accept header, and by
+        credentials. The credentials are hashed, so that they are not stored."""
+        key = "{0} {1}".format(request.url, request.headers.get("Accept", ""))
+        credentials = [request.headers.get(name, "") for name in cls._credential_headers]
+        if any(credentials):
+            key += " " + hashlib.sha256("\n".join(credentials).encode("utf-8")).hexdigest()
+        return key
+
+    def clear(self):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses")
+            self._total_size = 0
+
+    def get(self, key):
+        """Stored response for key, whether fresh or not.
+
+        Returns: A :py:class:`CachedResponse`, or None if nothing is stored for key.
+        """
+        with self._lock, self._connection:
+            row = self._connection.execute("SELECT status_code, headers, content, stored_at FROM responses "
+                                           "WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        status_code, headers, content, stored_at = row
+        return CachedResponse(status_code, json.loads(headers), content, stored_at)
+
+    def is_fresh(self, cached):
+        ttl = self.ttl if cached.status_code == 200 else self.negative_ttl
+        return time.time() - cached.stored_at < ttl
+
+    def put(self, key, response, content=None):
+        """Store a response. Only responses with status 200 or 404 are stored.
+
+        Args:
+            key: Cache key of the request, see :py:meth:`key`.
+            response: The response to store the status and headers of.
+            content: Body of the response. If None, only the status and headers of a successful response are
+                stored, for example because it is the response to a HEAD request.
+
+        Returns: The stored :py:class:`CachedResponse`, or None if the response was not stored.
+        """
+        if response.status_code not in [200, 404]:
+            return None
+        headers = {name: value for name, value in response.headers.items()
+                   if name.lower() not in self._dropped_headers}
+        if response.status_code == 404:
+            # that a file does not exist is all there is to know, whatever the method
+            content = b""
+        headers_json = json.dumps(headers)
+        size = len(headers_json) + (0 if content is None else len(content))
+        now = time.time()
+        with self._lock, self._connection:
+            row = self._connection.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._connection.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                     (key, response.status_code, headers_json, content, size, now, now))
+            self._total_size += size - (0 if row is None else row[0])
+            if self._total_size > self.max_size:
+                self._evict()
+        return CachedResponse(response.status_code, headers, content, now)
+
+    def revalidated(self, key, cached, response):
+        """Record that the server confirmed with a 304 response that cached is still up to date.
+
+        Returns: The updated :py:class:`CachedResponse`
+        """
+        headers = dict(cached.headers.items())
+        for name in ["ETag", "Last-Modified", "Cache-Control", "Expires", "Date"]:
+            if name in response.headers:
+                headers[name] = response.headers[name]
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute("UPDATE responses SET headers = ?, stored_at = ?, accessed_at = ? "
+                                     "WHERE key = ?", (json.dumps(headers), now, now, key))
+        return CachedResponse(cached.status_code, headers, cached.content, now)
+
+    def _count_total_size(self):
+        return self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def _evict(self):
+        # other processes may use the same database, so count again rather than trust the running total
+        total = self._count_total_size()
+        self._total_size = total
+        if total <= self.max_size:
+            return
+        rows = self._connection.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall()
+        for key, size in rows:
+            if total <= self.max_size:
+                break
+            self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+        self._total_size = total
+
+
+def default_cache_directory():
+    """Directory for the caches when none is given: $XDG_CACHE_HOME/howfairis or ~/.cache/howfairis"""
+    cache_home = os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(cache_home, "howfairis")
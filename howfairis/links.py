@@ -0,0 +1,69 @@
+import re
+from urllib.parse import urlsplit
+from howfairis.readme_format import ReadmeFormat
+
+
+# a link target ends where the surrounding markup continues
+_url = r"(https?://[^\s<>\"'`()\[\]]+)"
+
+_markdown_constructs = [
+    # inline link or image: [text](url) or ![alt](url)
+    r"\]\(\s*<?" + _url,
+    # reference definition: [id]: url
+    r"^ {0,3}\[[^\]\n]+\]:[ \t]*<?" + _url,
+    # autolink: <url>
+    r"<" + _url + r">",
+    # inline HTML: <img src="url"> or <a href="url">
+    r"\b(?:src|href)\s*=\s*[\"']?" + _url
+]
+
+# a URL on its own, such as a GFM autolink or a reStructuredText standalone hyperlink. It is the last
+# alternative, and every construct above starts before its URL, so the constructs win where they apply.
+# Punctuation at the end belongs to the sentence, not to the URL.
+_bare_url = r"(https?://[^\s<>\"'`()\[\]]*[^\s<>\"'`()\[\].,:;!?*_~])"
+
+_restructuredtext_constructs = [
+    # image or figure directive, also as a substitution definition: .. |name| image:: url
+    r"\.\.[ \t]+(?:\|[^|\n]+\|[ \t]+)?(?:image|figure)::[ \t]*" + _url,
+    # target option of an image or figure: :target: url
+    r":target:[ \t]*" + _url,
+    # embedded URI: `text <url>`_
+    r"<" + _url + r">",
+    # hyperlink target: .. _name: url
+    r"^[ \t]*\.\.[ \t]+_[^:\n]+:[ \t]*" + _url
+]
+
+
+def _compile(constructs):
+    # every construct has exactly one group, so the last group that took part in a match is the URL
+    return re.compile("|".join(constructs), re.MULTILINE | re.IGNORECASE)
+
+
+_patterns = {
+    ReadmeFormat.MARKDOWN: _compile(_markdown_constructs + [_bare_url]),
+    ReadmeFormat.RESTRUCTUREDTEXT: _compile(_restructuredtext_constructs + [_bare_url]),
+    None: _compile(_markdown_constructs + _restructuredtext_constructs + [_bare_url])
+}
+
+
+def index_links(text, fmt):
+    """Targets of the links and images in text, as written with the markup of fmt.
+
+    Args:
+        text: Text of a README
+        fmt: :py:class:`ReadmeFormat` of text. If None, the constructs of all formats are recognized.
+
+    Returns:
+        A dictionary of host name to the list of link targets on that host, in order of appearance.
+    """
+    index = dict()
+    for match in _patterns[fmt].finditer(text):
+        url = match.group(match.lastindex)
+        try:
+            host = urlsplit(url).hostname
+        except ValueError:
+            continue
+        urls = index.setdefault(host, [])
+        if url not in urls:
+            urls.append(url)
+    return index
@@ -1,18 +1,16 @@
 class ChecklistMixin:
 
     def check_checklist(self):
-        force_state = self.config.force_checklist
-        if force_state not in [True, False, None]:
-            raise ValueError("Unexpected configuration value for force_checklist.")
+        force_state = self._force_state(self.config.force_checklist, 5, "checklist")
         if isinstance(force_state, bool):
-            print("(5/5) checklist: force {0}".format(force_state))
             return force_state
-        print("(5/5) checklist")
-        results = [
-            self.has_core_infrastructures_badge(),
-        ]
+        results = self._run_sub_checks(self._checklist_sub_checks())
         return True in results
 
+    def _checklist_sub_checks(self):
+        return [
+            self.has_core_infrastructures_badge
+        ]
+
     def has_core_infrastructures_badge(self):
-        regexes = [r"https://bestpractices\.coreinfrastructure\.org/projects/[0-9]*/badge"]
-        return self._eval_regexes(regexes)
+        return self._eval_badge("has_core_infrastructures_badge")
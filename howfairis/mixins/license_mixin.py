@@ -1,55 +1,92 @@
+import re
 import requests
 from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 from howfairis.code_repository_platforms import Platform
+from howfairis.profiling import measure
+
+
+try:
+    import lxml  # pylint: disable=unused-import
+    html_parser = "lxml"
+except ImportError:
+    html_parser = "html.parser"
 
 
 class LicenseMixin:
 
     def check_license(self):
-        force_state = self.config.force_license
-        if force_state not in [True, False, None]:
-            raise ValueError("Unexpected configuration value for force_license.")
+        force_state = self._force_state(self.config.force_license, 2, "license")
         if isinstance(force_state, bool):
-            print("(2/5) license: force {0}".format(force_state))
             return force_state
-        print("(2/5) license")
-        results = [self.has_license()]
+        results = self._run_sub_checks(self._license_sub_checks())
         return True in results
 
+    def _license_sub_checks(self):
+        return [self.has_license]
+
     def has_license(self):
 
         r = False
 
+        if self.offline:
+            r = self._has_license_file()
+            self._reporter.sub_check("has_license", r)
+            return r
+
         if self.repo.platform == Platform.GITHUB:
+            # the response includes the full license text, which is not needed
             url = self.repo.api + "/license"
-            try:
-                response = requests.get(url)
-                # If the response was successful, no Exception will be raised
-                response.raise_for_status()
-            except requests.HTTPError:
-                self._print_state(check_name="has_license", state=r)
-                return r
-            r = True
+            if self.repo.is_pinned:
+                url += "?ref=" + self.repo.ref
+            r = self._is_found(url)
 
         if self.repo.platform == Platform.GITLAB:
-            url = "https://gitlab.com/{0}/{1}".format(self.repo.owner, self.repo.repo)
-
-            try:
-                response = requests.get(url)
-                # If the response was successful, no Exception will be raised
-                response.raise_for_status()
-            except requests.HTTPError:
-                self._print_state(check_name="has_license", state=r)
-                return r
-
-            r = response is not None and \
-                response.text is not None and  \
-                BeautifulSoup(response.text, "html.parser") is not None and \
-                BeautifulSoup(response.text, "html.parser") \
-                .find("div", class_="project-buttons") is not None and \
-                BeautifulSoup(response.text, "html.parser") \
-                .find("div", class_="project-buttons")\
-                .find(string="No license. All rights reserved") is None
-
-        self._print_state(check_name="has_license", state=r)
+            r = self._get_gitlab_license_state()
+
+        self._reporter.sub_check("has_license", r)
         return r
+
+    def _has_license_file(self):
+        # the names under which GitHub and GitLab look for a license, in the root of the repository
+        filenames = self.repo.checkout.list_files("") or set()
+        return any(re.match(r"^(licen[cs]e|copying)([.-].*)?$", filename, flags=re.IGNORECASE) is not None
+                   for filename in filenames)
+
+    def _get_gitlab_license_state(self):
+        try:
+            response = self.repo.session.get(self.repo.api, params=dict(license="true"))
+            # If the response was successful, no Exception will be raised
+            response.raise_for_status()
+            r = LicenseMixin._gitlab_project_has_license(response.json())
+        except (requests.HTTPError, ValueError):
+            r = None
+        if r is not None:
+            return r
+
+        # the API did not tell, fall back on the project page
+        url = "https://gitlab.com/{0}/{1}".format(self.repo.owner, self.repo.repo)
+        response = self.repo.session.get(url)
+        if response.status_code == 404:
+            return False
+        # any other failure, such as a server error, leaves the sub-check unfinished
+        response.raise_for_status()
+        return LicenseMixin._gitlab_html_has_license(response.text)
+
+    @staticmethod
+    def _gitlab_project_has_license(project):
+        # the license is null if GitLab did not detect one, and missing if GitLab does not report it at all
+        if not isinstance(project, dict) or "license" not in project:
+            return None
+        return project["license"] is not None
+
+    @staticmethod
+    def _gitlab_html_has_license(html):
+        if html is None:
+            return False
+        with measure("gitlab_html_parsing"):
+            # only build a tree of the buttons below the project description
+            soup = BeautifulSoup(html, html_parser, parse_only=SoupStrainer("div", class_="project-buttons"))
+            project_buttons = soup.find("div", class_="project-buttons")
+            return project_buttons is not None and \
+                project_buttons.find(string="No license. All rights reserved") is None
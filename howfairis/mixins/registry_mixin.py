@@ -1,101 +1,140 @@
-import requests
 from howfairis.code_repository_platforms import Platform
+from howfairis.profiling import record
 
 
 class RegistryMixin:
 
     def check_registry(self):
-        force_state = self.config.force_registry
-        if force_state not in [True, False, None]:
-            raise ValueError("Unexpected configuration value for force_registry.")
+        force_state = self._force_state(self.config.force_registry, 3, "registry")
         if isinstance(force_state, bool):
-            print("(3/5) registry: force {0}".format(force_state))
             return force_state
-        print("(3/5) registry")
-        results = [
-            self.has_ascl_badge(),
-            self.has_bintray_badge(),
-            self.has_conda_badge(),
-            self.has_cran_badge(),
-            self.has_crates_badge(),
-            self.has_maven_badge(),
-            self.has_npm_badge(),
-            self.has_pypi_badge(),
-            self.has_rsd_badge(),
-            self.is_on_github_marketplace()
-        ]
+        results = self._run_sub_checks(self._registry_sub_checks())
         return True in results
 
+    def _registry_sub_checks(self):
+        return [
+            self.has_ascl_badge,
+            self.has_bintray_badge,
+            self.has_conda_badge,
+            self.has_cran_badge,
+            self.has_crates_badge,
+            self.has_maven_badge,
+            self.has_npm_badge,
+            self.has_pypi_badge,
+            self.has_rsd_badge,
+            self.is_on_github_marketplace
+        ]
+
     def has_ascl_badge(self):
-        regexes = [r"https://img\.shields\.io/badge/ascl.*"]
-        return self._eval_regexes(regexes)
+        return self._eval_badge("has_ascl_badge")
 
     def has_bintray_badge(self):
-        regexes = [r"https://api\.bintray\.com/packages/.*/.*/.*/images/download\.svg",
-                   r"https://img\.shields\.io/bintray/.*"]
-        return self._eval_regexes(regexes)
+        return self._eval_badge("has_bintray_badge")
 
     def has_conda_badge(self):
-        regexes = [r"https://anaconda\.org/.*/.*/badges/downloads\.svg",
-                   r"https://anaconda\.org/.*/.*/badges/installer/conda\.svg",
-                   r"https://anaconda\.org/.*/.*/badges/latest_release_date\.svg",
-                   r"https://anaconda\.org/.*/.*/badges/latest_release_relative_date\.svg",
-                   r"https://anaconda\.org/.*/.*/badges/platforms\.svg",
-                   r"https://anaconda\.org/.*/.*/badges/version\.svg",
-                   r"https://img\.shields\.io/conda/.*"]
-        return self._eval_regexes(regexes)
+        return self._eval_badge("has_conda_badge")
 
     def has_cran_badge(self):
-        regexes = [r"https://cranlogs\.r-pkg\.org/badges/.*",
-                   r"https://www\.r-pkg\.org/badges/.*",
-                   r"https://img\.shields\.io/cran/.*"]
-        return self._eval_regexes(regexes)
+        return self._eval_badge("has_cran_badge")
 
     def has_crates_badge(self):
-        regexes = [r"https://badgen.net/crates/v/.*",
-                   r"https://img\.shields\.io/crates/.*"]
-        return self._eval_regexes(regexes)
+        return self._eval_badge("has_crates_badge")
 
     def has_maven_badge(self):
-        regexes = [r"https://badgen.net/maven/v/maven-central/.*",
-                   r"https://img\.shields\.io/maven-central/.*",
-                   r"https://img\.shields\.io/maven-metadata/.*"]
-        return self._eval_regexes(regexes)
+        return self._eval_badge("has_maven_badge")
 
     def has_npm_badge(self):
-        regexes = [r"https://badge.fury.io/js/.*",
-                   r"https://badgen.net/npm/v/.*",
-                   r"https://img\.shields\.io/npm/.*"]
-        return self._eval_regexes(regexes)
+        return self._eval_badge("has_npm_badge")
 
     def has_pypi_badge(self):
-        regexes = [r"https://pypi\.python\.org/pypi/",
-                   r"https://badge\.fury\.io/py/.*\.svg",
-                   r"https://badgen\.net/pypi/v/.*",
-                   r"https://img\.shields\.io/pypi/.*"]
-        return self._eval_regexes(regexes)
+        return self._eval_badge("has_pypi_badge")
 
     def has_rsd_badge(self):
-        regexes = [r"https://img\.shields\.io/badge/RSD-.*",
-                   r"https://img\.shields\.io/badge/rsd-.*"]
-        return self._eval_regexes(regexes)
+        return self._eval_badge("has_rsd_badge")
 
     def is_on_github_marketplace(self):
 
         r = False
 
         if self.repo.platform == Platform.GITHUB:
-            try:
-                response = requests.get(self.repo.url)
-                # If the response was successful, no Exception will be raised
-                response.raise_for_status()
-            except requests.HTTPError:
-                self._print_state(check_name="is_on_github_marketplace", state=r)
+            if self._may_be_github_action() is False:
+                self._reporter.sub_check("is_on_github_marketplace", r)
                 return r
 
-            html = response.text
-            r = "Use this GitHub Action with your project" in html and \
-                "Add this Action to an existing workflow or create a new one." in html
+            scanner = MarkerScanner(marketplace_markers)
+            with self.repo.session.get(self.repo.url, stream=True) as response:
+                if response.status_code == 404:
+                    self._reporter.sub_check("is_on_github_marketplace", r)
+                    return r
+                # any other failure, such as a server error, leaves the sub-check unfinished
+                response.raise_for_status()
+                for chunk in response.iter_content(chunk_size=MarkerScanner.chunk_size):
+                    if not getattr(response, "from_cache", False):
+                        # the session cannot tell how much of a streamed body is read
+                        record(bytes_=len(chunk))
+                    if scanner.feed(chunk):
+                        break
+
+            r = scanner.found_all
 
-        self._print_state(check_name="is_on_github_marketplace", state=r)
+        self._reporter.sub_check("is_on_github_marketplace", r)
         return r
+
+    def _may_be_github_action(self):
+        # only a repository with an action.yml or action.yaml in its root can be published on the marketplace
+        if self.repo.path != "":
+            return None
+        exists = [self.files.exists("action.yml"), self.files.exists("action.yaml")]
+        if None in exists:
+            return None
+        return True in exists
+
+    @staticmethod
+    def _html_has_marketplace_markers(html):
+        scanner = MarkerScanner(marketplace_markers)
+        scanner.feed(html.encode("utf-8"))
+        return scanner.found_all
+
+
+# The sentences on the page of a repository that is published on the GitHub Marketplace
+marketplace_markers = [b"Use this GitHub Action with your project",
+                       b"Add this Action to an existing workflow or create a new one."]
+
+
+class MarkerScanner:
+    """Looks for markers in a body that is received in chunks, so that reading can stop as soon as all
+    markers were seen, or when more than max_bytes were read without seeing them all
+
+    Args:
+        markers: List of byte strings to look for
+        max_bytes: Number of bytes after which to give up. Defaults to :py:attr:`max_bytes`.
+
+    """
+
+    chunk_size = 16 * 1024
+    max_bytes = 2 * 1024 * 1024
+
+    def __init__(self, markers, max_bytes=None):
+        self.markers = markers
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        self._missing = list(markers)
+        self._n_bytes = 0
+        self._tail = b""
+        # a marker can start in one chunk and end in the next
+        self._overlap = max(len(marker) for marker in markers) - 1
+
+    @property
+    def found_all(self):
+        return len(self._missing) == 0
+
+    def feed(self, chunk):
+        """Look for the markers that were not seen yet in the next chunk.
+
+        Returns: True if there is no need to read further.
+        """
+        window = self._tail + chunk
+        self._missing = [marker for marker in self._missing if marker not in window]
+        self._n_bytes += len(chunk)
+        self._tail = window[-self._overlap:]
+        return self.found_all or self._n_bytes >= self.max_bytes
@@ -1,33 +1,30 @@
-import requests
 from howfairis.code_repository_platforms import Platform
 
 
 class RepositoryMixin:
 
     def check_repository(self):
-        force_state = self.config.force_repository
-        if force_state not in [True, False, None]:
-            raise ValueError("Unexpected configuration value for force_repository.")
+        force_state = self._force_state(self.config.force_repository, 1, "repository")
         if isinstance(force_state, bool):
-            print("(1/5) repository: force {0}".format(force_state))
             return force_state
-        print("(1/5) repository")
-        results = [self.has_open_repository()]
+        results = self._run_sub_checks(self._repository_sub_checks())
         return True in results
 
+    def _repository_sub_checks(self):
+        return [self.has_open_repository]
+
     def has_open_repository(self):
 
+        if self.repo.checkout is None and self.files.filenames is not None:
+            # the files could be listed, so the repository is accessible
+            self._reporter.sub_check("has_open_repository", True)
+            return True
+
         if self.repo.platform == Platform.GITHUB:
             url = self.repo.api
         elif self.repo.platform == Platform.GITLAB:
             url = self.repo.api + "/repository/tree"
 
-        try:
-            response = requests.get(url)
-            # If the response was successful, no Exception will be raised
-            response.raise_for_status()
-        except requests.HTTPError:
-            self._print_state(check_name="has_open_repository", state=False)
-            return False
-        self._print_state(check_name="has_open_repository", state=True)
-        return True
+        r = self._is_found(url)
+        self._reporter.sub_check("has_open_repository", r)
+        return r
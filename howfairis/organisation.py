@@ -0,0 +1,141 @@
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from howfairis.code_repository_platforms import Platform
+from howfairis.profiling import measure
+from howfairis.profiling import propagate
+from howfairis.session import get_default_session
+
+
+# For each platform, the patterns of the URLs of an organisation, a group or a user, with its name as the only group
+url_patterns = {
+    Platform.GITHUB: [r"^https://github\.com/orgs/([^/]+)/?$",
+                      r"^https://github\.com/([^/]+)/?$"],
+    Platform.GITLAB: [r"^https://gitlab\.com/groups/([^/]+)/?$",
+                      r"^https://gitlab\.com/([^/]+)/?$"]
+}
+
+
+class Organisation:
+    """GitHub organisation or user, or GitLab group or user, whose repositories are to be checked
+
+    The repositories are listed page by page. After the first page, the next pages are retrieved a few at a time
+    while the repositories of the earlier pages are handed out, so that checking can start right away and
+    only a few pages are ever held in memory.
+
+    Args:
+        url: URL of the organisation or group. For example https://github.com/fair-software,
+            https://github.com/orgs/fair-software or https://gitlab.com/jspaaks.
+        session: :py:class:`requests.Session` to list the repositories with. Defaults to a session shared by the
+            whole process.
+        per_page: Number of repositories per page of the listing.
+        prefetch: Number of pages that are retrieved at the same time.
+
+    """
+
+    def __init__(self, url: str, session=None, per_page=100, prefetch=4):
+        assert Organisation.is_organisation_url(url), "url is not an organisation or a group"
+        self.url = url
+        self.session = get_default_session() if session is None else session
+        self.per_page = per_page
+        self.prefetch = prefetch
+        self.platform, self.name = Organisation._parse_url(url)
+        # the repositories of organisations and groups are listed at a different endpoint than those of users,
+        # which one it is is found out with the first page
+        self._api = None
+        # of an organisation its public repositories are listed, of a user the repositories that the user owns
+        self._repo_type = None
+
+    @staticmethod
+    def is_organisation_url(url):
+        """Whether url is that of an organisation, a group or a user rather than of a repository."""
+        return Organisation._parse_url(url) is not None
+
+    @staticmethod
+    def _parse_url(url):
+        for platform, patterns in url_patterns.items():
+            for pattern in patterns:
+                matched = re.match(pattern, url)
+                if matched is not None:
+                    return platform, matched.group(1)
+        return None
+
+    def get_repository_urls(self):
+        """URLs of the public repositories, in the order of the listing.
+
+        Yields:
+            The URL of each repository, as soon as the page that lists it has been retrieved.
+        """
+        with measure("list_repositories"):
+            first_page, n_pages = self._get_first_page()
+        yield from first_page
+        if n_pages is None and len(first_page) < self.per_page or n_pages == 1:
+            return
+
+        get_page = propagate(self._get_page)
+        with ThreadPoolExecutor(max_workers=self.prefetch) as executor:
+            pending = deque()
+            next_page = 2
+            while True:
+                while len(pending) < self.prefetch and (n_pages is None or next_page <= n_pages):
+                    pending.append(executor.submit(get_page, next_page))
+                    next_page += 1
+                if len(pending) == 0:
+                    return
+                page, _ = pending.popleft().result()
+                yield from page
+                if n_pages is None and len(page) < self.per_page:
+                    # that was the last page, the pages after it are empty
+                    for future in pending:
+                        future.cancel()
+                    return
+
+    def _get_first_page(self):
+        if self.platform == Platform.GITHUB:
+            self._api = "https://api.github.com/orgs/{0}/repos".format(self.name)
+            self._repo_type = "public"
+            response = self.session.get(self._get_page_url(1))
+            if response.status_code == 404:
+                self._api = "https://api.github.com/users/{0}/repos".format(self.name)
+                self._repo_type = "owner"
+                response = self.session.get(self._get_page_url(1))
+        else:
+            self._api = "https://gitlab.com/api/v4/groups/{0}/projects".format(self.name)
+            response = self.session.get(self._get_page_url(1))
+            if response.status_code == 404:
+                self._api = "https://gitlab.com/api/v4/users/{0}/projects".format(self.name)
+                response = self.session.get(self._get_page_url(1))
+        return self._parse_page(response)
+
+    def _get_page(self, page):
+        with measure("list_repositories"):
+            return self._parse_page(self.session.get(self._get_page_url(page)))
+
+    def _get_page_url(self, page):
+        if self.platform == Platform.GITHUB:
+            return "{0}?type={1}&sort=full_name&per_page={2}&page={3}".format(self._api, self._repo_type, self.per_page,
+                                                                              page)
+        return "{0}?visibility=public&order_by=id&sort=asc&per_page={1}&page={2}" \
+            .format(self._api, self.per_page, page)
+
+    def _parse_page(self, response):
+        response.raise_for_status()
+        if self.platform == Platform.GITHUB:
+            urls = [item["html_url"] for item in response.json() if not item.get("private", False)]
+        else:
+            urls = [item["web_url"] for item in response.json()]
+        return urls, Organisation._get_n_pages(response)
+
+    @staticmethod
+    def _get_n_pages(response):
+        # GitLab reports the number of pages, except for very large listings
+        n_pages = response.headers.get("X-Total-Pages", "")
+        if n_pages.isdigit():
+            return int(n_pages)
+        # GitHub links to the last page, except on the last page itself
+        last = response.links.get("last")
+        if last is not None:
+            matched = re.search(r"[?&]page=([0-9]+)", last["url"])
+            if matched is not None:
+                return int(matched.group(1))
+        return None
@@ -0,0 +1,200 @@
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+_local = threading.local()
+
+
+class Measurement:
+    """Time taken and HTTP traffic of a phase of checking, such as a sub-check
+
+    Attributes:
+        count (int): How often the phase was measured.
+        wall_time (float): Seconds spent in the phase, in total, including the phases nested in it.
+        requests (int): Number of HTTP requests that were sent over the network, including those sent again.
+        bytes (int): Number of bytes of response bodies that were received.
+        cache_hits (int): Number of responses that came from the HTTP cache, also after revalidation.
+        retries (int): Number of requests that were sent again after a failure or after being throttled.
+    """
+
+    fields = ["count", "wall_time", "requests", "bytes", "cache_hits", "retries"]
+
+    def __init__(self):
+        self.count = 0
+        self.wall_time = 0.0
+        self.requests = 0
+        self.bytes = 0
+        self.cache_hits = 0
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def add(self, other):
+        """Add the numbers of other to those of this measurement."""
+        with self._lock:
+            for field in Measurement.fields:
+                setattr(self, field, getattr(self, field) + getattr(other, field))
+
+    def record(self, requests=0, bytes_=0, cache_hits=0, retries=0):
+        """Count HTTP traffic towards this measurement."""
+        with self._lock:
+            self.requests += requests
+            self.bytes += bytes_
+            self.cache_hits += cache_hits
+            self.retries += retries
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in Measurement.fields}
+
+
+class Profile:
+    """Measurements of the phases of checking one or more repositories, by phase name
+
+    The phases are the sub-checks of :py:class:`Checker`, such as has_license, and the steps around them, such as
+    retrieving the README or the default branch. While a phase is measured, the HTTP requests that its thread
+    sends through a :py:class:`Session` count towards it. When phases are nested, the requests count towards the
+    innermost phase only, while its time also counts towards the phases around it. Measurements of the same
+    phase, for example of different repositories, are added up.
+
+    Attributes:
+        measurements (dict): A :py:class:`Measurement` per phase name.
+
+    """
+
+    def __init__(self):
+        self.measurements = dict()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, name):
+        """Measure the block as phase name."""
+        measurement = Measurement()
+        measurement.count = 1
+        previous = getattr(_local, "profile", None), getattr(_local, "measurement", None)
+        _local.profile, _local.measurement = self, measurement
+        start = time.perf_counter()
+        try:
+            yield measurement
+        finally:
+            measurement.wall_time = time.perf_counter() - start
+            _local.profile, _local.measurement = previous
+            with self._lock:
+                total = self.measurements.setdefault(name, Measurement())
+            total.add(measurement)
+
+    def as_dict(self):
+        """The measurements by phase name, the slowest phase first.
+
+        Returns: A dictionary
+        """
+        with self._lock:
+            items = sorted(self.measurements.items(), key=lambda item: item[1].wall_time, reverse=True)
+        return {name: measurement.as_dict() for name, measurement in items}
+
+    def format_table(self):
+        """The measurements as a table of plain text, the slowest phase first.
+
+        Returns: A string
+        """
+        row = "{0:<32} {1:>6} {2:>10} {3:>9} {4:>12} {5:>11} {6:>8}"
+        lines = [row.format("phase", "count", "seconds", "requests", "bytes", "cache hits", "retries")]
+        for name, m in self.as_dict().items():
+            lines.append(row.format(name, m["count"], "{0:.3f}".format(m["wall_time"]), m["requests"], m["bytes"],
+                                    m["cache_hits"], m["retries"]))
+        return "\n".join(lines)
+
+
+@contextmanager
+def measure(name, profile=None):
+    """Measure the block as phase name of profile, or of the profile that is being measured in the current
+    thread if profile is None. Does nothing if there is neither, so it costs next to nothing when not profiling."""
+    if profile is None:
+        profile = getattr(_local, "profile", None)
+    if profile is None:
+        yield None
+        return
+    with profile.measure(name) as measurement:
+        yield measurement
+
+
+def record(requests=0, bytes_=0, cache_hits=0, retries=0):
+    """Count HTTP traffic towards the phase that is being measured in the current thread, if any."""
+    measurement = getattr(_local, "measurement", None)
+    if measurement is not None:
+        measurement.record(requests, bytes_, cache_hits, retries)
+
+
+def propagate(fn):
+    """Wrap fn so that, when it runs on another thread, it counts towards the phase that is being measured in the
+    current thread."""
+    profile = getattr(_local, "profile", None)
+    if profile is None:
+        return fn
+    measurement = _local.measurement
+
+    def wrapper(*args, **kwargs):
+        previous = getattr(_local, "profile", None), getattr(_local, "measurement", None)
+        _local.profile, _local.measurement = profile, measurement
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _local.profile, _local.measurement = previous
+
+    return wrapper
+
+
+class RunProfiler:
+    """Profiles everything that runs between :py:func:`start` and :py:func:`stop` with :py:mod:`cProfile`, in all
+    threads, and traces the memory that is allocated meanwhile with :py:mod:`tracemalloc`
+
+    Args:
+        directory: Where :py:func:`stop` writes howfairis.pstats, to be read with :py:class:`pstats.Stats`, and
+            howfairis.tracemalloc, to be read with :py:meth:`tracemalloc.Snapshot.load`.
+
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._profilers = []
+        self._lock = threading.Lock()
+
+    def _start_profiler(self, *_):
+        profiler = cProfile.Profile()
+        try:
+            # replaces this function as the profile function of the thread
+            profiler.enable()
+        except ValueError:
+            # another profiler is active already
+            return
+        with self._lock:
+            self._profilers.append(profiler)
+
+    def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        tracemalloc.start()
+        threading.setprofile(self._start_profiler)
+        self._start_profiler()
+
+    def stop(self):
+        threading.setprofile(None)
+        with self._lock:
+            profilers = list(self._profilers)
+        for profiler in profilers:
+            profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        snapshot.dump(os.path.join(self.directory, "howfairis.tracemalloc"))
+        if len(profilers) > 0:
+            pstats.Stats(*profilers).dump_stats(os.path.join(self.directory, "howfairis.pstats"))
+
+
+def write_profile(profile, directory):
+    """Write the measurements of profile to profile.json in directory."""
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, "profile.json"), "wt") as f:
+        json.dump(profile.as_dict(), f, indent=2)
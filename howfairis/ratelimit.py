@@ -0,0 +1,170 @@
+import email.utils
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a host asks to wait longer than the :py:class:`RateLimiter` is willing to"""
+
+
+class RateLimiter:
+    """Schedules the requests to each host according to the rate limit headers in its responses
+
+    GitHub reports the remaining quota in X-RateLimit-Remaining and X-RateLimit-Reset, GitLab in
+    RateLimit-Remaining and RateLimit-Reset. Every request that is sent is counted against the quota of its
+    host, so that concurrent requests do not overshoot it. When the quota has run out, or a host responds
+    with 429 Too Many Requests or with a 403 Forbidden that is about rate limiting, requests to that host
+    are suspended until they are allowed again, so that a throttled request is not mistaken for a missing
+    file.
+
+    Args:
+        max_wait: Longest time in seconds to wait for a host. If a host asks to wait longer than that,
+            :py:class:`RateLimitExceeded` is raised instead.
+
+    """
+
+    def __init__(self, max_wait=3600):
+        self.max_wait = max_wait
+        self._quotas = dict()
+        self._lock = threading.Lock()
+
+    def _get_quota(self, url):
+        host = urlsplit(url).hostname
+        with self._lock:
+            return self._quotas.setdefault(host, _Quota(host))
+
+    def wait(self, request, max_wait=None):
+        """Block until a request may be sent to the host of request.
+
+        Args:
+            request: Request that is about to be sent.
+            max_wait: Longest time in seconds to wait for this request, if shorter than the max_wait of the
+                rate limiter.
+
+        """
+        seconds = self.reserve(request.url, max_wait)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def reserve(self, url, max_wait=None):
+        """Count a request for url against the quota of its host, without blocking, for callers that wait in
+        their own way, such as asyncio code.
+
+        Args:
+            url: URL of the request that is about to be sent.
+            max_wait: Longest time in seconds to wait for this request, if shorter than the max_wait of the
+                rate limiter.
+
+        Returns: The number of seconds to wait before sending the request.
+        """
+        return self._get_quota(url).reserve(self.max_wait if max_wait is None else min(self.max_wait, max_wait))
+
+    def update(self, response, url=None):
+        """Take note of the rate limit headers of response.
+
+        Args:
+            response: Response to a request that was sent after :py:func:`wait`.
+            url: URL that the request was for, if it was sent elsewhere, such as to a mirror. Defaults to the
+                URL of the request of response.
+
+        Returns: True if the request was throttled and should be sent again.
+        """
+        return self.update_from_headers(response.request.url if url is None else url, response.status_code,
+                                        response.headers)
+
+    def update_from_headers(self, url, status_code, headers):
+        """Take note of the rate limit headers of a response to a request for url, for responses that are not
+        :py:class:`requests.Response` objects.
+
+        Returns: True if the request was throttled and should be sent again.
+        """
+        return self._get_quota(url).update(status_code, headers)
+
+
+class _Quota:
+
+    def __init__(self, host):
+        self.host = host
+        self.remaining = None
+        self.reset = None
+        self.not_before = 0
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait):
+        with self._lock:
+            now = time.time()
+            if self.reset is not None and self.reset <= now:
+                # the quota has been reset since the last response
+                self.remaining = None
+                self.reset = None
+            start = max(self.not_before, now)
+            is_exhausted = self.remaining is not None and self.remaining <= 0 and self.reset is not None
+            if is_exhausted:
+                start = max(start, self.reset)
+            if start - now > max_wait:
+                raise RateLimitExceeded("Rate limit of {0} exceeded, it resets in {1:.0f} seconds."
+                                        .format(self.host, start - now))
+            if is_exhausted:
+                # by the time this request is sent, the quota will have been reset. Every other request that
+                # comes in meanwhile has to wait for the reset as well.
+                self.not_before = max(self.not_before, self.reset)
+                self.remaining = None
+                self.reset = None
+            elif self.remaining is not None:
+                self.remaining -= 1
+        return start - now
+
+    def update(self, status_code, headers):
+        remaining = _get_number(headers, ["X-RateLimit-Remaining", "RateLimit-Remaining"])
+        reset = _get_number(headers, ["X-RateLimit-Reset", "RateLimit-Reset"])
+        retry_after = _get_retry_after(headers)
+        now = time.time()
+
+        if reset is not None and reset < 1e9:
+            # a number of seconds rather than a point in time
+            reset = now + reset
+
+        throttled = status_code == 429 or status_code == 403 and (remaining == 0 or retry_after is not None)
+
+        with self._lock:
+            if remaining is not None:
+                self.remaining = int(remaining)
+            if reset is not None:
+                self.reset = reset
+            if not throttled:
+                return False
+            if retry_after is not None:
+                self.not_before = max(self.not_before, now + retry_after)
+            elif self.reset is not None and self.reset > now:
+                self.remaining = 0
+            else:
+                # no hint about how long to wait, back off for a minute
+                self.not_before = max(self.not_before, now + 60)
+        return True
+
+
+def _get_number(headers, names):
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            try:
+                return float(value)
+            except ValueError:
+                return None
+    return None
+
+
+def _get_retry_after(headers):
+    value = headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        # Retry-After can also be an HTTP date
+        return max(email.utils.parsedate_to_datetime(value).timestamp() - time.time(), 0)
+    except (TypeError, ValueError):
+        return None
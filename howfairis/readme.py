@@ -1,6 +1,14 @@
 import re
 from typing import Optional
+from howfairis.badge_rules import matcher
 from howfairis.compliance import Compliance
+from howfairis.links import index_links
+from howfairis.profiling import measure
+
+
+# Names under which a README is looked for, in order of preference
+readme_filenames = ["README.rst", "README.md", "README.markdown", "README.txt", "README",
+                    "readme.rst", "readme.md", "Readme.rst", "Readme.md"]
 
 
 class Readme:
@@ -8,6 +16,8 @@ class Readme:
         self.filename = filename
         self.text = text
         self.fmt = fmt
+        self._badges = None
+        self._links = None
 
     def __eq__(self, other):
         return \
@@ -15,6 +25,23 @@ class Readme:
             self.text == other.text and \
             self.fmt == other.fmt
 
+    @property
+    def badges(self):
+        """Names of the badge checks (see :py:mod:`howfairis.badge_rules`) whose patterns match one of the
+        links in the text. Determined on first use."""
+        if self._badges is None:
+            self._badges = matcher.match(self.links)
+        return self._badges
+
+    @property
+    def links(self):
+        """Targets of the links and images in the text, by host name. Determined on first use, with a single
+        pass over the text."""
+        if self._links is None:
+            with measure("readme_links"):
+                self._links = dict() if self.text is None else index_links(self.text, self.fmt)
+        return self._links
+
     def get_compliance(self, compliant="%E2%97%8F", noncompliant="%E2%97%8B", separator="%20%20"):
 
         s = r"(?P<skip>^.*)" \
@@ -46,3 +73,25 @@ class Readme:
                           checklist=groupdict.get("checklist") == compliant,
                           compliant_symbol=compliant,
                           noncompliant_symbol=noncompliant)
+
+
+class CachedReadme(Readme):
+    """What :py:class:`howfairis.result_cache.ResultCache` keeps of a :py:class:`Readme`: its file name, its format
+    and the fair-software.eu badge in it, but not its text, which is None
+
+    Args:
+        filename: File name of the README, None if there was none.
+        fmt: Format of the README.
+        compliance: Compliance of the fair-software.eu badge in the README, None if it had none.
+
+    """
+
+    def __init__(self, filename: Optional[str] = None, fmt: Optional[str] = None,
+                 compliance: Optional[Compliance] = None):
+        super().__init__(filename=filename, text=None, fmt=fmt)
+        self.compliance = compliance
+
+    def get_compliance(self, compliant="%E2%97%8F", noncompliant="%E2%97%8B", separator="%20%20"):
+        # pylint: disable=unused-argument
+        # only the badge with the default symbols and separator is kept
+        return self.compliance
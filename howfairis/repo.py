@@ -1,20 +1,35 @@
+import os
 import re
+import threading
+from urllib.parse import quote
 import requests
+from howfairis.checkout import Checkout
 from howfairis.code_repository_platforms import Platform
+from howfairis.organisation import Organisation
+from howfairis.profiling import measure
+from howfairis.session import get_default_session
 
 
 class Repo:
     """Publicly accessible repository with version control
 
+    Constructing a repo does not make any requests. The default branch is looked up when it is first needed,
+    which is never if a branch was given.
+
     Args:
         url: URL of repository. For example https://github.com/fair-software/howfairis
         branch: Branch to checkout. Defaults to default branch of the repository platform.
             Can also be a commit SHA-1 hash or tag.
         path: Path inside repository. Defaults to root.
         config_file: Name of the configuration file to control the behavior of the howfairis package.
+        session: :py:class:`requests.Session` for all requests about this repository, including those made by
+            :py:class:`Config` and :py:class:`Checker`. Defaults to a session shared by the whole process.
+        checkout: Directory with a working copy or a bare git repository of the repository. Files are then
+            read from there instead of being downloaded, see :py:class:`Checkout`. The default branch and the
+            commit are taken from it as well.
 
     """
-    def __init__(self, url: str, branch=None, path=None, config_file=None):
+    def __init__(self, url: str, branch=None, path=None, config_file=None, session=None, checkout=None):
         # run assertions on user input
         Repo._check_assertions(url)
 
@@ -23,19 +38,115 @@ class Repo:
         self.branch = branch
         self.path = "" if path is None else "/" + path.strip("/")
         self.config_file = config_file
+        self.session = get_default_session() if session is None else session
+        self.checkout = None if checkout is None else Checkout(checkout, branch)
+        self._default_branch = None
+        self._is_pinned = False
+        self._raw_url_format_string = None
+        self._sha = None
+        self._lock = threading.Lock()
 
         # assign remaining members as needed
         self.platform = self._derive_platform()
         self.owner, self.repo = self._derive_owner_and_repo()
         self.api = self._derive_api()
-        self.default_branch = self._get_default_branch()
-        self.raw_url_format_string = self._derive_raw_url_format_string()
+
+    @property
+    def default_branch(self):
+        """Default branch of the repository on its platform. It is looked up on first use, with a single API
+        request."""
+        with self._lock:
+            if self._default_branch is None:
+                with measure("default_branch"):
+                    self._default_branch = self._get_default_branch()
+        return self._default_branch
+
+    @default_branch.setter
+    def default_branch(self, default_branch):
+        with self._lock:
+            self._default_branch = default_branch
+            self._raw_url_format_string = None
+
+    @property
+    def is_pinned(self):
+        """Whether files are read at :py:attr:`sha` rather than at the branch, see :py:func:`pin`."""
+        return self._is_pinned
+
+    @property
+    def ref(self):
+        """What files are read at: the commit SHA-1 hash if the repo is pinned, otherwise the branch or the default
+        branch."""
+        if self._is_pinned:
+            return self._sha
+        return self.default_branch if self.branch is None else self.branch
+
+    @property
+    def raw_url_format_string(self):
+        """Format string for the URL of a file in the repository, with the file name as its only field."""
+        if self._raw_url_format_string is None:
+            self._raw_url_format_string = self._derive_raw_url_format_string()
+        return self._raw_url_format_string
+
+    @property
+    def sha(self):
+        """Commit SHA-1 hash that the branch (or the default branch) points to. It is looked up on first use,
+        with a single API request, also when the name of the default branch is not known. None if it could not
+        be determined."""
+        if self._sha is None:
+            with measure("sha"):
+                self._sha = self._get_sha()
+        return self._sha
+
+    @sha.setter
+    def sha(self, sha):
+        self._sha = sha
+
+    def pin(self):
+        """Read files at the commit that the branch points to now, rather than at the branch. Whatever is read
+        then belongs to :py:attr:`sha`, also if the branch moves on meanwhile or if the HTTP cache still has
+        responses from before it moved. The README and the configuration file are only pinned if they have not
+        been read yet. Does nothing if the commit SHA-1 hash could not be determined, also not in time.
+
+        Returns: True if the repo is pinned
+        """
+        try:
+            if self.sha is None:
+                return False
+        except requests.Timeout:
+            return False
+        with self._lock:
+            self._is_pinned = True
+            self._raw_url_format_string = None
+        return True
+
+    def get_location(self, filename):
+        """Where filename in the directory at the path of the repository is read from: a path on disk when
+        reading from a checkout, a URL otherwise."""
+        if self.checkout is not None:
+            return os.path.join(self.checkout.directory, self.path.lstrip("/"), filename)
+        return self.raw_url_format_string.format(filename)
+
+    def get_text(self, filename):
+        """Text of filename in the directory at the path of the repository. Raises :py:class:`requests.HTTPError`
+        if the request failed for another reason than that the file does not exist, such as a server error.
+
+        Returns: The text, or None if the file could not be found.
+        """
+        if self.checkout is not None:
+            return self.checkout.read_text(self.path + "/" + filename)
+        response = self.session.get(self.raw_url_format_string.format(filename))
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.text
 
     @staticmethod
     def _check_assertions(url):
         assert url.startswith("https://"), "url should start with https://"
         assert True in [url.startswith("https://github.com"),
                         url.startswith("https://gitlab.com")], "Repository should be on github.com or on gitlab.com."
+        assert not Organisation.is_organisation_url(url), "url is of an organisation, a group or a user, not of a " + \
+                                                          "repository. Use Organisation to list its repositories."
         assert re.search("^https://git(hub|lab).com/[^/]+/[^/]+", url), "url is not a repository"
 
     def _derive_api(self):
@@ -73,11 +184,8 @@ class Repo:
         return None
 
     def _derive_raw_url_format_string(self):
-        if self.branch is not None:
-            # User specified a branch, use that regardless of whether it actually exists
-            branch = self.branch
-        else:
-            branch = self.default_branch
+        # a branch that the user specified is used regardless of whether it actually exists
+        branch = self.ref
 
         if self.platform == Platform.GITHUB:
             raw_url_format_string = "https://raw.githubusercontent.com/{0}/{1}/{2}{3}" \
@@ -91,12 +199,41 @@ class Repo:
 
     def _get_default_branch(self):
         fallback_branch = 'main'
+        if self.checkout is not None:
+            # the branch that is checked out stands in for the default branch
+            branch = self.checkout.get_branch()
+            return fallback_branch if branch is None else branch
+
         # GitHub API and GitLab API work the same
-        response = requests.get(self.api)
+        response = self.session.get(self.api)
+
+        if response.status_code == 404:
+            return fallback_branch
+        # any other failure, such as a server error, does not mean that there is no default branch
+        response.raise_for_status()
+        return response.json().get("default_branch", fallback_branch)
+
+    def _get_sha(self):
+        if self.checkout is not None:
+            return self.checkout.get_sha()
+
+        # HEAD is the default branch, without having to look up its name first
+        ref = "HEAD" if self.branch is None else self.branch
+        if re.fullmatch("[0-9a-f]{40}", ref):
+            return ref
+
+        if self.platform == Platform.GITHUB:
+            # this media type makes the API respond with nothing but the hash
+            response = self.session.get(self.api + "/commits/" + ref,
+                                        headers={"Accept": "application/vnd.github.sha"})
+        elif self.platform == Platform.GITLAB:
+            response = self.session.get(self.api + "/repository/commits/" + quote(ref, safe=""))
 
-        # If the request was successful, the next line will not raise any Exception
         try:
             response.raise_for_status()
         except requests.HTTPError:
-            return fallback_branch
-        return response.json().get("default_branch", fallback_branch)
+            return None
+
+        if self.platform == Platform.GITHUB:
+            return response.text.strip()
+        return response.json().get("id")
@@ -0,0 +1,96 @@
+import sys
+from colorama import Fore
+from colorama import Style
+
+
+class Reporter:
+    """Receives the events of checking a repository with :py:class:`Checker` and :py:class:`Config`
+
+    All events are ignored. Subclasses override the events they are interested in.
+    """
+
+    def message(self, text):
+        """Something to know about the check as a whole, for example which configuration file is used."""
+
+    def recommendation(self, number, name, forced=None):
+        """The recommendation with the given number, from 1 to 5, and name is about to be checked. If forced is
+        True or False, its state is forced to that by the configuration, and none of its sub-checks are run."""
+
+    def sub_check(self, check_name, state):
+        """The state of a sub-check is known: True or False, or None if it did not finish."""
+
+    def sub_check_skipped(self, check_name, reason):
+        """A sub-check was not run, for a reason such as "offline". It does not count as compliant."""
+
+
+class NullReporter(Reporter):
+    """Ignores all events, for when only the results matter"""
+
+
+class ConsoleReporter(Reporter):
+    """Writes each event to a text stream on a line of its own, in color
+
+    Args:
+        stream: Text stream to write to. Defaults to whatever :py:data:`sys.stdout` is at the time of writing.
+
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def _write(self, line):
+        stream = sys.stdout if self.stream is None else self.stream
+        # a single write, so that lines from different threads do not run into each other
+        stream.write(line + "\n")
+
+    def message(self, text):
+        self._write(text)
+
+    def recommendation(self, number, name, forced=None):
+        if isinstance(forced, bool):
+            self._write("({0}/5) {1}: force {2}".format(number, name, forced))
+        else:
+            self._write("({0}/5) {1}".format(number, name))
+
+    def sub_check(self, check_name, state):
+        indent = " " * 6
+        if state is True:
+            self._write(indent + Style.BRIGHT + Fore.GREEN + "\u2713 " + Style.RESET_ALL + check_name)
+        elif state is False:
+            self._write(indent + Style.BRIGHT + Fore.RED + "\u00D7 " + Style.RESET_ALL + check_name)
+        else:
+            self._write(indent + Style.BRIGHT + Fore.YELLOW + "? " + Style.RESET_ALL + check_name +
+                        " (did not finish)")
+
+    def sub_check_skipped(self, check_name, reason):
+        self._write(" " * 6 + Style.DIM + "- " + Style.RESET_ALL + check_name + " (skipped when {0})".format(reason))
+
+
+class CollectingReporter(Reporter):
+    """Keeps the events in memory, in the order in which they happened
+
+    Attributes:
+        events (list): A tuple per event, of the name of the event followed by its arguments. For example
+            ``("sub_check", "has_pypi_badge", True)``.
+
+    """
+
+    def __init__(self):
+        self.events = []
+
+    def message(self, text):
+        self.events.append(("message", text))
+
+    def recommendation(self, number, name, forced=None):
+        self.events.append(("recommendation", number, name, forced))
+
+    def sub_check(self, check_name, state):
+        self.events.append(("sub_check", check_name, state))
+
+    def sub_check_skipped(self, check_name, reason):
+        self.events.append(("sub_check_skipped", check_name, reason))
+
+    def replay(self, reporter):
+        """Send the events that were collected to reporter, in the same order."""
+        for event in self.events:
+            getattr(reporter, event[0])(*event[1:])
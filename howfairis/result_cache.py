@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from howfairis.__version__ import __version__
+from howfairis.compliance import Compliance
+from howfairis.http_cache import default_cache_directory
+from howfairis.readme import CachedReadme
+from howfairis.readme_format import ReadmeFormat
+
+
+class CachedResult:
+    """Result of checking a commit, as stored by :py:class:`ResultCache`
+
+    Attributes:
+        compliance (Compliance): The compliance that was found.
+        readme (Optional[CachedReadme]): What was found of the README, so that a badge can be formatted and
+            compared with the badge in the README without retrieving it. None if that was not stored.
+        default_branch (Optional[str]): Default branch of the repository when the commit was checked, if no branch
+            was given. None if that was not stored.
+    """
+
+    def __init__(self, compliance, readme=None, default_branch=None):
+        self.compliance = compliance
+        self.readme = readme
+        self.default_branch = default_branch
+
+
+class ResultCache:
+    """Persistent cache of compliance results, stored in a SQLite database on disk
+
+    A result is stored per commit, so a repository that has not changed since it was last checked does not
+    need to be checked again, nor its README retrieved. Results obtained with a different configuration or a
+    different version of howfairis are kept apart. The files of the commit should be read at its SHA, see
+    :py:func:`howfairis.Repo.pin`, so that a result does not describe an earlier commit. Some checks are about
+    the repository rather than the commit, such as whether it is open, so results expire after max_age.
+
+    Args:
+        directory: Directory to keep the cache in. Defaults to $XDG_CACHE_HOME/howfairis or ~/.cache/howfairis.
+        max_age: Seconds after which a stored result is no longer used. Defaults to a week.
+
+    """
+
+    def __init__(self, directory=None, max_age=7 * 24 * 3600):
+        if directory is None:
+            directory = default_cache_directory()
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(os.path.join(directory, "result-cache.sqlite"), timeout=30,
+                                           check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("CREATE TABLE IF NOT EXISTS results ("
+                                     "key TEXT PRIMARY KEY, compliance TEXT, stored_at REAL)")
+
+    @staticmethod
+    def key(repo, config, offline=False):
+        """Cache key for checking repo with config. Resolves the commit SHA of repo if that was not done yet.
+
+        Args:
+            repo: Repository to check.
+            config: Configuration to check it with.
+            offline: Whether the checks that need the platform are skipped. Such results are kept apart, as
+                they are not what checking online finds.
+
+        Returns: The key, or None if the commit SHA could not be determined.
+        """
+        if repo.sha is None:
+            return None
+        parts = [repo.platform.name, repo.owner, repo.repo, repo.path, repo.sha, config.digest, __version__]
+        if offline:
+            parts.append("offline")
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def clear(self):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM results")
+
+    def get(self, key):
+        """Stored result for key.
+
+        Returns: A :py:class:`CachedResult`, or None if nothing is stored for key, or only a result older than
+            max_age.
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT compliance FROM results WHERE key = ? AND stored_at >= ?",
+                                           (key, time.time() - self.max_age)).fetchone()
+        if row is None:
+            return None
+        stored = json.loads(row[0])
+        if isinstance(stored, list):
+            # stored by an earlier version, without the README
+            return CachedResult(_load_compliance(stored))
+        readme = stored["readme"]
+        if readme is not None:
+            readme = CachedReadme(filename=readme["filename"],
+                                  fmt=None if readme["fmt"] is None else ReadmeFormat[readme["fmt"]],
+                                  compliance=None if readme["badge"] is None else _load_compliance(readme["badge"]))
+        return CachedResult(_load_compliance(stored["compliance"]), readme, stored.get("default_branch"))
+
+    def put(self, key, compliance, readme=None, default_branch=None):
+        """Store the result of checking a commit.
+
+        Args:
+            key: Key from :py:func:`key`.
+            compliance: Compliance that was found.
+            readme: :py:class:`Readme` that was found, if it should be stored as well.
+            default_branch: Default branch of the repository, if it should be stored as well.
+
+        """
+        stored = dict(compliance=_dump_compliance(compliance), readme=None, default_branch=default_branch)
+        if readme is not None:
+            badge = None if readme.text is None else readme.get_compliance()
+            stored["readme"] = dict(filename=readme.filename,
+                                    fmt=None if readme.fmt is None else readme.fmt.name,
+                                    badge=None if badge is None else _dump_compliance(badge))
+        with self._lock, self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                                     (key, json.dumps(stored), time.time()))
+
+
+def _dump_compliance(compliance):
+    return [compliance.repository, compliance.license, compliance.registry, compliance.citation, compliance.checklist]
+
+
+def _load_compliance(state):
+    repository, license_, registry, citation, checklist = state
+    return Compliance(repository=repository, license_=license_, registry=registry, citation=citation,
+                      checklist=checklist)
@@ -0,0 +1,259 @@
+import functools
+import random
+import threading
+import time
+from contextlib import contextmanager
+import requests
+from requests.adapters import HTTPAdapter
+from howfairis.__version__ import __version__
+from howfairis.profiling import record
+from howfairis.ratelimit import RateLimiter
+from howfairis.ratelimit import RateLimitExceeded
+
+
+_local = threading.local()
+
+
+class DeadlineExceeded(requests.Timeout):
+    """Raised instead of sending a request, or sending it again, when the deadline of its thread has passed"""
+
+
+@contextmanager
+def within_deadline(deadline_at):
+    """Make the requests that the current thread sends through a :py:class:`Session` in the block fail with
+    :py:class:`DeadlineExceeded` from deadline_at on, a :py:func:`time.monotonic` time. Does nothing if
+    deadline_at is None. When blocks are nested, the earliest deadline holds."""
+    previous = getattr(_local, "deadline_at", None)
+    if deadline_at is not None and previous is not None:
+        deadline_at = min(deadline_at, previous)
+    _local.deadline_at = previous if deadline_at is None else deadline_at
+    try:
+        yield
+    finally:
+        _local.deadline_at = previous
+
+
+def get_deadline():
+    """The deadline of the current thread as a :py:func:`time.monotonic` time, or None if it has none."""
+    return getattr(_local, "deadline_at", None)
+
+
+def _get_remaining_seconds(url):
+    deadline_at = get_deadline()
+    if deadline_at is None:
+        return None
+    remaining = deadline_at - time.monotonic()
+    if remaining <= 0:
+        raise DeadlineExceeded("Deadline passed before the request for {0} was sent.".format(url))
+    return remaining
+
+
+def _cap_timeout(timeout, remaining):
+    if remaining is None:
+        return timeout
+    if isinstance(timeout, tuple):
+        return tuple(remaining if t is None else min(t, remaining) for t in timeout)
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+class _StoringStream:
+    """Raw body of a streamed response, which hands the body to store once it has been read to the end"""
+
+    def __init__(self, raw, store):
+        self._raw = raw
+        self._store = store
+
+    def stream(self, amt=2 ** 16, decode_content=None):
+        chunks = []
+        for chunk in self._raw.stream(amt, decode_content=decode_content):
+            chunks.append(chunk)
+            yield chunk
+        self._store(b"".join(chunks))
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+class Session(requests.Session):
+    """HTTP session for all requests made by :py:class:`Repo`, :py:class:`Config` and :py:class:`Checker`
+
+    Connections are kept alive and reused, so checking many repositories on the same few hosts does not pay
+    for setting up TCP and TLS again for every request.
+
+    A request that is sent in a :py:func:`within_deadline` block gets no more time than is left until the
+    deadline, however long its timeout, and is not waited for nor sent again past it.
+
+    Args:
+        pool_connections: Number of hosts to keep a pool of connections for.
+        pool_maxsize: Maximum number of connections to keep alive per host. Should be at least the number of
+            threads that use the session at the same time.
+        headers: Headers to send with every request, in addition to the default User-Agent.
+        cache: :py:class:`HttpCache` for GET and HEAD requests, also streamed ones. Defaults to no caching.
+        rate_limiter: :py:class:`RateLimiter` that schedules the requests that go over the network. Pass the
+            same one to sessions that share a quota. Defaults to a new one.
+        connect_timeout: Seconds to wait for a connection to be made, for requests that do not set a timeout.
+        read_timeout: Seconds to wait between two bytes of a response, for requests that do not set a timeout.
+        retries: How often to send a GET or HEAD request again after it failed because of the connection or a
+            server error. The wait before each new attempt grows exponentially, and is randomized so that
+            concurrent requests do not retry in lockstep.
+        backoff: Seconds to wait at most before the first new attempt.
+        base_urls: Dictionary of base URL to the base URL to send its requests to instead, for example
+            {"https://api.github.com": "http://localhost:8000/api.github.com"}, to point howfairis at a mirror
+            or at a fake server. URLs that start with none of the base URLs are left alone.
+
+    """
+
+    # how often to send a request that was throttled, before giving up
+    max_throttled_attempts = 5
+
+    # server errors that may well be gone a moment later
+    retry_status_codes = [500, 502, 503, 504]
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, headers=None, cache=None, rate_limiter=None,
+                 connect_timeout=5, read_timeout=30, retries=2, backoff=0.5, base_urls=None):
+        super().__init__()
+        self.cache = cache
+        self.rate_limiter = RateLimiter() if rate_limiter is None else rate_limiter
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.base_urls = dict() if base_urls is None else \
+            {base_url.rstrip("/"): replacement.rstrip("/") for base_url, replacement in base_urls.items()}
+        # the longest base URL that matches wins
+        self._base_urls_by_length = sorted(self.base_urls, key=len, reverse=True)
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+        self.headers.update({"User-Agent": "howfairis/{0}".format(__version__)})
+        if headers is not None:
+            self.headers.update(headers)
+
+    def rebase(self, url):
+        """URL to send a request for url to, according to base_urls."""
+        for base_url in self._base_urls_by_length:
+            if url.startswith(base_url) and url[len(base_url):len(base_url) + 1] in ["", "/", "?", "#"]:
+                return self.base_urls[base_url] + url[len(base_url):]
+        return url
+
+    def send(self, request, **kwargs):
+        # pylint: disable=arguments-differ
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        if self.cache is None or request.method not in ["GET", "HEAD"]:
+            return self._send_over_network(request, **kwargs)
+
+        key = self.cache.key(request)
+        cached = self.cache.get(key)
+        if cached is not None and request.method == "GET" and not cached.has_body:
+            # only the status and headers are known, from a HEAD request or a body that was not read to the end
+            cached = None
+        if cached is not None and self.cache.is_fresh(cached):
+            record(cache_hits=1)
+            return cached.to_response(request)
+
+        if cached is not None and cached.etag is not None:
+            request.headers["If-None-Match"] = cached.etag
+        if cached is not None and cached.last_modified is not None:
+            request.headers["If-Modified-Since"] = cached.last_modified
+
+        response = self._send_over_network(request, **kwargs)
+
+        if response.status_code == 304 and cached is not None:
+            record(cache_hits=1)
+            return self.cache.revalidated(key, cached, response).to_response(request)
+        if request.method == "HEAD":
+            self.cache.put(key, response)
+        elif kwargs.get("stream") is True:
+            # the body is read later, if at all, so store it once it has been read to the end
+            self.cache.put(key, response)
+            if response.status_code == 200:
+                response.raw = _StoringStream(response.raw, functools.partial(self.cache.put, key, response))
+        else:
+            self.cache.put(key, response, response.content)
+        return response
+
+    def _send_over_network(self, request, **kwargs):
+        n_throttled = 0
+        n_failed = 0
+        may_retry = request.method in ["GET", "HEAD"]
+        # the rate limits are those of the host that the request is for, wherever it is sent to
+        rebased = self._rebase_request(request)
+        timeout = kwargs.pop("timeout", None)
+        while True:
+            self._wait_for_rate_limit(request)
+            # every attempt gets no more time than is left until the deadline of the thread, if any
+            remaining = _get_remaining_seconds(request.url)
+            record(requests=1, retries=0 if n_throttled + n_failed == 0 else 1)
+            try:
+                response = super().send(rebased, timeout=_cap_timeout(timeout, remaining), **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if not may_retry or n_failed >= self.retries or not self._back_off(n_failed + 1):
+                    raise
+                n_failed += 1
+                continue
+
+            if self.rate_limiter.update(response, request.url):
+                n_throttled += 1
+                if n_throttled >= self.max_throttled_attempts:
+                    raise RateLimitExceeded("Request for {0} was throttled {1} times in a row."
+                                            .format(request.url, n_throttled))
+                response.close()
+                continue
+
+            if response.status_code in self.retry_status_codes and may_retry and n_failed < self.retries and \
+                    self._back_off(n_failed + 1, response):
+                n_failed += 1
+                continue
+
+            if kwargs.get("stream") is not True:
+                # a streamed body is read later, if at all, and counted by whoever reads it
+                record(bytes_=len(response.content))
+            return response
+
+    def _rebase_request(self, request):
+        url = self.rebase(request.url)
+        if url == request.url:
+            return request
+        rebased = request.copy()
+        rebased.url = url
+        return rebased
+
+    def _wait_for_rate_limit(self, request):
+        remaining = _get_remaining_seconds(request.url)
+        if remaining is None or remaining >= self.rate_limiter.max_wait:
+            self.rate_limiter.wait(request)
+            return
+        try:
+            self.rate_limiter.wait(request, remaining)
+        except RateLimitExceeded as e:
+            raise DeadlineExceeded("Deadline passes before the request for {0} may be sent: {1}"
+                                   .format(request.url, e)) from e
+
+    def _back_off(self, n_failed, response=None):
+        # full jitter: anywhere between no wait and the exponentially growing maximum
+        seconds = random.uniform(0, self.backoff * 2 ** (n_failed - 1))
+        deadline_at = get_deadline()
+        if deadline_at is not None and time.monotonic() + seconds >= deadline_at:
+            # no time left to try again, so the failure stands
+            return False
+        if response is not None:
+            response.close()
+        time.sleep(seconds)
+        return True
+
+
+_default_session = None
+_default_session_lock = threading.Lock()
+
+
+def get_default_session():
+    """Session that is used when no session is passed explicitly. It is created on first use and then
+    shared by everything in the process.
+
+    Returns: A :py:class:`Session`
+    """
+    global _default_session  # pylint: disable=global-statement
+    with _default_session_lock:
+        if _default_session is None:
+            _default_session = Session()
+        return _default_session
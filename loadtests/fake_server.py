@@ -0,0 +1,506 @@
+"""Local HTTP server that stands in for GitHub and GitLab, for load and concurrency testing without a network
+
+The server answers for api.github.com, raw.githubusercontent.com, github.com and gitlab.com at once, each under a
+path of its own, e.g. http://127.0.0.1:8000/api.github.com/repos/synthetic/repo-00001. A
+:py:class:`howfairis.Session` is pointed at it with the base URLs in :py:attr:`FakeServer.base_urls`, or the
+command line with the --base-url options that running this module prints:
+
+    python -m loadtests.fake_server --repositories 5000 --latency 0.05 --rate-limit 5000
+"""
+import hashlib
+import http.server
+import json
+import random
+import re
+import socketserver
+import threading
+import time
+from collections import Counter
+from urllib.parse import parse_qs
+from urllib.parse import unquote
+from urllib.parse import urlsplit
+import click
+from howfairis.compliance import Compliance
+from howfairis.readme_format import ReadmeFormat
+
+
+hosts = ["api.github.com", "raw.githubusercontent.com", "github.com", "gitlab.com"]
+
+
+class SyntheticRepository:
+    """Repository that exists on both fake platforms. What it has is drawn at random, but the same for the same
+    index every time
+
+    Args:
+        owner: Name of the organisation and group that the repository belongs to.
+        index: Number of the repository, which is part of its name.
+
+    """
+
+    default_branch = "main"
+
+    def __init__(self, owner, index):
+        rng = random.Random(index)
+        self.owner = owner
+        self.name = "repo-{0:05d}".format(index)
+        self.sha = hashlib.sha1(self.name.encode("utf-8")).hexdigest()
+        self.has_license = rng.random() < 0.7
+        self.has_pypi_badge = rng.random() < 0.4
+        self.has_zenodo_badge = rng.random() < 0.3
+        self.has_citation_file = rng.random() < 0.3
+        self.has_checklist_badge = rng.random() < 0.1
+        self.has_fair_software_badge = rng.random() < 0.5
+        # paragraphs of text around the badges, as real READMEs are not just badges
+        self.n_paragraphs = rng.randint(5, 200)
+
+    @property
+    def compliance(self):
+        """The compliance that checking the repository should find."""
+        return Compliance(repository=True, license_=self.has_license, registry=self.has_pypi_badge,
+                          citation=self.has_zenodo_badge or self.has_citation_file,
+                          checklist=self.has_checklist_badge)
+
+    @property
+    def files(self):
+        """Text of the files in the root of the repository, by file name."""
+        files = {"README.md": self._make_readme(), "setup.py": "from setuptools import setup\n\nsetup()\n"}
+        if self.has_license:
+            files["LICENSE"] = "Apache License\nVersion 2.0, January 2004\n"
+        if self.has_citation_file:
+            files["CITATION.cff"] = "cff-version: 1.2.0\ntitle: {0}\n".format(self.name)
+        return files
+
+    def _make_readme(self):
+        lines = ["# " + self.name, ""]
+        if self.has_pypi_badge:
+            lines.append("[![PyPI](https://img.shields.io/pypi/v/{0}.svg)](https://pypi.org/project/{0}/)"
+                         .format(self.name))
+        if self.has_zenodo_badge:
+            lines.append("[![DOI](https://zenodo.org/badge/DOI/10.5281/zenodo.4014731.svg)]" +
+                         "(https://doi.org/10.5281/zenodo.4014731)")
+        if self.has_checklist_badge:
+            lines.append("[![CII](https://bestpractices.coreinfrastructure.org/projects/4630/badge)]" +
+                         "(https://bestpractices.coreinfrastructure.org/projects/4630)")
+        if self.has_fair_software_badge:
+            lines.append(self.compliance.calc_badge(ReadmeFormat.MARKDOWN))
+        lines.append("")
+        lines.extend(["Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor."] *
+                     self.n_paragraphs)
+        return "\n".join(lines) + "\n"
+
+
+class _RateLimitWindow:
+    # a fixed window of rate_limit requests per window seconds, like the API quotas of GitHub and GitLab
+
+    def __init__(self, rate_limit, window):
+        self.rate_limit = rate_limit
+        self.window = window
+        self.remaining = rate_limit
+        self.reset = time.time() + window
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Count a request against the quota.
+
+        Returns: Whether the request is allowed, the remaining quota, and when the quota resets, in seconds
+            since the epoch.
+        """
+        with self._lock:
+            now = time.time()
+            if now >= self.reset:
+                self.remaining = self.rate_limit
+                self.reset = now + self.window
+            if self.remaining <= 0:
+                return False, 0, self.reset
+            self.remaining -= 1
+            return True, self.remaining, self.reset
+
+
+class FakeServer:
+    """Fake GitHub and GitLab with n_repositories synthetic repositories in one organisation and group
+
+    Only the requests that howfairis makes are answered, everything else is a 404. The API of GitHub and the
+    API of GitLab have a rate limit each, and report it in the headers that GitHub and GitLab use.
+
+    Args:
+        host: Address to listen on.
+        port: Port to listen on. Defaults to a free port.
+        n_repositories: Number of synthetic repositories, see :py:class:`SyntheticRepository`.
+        owner: Name of the organisation on GitHub and of the group on GitLab that has the repositories.
+        latency: Seconds to wait before answering a request.
+        jitter: Seconds to wait at most on top of latency, at random.
+        rate_limit: Number of API requests to allow per rate_limit_window seconds, per platform. Defaults
+            to no limit.
+        rate_limit_window: Seconds after which the rate limit resets.
+        error_rate: Fraction of requests to answer with a server error, at random.
+        seed: Seed for the random latencies and errors.
+
+    Attributes:
+        stats (collections.Counter): Number of responses by host and status code.
+
+    """
+
+    error_status_codes = [500, 502, 503]
+
+    def __init__(self, host="127.0.0.1", port=0, n_repositories=1000, owner="synthetic", latency=0.0, jitter=0.0,
+                 rate_limit=None, rate_limit_window=60, error_rate=0.0, seed=0):
+        self.n_repositories = n_repositories
+        self.owner = owner
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limits = dict() if rate_limit is None else {
+            "github": _RateLimitWindow(rate_limit, rate_limit_window),
+            "gitlab": _RateLimitWindow(rate_limit, rate_limit_window)
+        }
+        self.stats = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._httpd = _ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.fake_server = self
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return "http://{0}:{1}".format(host, port)
+
+    @property
+    def base_urls(self):
+        """Base URLs for :py:class:`howfairis.Session` that send all requests to this server."""
+        return {"https://" + host: self.url + "/" + host for host in hosts}
+
+    def get_repository(self, owner, name):
+        """The synthetic repository owner/name, or None if there is no such repository."""
+        matched = re.fullmatch(r"repo-([0-9]{5})", name)
+        if owner != self.owner or matched is None or int(matched.group(1)) >= self.n_repositories:
+            return None
+        return SyntheticRepository(owner, int(matched.group(1)))
+
+    def get_repository_urls(self, platform="github"):
+        """URLs of all synthetic repositories on platform, github or gitlab."""
+        return ["https://{0}.com/{1}/{2}".format(platform, self.owner, SyntheticRepository(self.owner, i).name)
+                for i in range(self.n_repositories)]
+
+    def start(self):
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def serve_forever(self):
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *_):
+        self.stop()
+
+    def _wait(self):
+        # sleeps for the latency, and returns the status code of the error to inject, if any
+        with self._lock:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            is_error = self._random.random() < self.error_rate
+            error_status = self._random.choice(FakeServer.error_status_codes) if is_error else None
+        if delay > 0:
+            time.sleep(delay)
+        return error_status
+
+    def _count(self, host, status):
+        with self._lock:
+            self.stats[(host, status)] += 1
+
+
+class _ThreadingHTTPServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+    # many concurrent clients connect at once
+    request_queue_size = 128
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    # keep connections alive, like GitHub and GitLab do
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._handle(send_body=True)
+
+    def do_HEAD(self):
+        self._handle(send_body=False)
+
+    def do_POST(self):
+        # such as GraphQL queries, which are not simulated
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._handle(send_body=True)
+
+    def log_message(self, *_):
+        pass
+
+    def _handle(self, send_body):
+        server = self.server.fake_server
+        split = urlsplit(self.path)
+        host, _, path = split.path.lstrip("/").partition("/")
+        query = {key: values[-1] for key, values in parse_qs(split.query).items()}
+
+        error_status = server._wait()  # pylint: disable=protected-access
+        throttled, rate_limit_headers = _check_rate_limit(server, host, path)
+        if throttled is not None:
+            status, body, headers = throttled
+        elif error_status is not None:
+            status, body, headers = error_status, "", dict()
+        else:
+            status, body, headers = _route(server, host, path, query, self.headers)
+
+        body = body.encode("utf-8")
+        self.send_response(status)
+        for name, value in dict(rate_limit_headers, **headers).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+        server._count(host, status)  # pylint: disable=protected-access
+
+
+def _check_rate_limit(server, host, path):
+    # raw files and web pages are not rate limited, the APIs are
+    if host == "api.github.com":
+        window, prefix = server.rate_limits.get("github"), "X-RateLimit-"
+    elif host == "gitlab.com" and path.startswith("api/"):
+        window, prefix = server.rate_limits.get("gitlab"), "RateLimit-"
+    else:
+        return None, dict()
+    if window is None:
+        return None, dict()
+
+    allowed, remaining, reset = window.acquire()
+    headers = {prefix + "Limit": str(window.rate_limit), prefix + "Remaining": str(remaining),
+               prefix + "Reset": str(int(reset) + 1)}
+    if allowed:
+        return None, headers
+    if host == "api.github.com":
+        # GitHub forbids, with nothing but the rate limit headers to tell why
+        return (403, _json(dict(message="API rate limit exceeded")), dict()), headers
+    retry_after = str(max(int(reset - time.time()) + 1, 1))
+    return (429, _json(dict(message="Retry later")), {"Retry-After": retry_after}), headers
+
+
+def _json(obj):
+    return json.dumps(obj)
+
+
+def _not_found():
+    return 404, _json(dict(message="Not Found")), {"Content-Type": "application/json"}
+
+
+def _ok(body, content_type="application/json", headers=None):
+    return 200, body, dict({"Content-Type": content_type}, **(headers or dict()))
+
+
+class _Request:
+    # what the handlers of the routes need to know about a request
+    def __init__(self, server, query, headers):
+        self.server = server
+        self.query = query
+        self.headers = headers
+
+
+def _with_repository(handler):
+    # the first two parts of the path name a repository, which the handler gets instead
+    def wrapper(request, owner, name, *args):
+        repository = request.server.get_repository(owner, name)
+        if repository is None:
+            return _not_found()
+        return handler(request, repository, *args)
+    return wrapper
+
+
+def _is_ref(repository, ref):
+    return ref in [repository.default_branch, repository.sha, "HEAD"]
+
+
+def _github_list_repositories(request, owner):
+    if owner != request.server.owner:
+        return _not_found()
+    return _list_repositories(request.server, request.query, "github")
+
+
+@_with_repository
+def _github_repository(_, repository):
+    return _ok(_json(dict(full_name=repository.owner + "/" + repository.name, private=False,
+                          default_branch=repository.default_branch,
+                          html_url="https://github.com/{0}/{1}".format(repository.owner, repository.name))))
+
+
+@_with_repository
+def _github_license(_, repository):
+    if not repository.has_license:
+        return _not_found()
+    return _ok(_json(dict(license=dict(key="apache-2.0", name="Apache License 2.0"))))
+
+
+@_with_repository
+def _github_contents(request, repository):
+    if not _is_ref(repository, request.query.get("ref", repository.default_branch)):
+        return _not_found()
+    return _ok(_json([dict(name=filename, type="file") for filename in sorted(repository.files)]))
+
+
+@_with_repository
+def _github_commit(request, repository, ref):
+    if not _is_ref(repository, ref):
+        return _not_found()
+    if request.headers.get("Accept") == "application/vnd.github.sha":
+        return _ok(repository.sha, "application/vnd.github.sha")
+    return _ok(_json(dict(sha=repository.sha)))
+
+
+def _gitlab_list_repositories(request, group):
+    if group != request.server.owner:
+        return _not_found()
+    return _list_repositories(request.server, request.query, "gitlab")
+
+
+@_with_repository
+def _gitlab_project(request, repository):
+    path_with_namespace = repository.owner + "/" + repository.name
+    project = dict(path_with_namespace=path_with_namespace, default_branch=repository.default_branch,
+                   web_url="https://gitlab.com/" + path_with_namespace)
+    if request.query.get("license") == "true":
+        project["license"] = dict(key="apache-2.0", name="Apache License 2.0") if repository.has_license else None
+    return _ok(_json(project))
+
+
+@_with_repository
+def _gitlab_tree(request, repository):
+    if not _is_ref(repository, request.query.get("ref", repository.default_branch)) or \
+            request.query.get("path", "") != "":
+        return _not_found()
+    return _ok(_json([dict(name=filename, type="blob") for filename in sorted(repository.files)]),
+               headers={"X-Next-Page": ""})
+
+
+@_with_repository
+def _gitlab_commit(_, repository, ref):
+    if not _is_ref(repository, ref):
+        return _not_found()
+    return _ok(_json(dict(id=repository.sha)))
+
+
+@_with_repository
+def _get_file(_, repository, ref, filename):
+    text = repository.files.get(filename)
+    if not _is_ref(repository, ref) or text is None:
+        return _not_found()
+    return _ok(text, "text/plain; charset=utf-8")
+
+
+@_with_repository
+def _github_page(_, repository):
+    return _ok(_make_page(repository, ""), "text/html; charset=utf-8")
+
+
+@_with_repository
+def _gitlab_page(_, repository):
+    license_button = "Apache License 2.0" if repository.has_license else "No license. All rights reserved"
+    buttons = "<div class=\"project-buttons\"><a>{0}</a></div>".format(license_button)
+    return _ok(_make_page(repository, buttons), "text/html; charset=utf-8")
+
+
+def _make_page(repository, buttons):
+    return "<html><head><title>{0}</title></head><body><h1>{0}</h1>{1}</body></html>".format(repository.name,
+                                                                                             buttons)
+
+
+# host, pattern of the path and handler of each route. The groups of the pattern are passed to the handler.
+_segment = r"([^/]+)"
+_project = r"api/v4/projects/([^/]+)%2F([^/]+)"
+_routes = [
+    ("api.github.com", r"orgs/{0}/repos", _github_list_repositories),
+    ("api.github.com", r"repos/{0}/{0}", _github_repository),
+    ("api.github.com", r"repos/{0}/{0}/license", _github_license),
+    ("api.github.com", r"repos/{0}/{0}/contents", _github_contents),
+    ("api.github.com", r"repos/{0}/{0}/commits/{0}", _github_commit),
+    ("raw.githubusercontent.com", r"{0}/{0}/{0}/{0}", _get_file),
+    ("github.com", r"{0}/{0}", _github_page),
+    ("gitlab.com", r"api/v4/groups/{0}/projects", _gitlab_list_repositories),
+    ("gitlab.com", _project, _gitlab_project),
+    ("gitlab.com", _project + r"/repository/tree", _gitlab_tree),
+    ("gitlab.com", _project + r"/repository/commits/{0}", _gitlab_commit),
+    ("gitlab.com", r"{0}/{0}/-/raw/{0}/{0}", _get_file),
+    ("gitlab.com", r"{0}/{0}", _gitlab_page)
+]
+_compiled_routes = [(host, re.compile(pattern.format(_segment), re.IGNORECASE), handler)
+                    for host, pattern, handler in _routes]
+
+
+def _route(server, host, path, query, request_headers):
+    for route_host, pattern, handler in _compiled_routes:
+        matched = pattern.fullmatch(path) if route_host == host else None
+        if matched is not None:
+            groups = [unquote(group) for group in matched.groups()]
+            return handler(_Request(server, query, request_headers), *groups)
+    return _not_found()
+
+
+def _list_repositories(server, query, platform):
+    per_page = int(query.get("per_page", 30))
+    page = int(query.get("page", 1))
+    n_pages = max((server.n_repositories + per_page - 1) // per_page, 1)
+    urls = server.get_repository_urls(platform)[(page - 1) * per_page:page * per_page]
+    if platform == "github":
+        items = [dict(full_name=url.split("/", 3)[3], html_url=url, private=False) for url in urls]
+        links = ["<{0}>; rel=\"{1}\"".format(_page_url(server, platform, query, n), rel)
+                 for n, rel in [(page + 1, "next"), (n_pages, "last")] if page < n_pages]
+        return _ok(_json(items), headers={"Link": ", ".join(links)} if len(links) > 0 else None)
+    items = [dict(path_with_namespace=url.split("/", 3)[3], web_url=url) for url in urls]
+    headers = {"X-Total-Pages": str(n_pages), "X-Next-Page": str(page + 1) if page < n_pages else ""}
+    return _ok(_json(items), headers=headers)
+
+
+def _page_url(server, platform, query, page):
+    path = "/api.github.com/orgs/{0}/repos" if platform == "github" else "/gitlab.com/api/v4/groups/{0}/projects"
+    params = "&".join("{0}={1}".format(key, value) for key, value in dict(query, page=page).items())
+    return server.url + path.format(server.owner) + "?" + params
+
+
+@click.command(context_settings=dict(help_option_names=["-h", "--help"]))
+@click.option("--host", default="127.0.0.1", show_default=True, help="Address to listen on.")
+@click.option("--port", default=8000, type=click.IntRange(min=0), show_default=True, help="Port to listen on.")
+@click.option("--repositories", "n_repositories", default=1000, type=click.IntRange(min=0), show_default=True,
+              help="Number of synthetic repositories.")
+@click.option("--owner", default="synthetic", show_default=True,
+              help="Name of the organisation and group that has the repositories.")
+@click.option("--latency", default=0.0, type=click.FloatRange(min=0), show_default=True,
+              help="Seconds to wait before answering a request.")
+@click.option("--jitter", default=0.0, type=click.FloatRange(min=0), show_default=True,
+              help="Seconds to wait at most on top of --latency, at random.")
+@click.option("--rate-limit", default=None, type=click.IntRange(min=0),
+              help="Number of API requests to allow per --rate-limit-window, per platform. Defaults to no limit.")
+@click.option("--rate-limit-window", default=60, type=click.FloatRange(min=0), show_default=True,
+              help="Seconds after which the rate limit resets.")
+@click.option("--error-rate", default=0.0, type=click.FloatRange(min=0, max=1), show_default=True,
+              help="Fraction of requests to answer with a server error.")
+def main(**kwargs):
+    """Serve a fake GitHub and GitLab until interrupted."""
+    server = FakeServer(**kwargs)
+    print("Serving {0} repositories at {1}. Point howfairis at it with:\n".format(server.n_repositories, server.url))
+    print("howfairis " + " ".join("--base-url {0}={1}".format(*item) for item in server.base_urls.items()) +
+          " https://github.com/{0}".format(server.owner))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,84 @@
+"""Load test of checking many repositories at once, against a :py:class:`FakeServer` in the same process
+
+    python -m loadtests.run --repositories 2000 --jobs 32 --latency 0.05 --error-rate 0.01 --rate-limit 2000
+
+Every repository of the fake organisation is checked, and the compliance that was found is compared with the
+compliance that the repository was made to have, so that mistakes caused by concurrency show up as well.
+"""
+import sys
+import time
+import click
+from howfairis.batch import check_repositories
+from howfairis.http_cache import HttpCache
+from howfairis.organisation import Organisation
+from howfairis.reporters import NullReporter
+from howfairis.session import Session
+from loadtests.fake_server import FakeServer
+
+
+@click.command(context_settings=dict(help_option_names=["-h", "--help"]))
+@click.option("--platform", default="github", type=click.Choice(["github", "gitlab"]), show_default=True,
+              help="Which fake platform to check the repositories on.")
+@click.option("--repositories", "n_repositories", default=1000, type=click.IntRange(min=0), show_default=True,
+              help="Number of synthetic repositories to check.")
+@click.option("-j", "--jobs", default=8, type=click.IntRange(min=1), show_default=True,
+              help="Number of repositories to check at the same time.")
+@click.option("--parallel", default=False, is_flag=True,
+              help="Make the network requests of independent checks at the same time.")
+@click.option("--cache-dir", default=None, type=click.Path(file_okay=False),
+              help="Directory for the HTTP cache. Run twice with the same directory to load test the cache.")
+@click.option("--latency", default=0.0, type=click.FloatRange(min=0), show_default=True,
+              help="Seconds that the fake server waits before answering a request.")
+@click.option("--jitter", default=0.0, type=click.FloatRange(min=0), show_default=True,
+              help="Seconds that the fake server waits at most on top of --latency, at random.")
+@click.option("--rate-limit", default=None, type=click.IntRange(min=0),
+              help="Number of API requests that the fake server allows per --rate-limit-window. Defaults to " +
+                   "no limit.")
+@click.option("--rate-limit-window", default=60, type=click.FloatRange(min=0), show_default=True,
+              help="Seconds after which the rate limit of the fake server resets.")
+@click.option("--error-rate", default=0.0, type=click.FloatRange(min=0, max=1), show_default=True,
+              help="Fraction of requests that the fake server answers with a server error.")
+def main(platform, n_repositories, jobs, parallel, cache_dir, latency, jitter, rate_limit, rate_limit_window,
+         error_rate):
+    # pylint: disable=too-many-arguments,too-many-locals
+    """Check all repositories of a fake GitHub or GitLab organisation, and report how long it took and what
+    went wrong."""
+    n_checked = 0
+    n_failed = 0
+    wrong = []
+    with FakeServer(n_repositories=n_repositories, latency=latency, jitter=jitter, rate_limit=rate_limit,
+                    rate_limit_window=rate_limit_window, error_rate=error_rate) as server:
+        session = Session(pool_maxsize=jobs, cache=None if cache_dir is None else HttpCache(cache_dir),
+                          base_urls=server.base_urls)
+        urls = Organisation("https://{0}.com/{1}".format(platform, server.owner), session).get_repository_urls()
+        start = time.perf_counter()
+        for result in check_repositories(urls, max_workers=jobs, session=session, parallel=parallel,
+                                         reporter=NullReporter()):
+            n_checked += 1
+            if not result.ok:
+                n_failed += 1
+                continue
+            expected = server.get_repository(server.owner, result.url.rsplit("/", 1)[1]).compliance
+            if result.compliance != expected:
+                wrong.append(result.url)
+        seconds = time.perf_counter() - start
+        stats = dict(server.stats)
+
+    print("Checked {0} repositories in {1:.1f} seconds, {2:.1f} per second.".format(n_checked, seconds,
+                                                                                    n_checked / seconds))
+    print("Could not check {0} repositories.".format(n_failed))
+    print("Found the wrong compliance for {0} repositories.".format(len(wrong)))
+    for url in wrong:
+        print("  " + url)
+    n_requests = sum(stats.values())
+    print("\nThe fake server answered {0} requests, {1:.1f} per repository:"
+          .format(n_requests, n_requests / max(n_checked, 1)))
+    for (host, status), count in sorted(stats.items()):
+        print("  {0:<28} {1} {2:>8}".format(host, status, count))
+
+    if len(wrong) > 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -47,7 +47,12 @@ setup(
     tests_require=[
     ],
     extras_require={
+        "async": [
+            "aiohttp>=3",
+        ],
         "dev": [
+            "aiohttp>=3",
+            "aioresponses",
             "prospector[with_pyroma]",
             "yapf",
             "bumpversion",
@@ -61,6 +66,9 @@ setup(
             "recommonmark",
             "sphinx-click",
         ],
+        "lxml": [
+            "lxml",
+        ],
         "publishing": [
             "twine",
             "wheel",
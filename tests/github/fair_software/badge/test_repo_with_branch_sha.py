@@ -8,7 +8,7 @@ from .mocker import mocker
 @pytest.fixture
 def mocked_repo(mocker):
     with mocker:
-        return Repo("https://github.com/fair-software/badge", branch="b3f90ec9c2b1be604f482c2d9e46a9aeca3ee45a")
+        yield Repo("https://github.com/fair-software/badge", branch="b3f90ec9c2b1be604f482c2d9e46a9aeca3ee45a")
 
 
 class TestRepoWithBranchSHA(Contract):
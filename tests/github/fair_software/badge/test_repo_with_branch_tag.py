@@ -8,7 +8,7 @@ from .mocker import mocker
 @pytest.fixture
 def mocked_repo(mocker):
     with mocker:
-        return Repo("https://github.com/fair-software/badge", branch="0.1.0")
+        yield Repo("https://github.com/fair-software/badge", branch="0.1.0")
 
 
 class TestRepoWithBranchTag(Contract):
@@ -8,7 +8,7 @@ from .mocker import mocker
 @pytest.fixture
 def mocked_repo(mocker):
     with mocker:
-        return Repo("https://github.com/fair-software/badge", config_file=".howfairis-custom-config.yml")
+        yield Repo("https://github.com/fair-software/badge", config_file=".howfairis-custom-config.yml")
 
 
 class TestRepoWithConfig(Contract):
@@ -0,0 +1,18 @@
+import re
+import pytest
+import requests_mock
+
+
+@pytest.fixture
+def mocker():
+    """This mock aims to reflect a repository that does not exist, for which every request
+    fails with 404 Not Found"""
+    with requests_mock.Mocker() as m:
+        m.register_uri(requests_mock.ANY, re.compile("^https://github.com/fair-software/does-not-exist"),
+                       status_code=404)
+        m.register_uri(requests_mock.ANY, re.compile("^https://api.github.com/repos/fair-software/does-not-exist"),
+                       status_code=404)
+        m.register_uri(requests_mock.ANY,
+                       re.compile("^https://raw.githubusercontent.com/fair-software/does-not-exist/main/"),
+                       status_code=404)
+        return m
@@ -0,0 +1,42 @@
+from howfairis import Checker
+from howfairis import Config
+from howfairis import Repo
+from howfairis.mixins.license_mixin import LicenseMixin
+from .mocker import mocker
+
+
+api = "https://gitlab.com/api/v4/projects/jspaaks%2Fbadge-test"
+
+
+def check_license(mocker):
+    with mocker:
+        repo = Repo("https://gitlab.com/jspaaks/badge-test")
+        checker = Checker(Config(repo), repo)
+        return checker.has_license()
+
+
+def test_license_from_api(mocker):
+    mocker.get(api + "?license=true", json=dict(default_branch="master", license=dict(key="apache-2.0")))
+    assert check_license(mocker) is True
+    assert "https://gitlab.com/jspaaks/badge-test" not in [request.url for request in mocker.request_history]
+
+
+def test_no_license_from_api(mocker):
+    mocker.get(api + "?license=true", json=dict(default_branch="master", license=None))
+    assert check_license(mocker) is False
+
+
+def test_license_from_html(mocker):
+    mocker.get(api + "?license=true", json=dict(default_branch="master"))
+    mocker.get("https://gitlab.com/jspaaks/badge-test",
+               text="<html><body><div class=\"project-buttons\"><a>Apache License 2.0</a></div></body></html>")
+    assert check_license(mocker) is True
+    assert mocker.last_request.url == "https://gitlab.com/jspaaks/badge-test"
+
+
+def test_html_without_license():
+    html = "<div class=\"home-panel\"><div class=\"project-buttons\"><span>No license. All rights reserved" + \
+           "</span></div></div>"
+    assert LicenseMixin._gitlab_html_has_license(html) is False
+    assert LicenseMixin._gitlab_html_has_license("<div class=\"other\"></div>") is False
+    assert LicenseMixin._gitlab_html_has_license(None) is False
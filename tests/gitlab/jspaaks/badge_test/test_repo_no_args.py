@@ -8,7 +8,7 @@ from .mocker import mocker
 @pytest.fixture
 def mocked_repo(mocker):
     with mocker:
-        return Repo("https://gitlab.com/jspaaks/badge-test")
+        yield Repo("https://gitlab.com/jspaaks/badge-test")
 
 
 class TestRepoNoArgs(Contract):
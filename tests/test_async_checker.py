@@ -0,0 +1,195 @@
+import asyncio
+import pytest
+from aioresponses import aioresponses
+from howfairis import Compliance
+from howfairis.async_checker import AsyncChecker
+from howfairis.async_checker import check_repositories_async
+from howfairis.async_config import AsyncConfig
+from howfairis.async_repo import AsyncRepo
+from howfairis.async_repo import new_client
+from howfairis.readme import readme_filenames
+
+
+readme = "[![PyPI](https://img.shields.io/pypi/v/badge.svg)](https://pypi.org/project/badge/)\n" + \
+         "[![DOI](https://zenodo.org/badge/DOI/10.5281/zenodo.1234.svg)](https://doi.org/10.5281/zenodo.1234)\n"
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def mock_badge(m, contents=None):
+    m.get("https://api.github.com/repos/fair-software/badge", payload=dict(default_branch="master"), repeat=True)
+    if contents is None:
+        m.get("https://api.github.com/repos/fair-software/badge/contents?ref=master", status=404)
+    else:
+        m.get("https://api.github.com/repos/fair-software/badge/contents?ref=master", payload=contents)
+    m.head("https://api.github.com/repos/fair-software/badge")
+    m.head("https://api.github.com/repos/fair-software/badge/license", status=404)
+    m.get("https://github.com/fair-software/badge", body="<html></html>")
+    m.get("https://raw.githubusercontent.com/fair-software/badge/master/.howfairis.yml", status=404)
+    for readme_filename in readme_filenames:
+        if readme_filename != "README.md":
+            m.get("https://raw.githubusercontent.com/fair-software/badge/master/" + readme_filename, status=404)
+    m.get("https://raw.githubusercontent.com/fair-software/badge/master/README.md", body=readme)
+    m.head("https://raw.githubusercontent.com/fair-software/badge/master/CITATION", status=404)
+    m.head("https://raw.githubusercontent.com/fair-software/badge/master/CITATION.cff")
+    m.head("https://raw.githubusercontent.com/fair-software/badge/master/codemeta.json", status=404)
+    m.head("https://raw.githubusercontent.com/fair-software/badge/master/.zenodo.json", status=404)
+
+
+@pytest.fixture
+def mocked_responses():
+    with aioresponses() as m:
+        mock_badge(m)
+        yield m
+
+
+def test_async_checker(mocked_responses):
+    async def check():
+        async with new_client() as client:
+            repo = await AsyncRepo.create("https://github.com/fair-software/badge", client=client)
+            config = await AsyncConfig.create(repo)
+            checker = await AsyncChecker.create(config, repo)
+            return repo, checker, await checker.check_five_recommendations()
+
+    repo, checker, compliance = run(check())
+    assert repo.default_branch == "master"
+    assert checker.readme.filename == "README.md"
+    assert compliance == Compliance(repository=True, license_=False, registry=True, citation=True, checklist=False)
+    assert compliance.registry is True
+    assert compliance.license is False
+    assert len(checker.sub_checks) == 18
+    assert checker.sub_checks["has_citationcff_file"] is True
+
+
+def test_async_checker_uses_file_listing():
+    contents = [dict(name="README.md", type="file"), dict(name="CITATION.cff", type="file"),
+                dict(name="docs", type="dir")]
+
+    async def check():
+        async with new_client() as client:
+            repo = await AsyncRepo.create("https://github.com/fair-software/badge", client=client)
+            checker = await AsyncChecker.create(await AsyncConfig.create(repo), repo)
+            return checker, await checker.check_five_recommendations()
+
+    with aioresponses() as m:
+        mock_badge(m, contents)
+        checker, compliance = run(check())
+        requested = [(method, str(url)) for method, url in m.requests]
+
+    assert compliance == Compliance(repository=True, license_=False, registry=True, citation=True, checklist=False)
+    assert checker.sub_checks["has_citationcff_file"] is True
+    # the listing answers which files exist, and there is no action.yml for the marketplace
+    assert ("GET", "https://raw.githubusercontent.com/fair-software/badge/master/README.rst") not in requested
+    assert ("GET", "https://github.com/fair-software/badge") not in requested
+    assert all(method != "HEAD" or "/license" in url for method, url in requested)
+
+
+def test_async_checker_timed_out_request_is_unfinished():
+    async def check():
+        async with new_client() as client:
+            repo = AsyncRepo("https://github.com/fair-software/badge", client=client, retries=0)
+            repo.default_branch = "master"
+            checker = await AsyncChecker.create(await AsyncConfig.create(repo), repo)
+            return await checker.check_five_recommendations()
+
+    with aioresponses() as m:
+        m.head("https://api.github.com/repos/fair-software/badge/license", exception=asyncio.TimeoutError())
+        mock_badge(m)
+        compliance = run(check())
+
+    assert compliance.unfinished == ["has_license"]
+    assert compliance.citation is True
+
+
+def test_async_checker_failed_readme_is_unfinished():
+    async def check():
+        async with new_client() as client:
+            repo = AsyncRepo("https://github.com/fair-software/badge", client=client, retries=0)
+            repo.default_branch = "master"
+            checker = await AsyncChecker.create(await AsyncConfig.create(repo), repo)
+            return await checker.check_five_recommendations()
+
+    with aioresponses() as m:
+        m.get("https://raw.githubusercontent.com/fair-software/badge/master/README.md", status=500)
+        mock_badge(m)
+        compliance = run(check())
+
+    # a server error does not mean that the README has no badges
+    assert "has_pypi_badge" in compliance.unfinished
+    assert "has_ascl_badge" in compliance.unfinished
+
+
+def test_async_checker_requests_overlap():
+    in_flight = []
+    most_in_flight = []
+
+    async def slow(url, **kwargs):
+        in_flight.append(url)
+        most_in_flight.append(len(in_flight))
+        await asyncio.sleep(0.05)
+        in_flight.remove(url)
+
+    async def check():
+        async with new_client() as client:
+            repo = AsyncRepo("https://github.com/fair-software/badge", client=client)
+            repo.default_branch = "master"
+            checker = await AsyncChecker.create(await AsyncConfig.create(repo), repo)
+            await checker.check_five_recommendations()
+            return checker
+
+    with aioresponses() as m:
+        for filename in ["CITATION", "CITATION.cff", "codemeta.json", ".zenodo.json"]:
+            m.head("https://raw.githubusercontent.com/fair-software/badge/master/" + filename, status=404,
+                   callback=slow)
+        m.head("https://api.github.com/repos/fair-software/badge/license", status=404, callback=slow)
+        mock_badge(m)
+        checker = run(check())
+
+    # the sub-checks of citation are in flight together with the one of license
+    assert max(most_in_flight) == 5
+    assert checker.sub_checks["has_license"] is False
+    assert checker.sub_checks["has_citationcff_file"] is False
+
+
+def test_async_checker_output_order(mocked_responses, capsys):
+    async def check():
+        async with new_client() as client:
+            repo = await AsyncRepo.create("https://github.com/fair-software/badge", client=client)
+            checker = await AsyncChecker.create(await AsyncConfig.create(repo), repo)
+            await checker.check_citation()
+
+    run(check())
+    lines = capsys.readouterr().out.splitlines()
+    expected = ["(4/5) citation", "has_citation_file", "has_citationcff_file", "has_codemeta_file",
+                "has_zenodo_badge", "has_zenodo_metadata_file"]
+    assert len(lines) == len(expected)
+    assert all(line.endswith(name) for line, name in zip(lines, expected))
+
+
+def test_check_repositories_async_keeps_going(mocked_responses):
+    urls = ["https://github.com/fair-software/badge", "https://example.com/fair-software/badge"]
+    results = run(check_repositories_async(urls))
+    assert [result.url for result in results] == urls
+    assert results[0].ok
+    assert results[0].compliance.citation is True
+    assert isinstance(results[1].error, AssertionError)
+
+
+def test_async_repo_sends_throttled_request_again():
+    url = "https://raw.githubusercontent.com/fair-software/badge/master/README.md"
+
+    async def fetch():
+        async with new_client() as client:
+            repo = AsyncRepo("https://github.com/fair-software/badge", branch="master", client=client)
+            return await repo.fetch_text(url)
+
+    with aioresponses() as m:
+        m.get(url, status=429, headers={"Retry-After": "0"})
+        m.get(url, body=readme)
+        assert run(fetch()) == readme
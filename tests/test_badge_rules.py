@@ -0,0 +1,43 @@
+import os
+import pytest
+from howfairis.badge_rules import BadgeMatcher
+from howfairis.links import index_links
+from howfairis.readme import Readme
+from howfairis.readme_format import ReadmeFormat
+
+
+def test_this_readme():
+    with open(os.path.join(os.path.dirname(__file__), "..", "README.rst"), "rt", encoding="utf-8") as f:
+        text = f.read()
+    readme = Readme(filename="README.rst", text=text, fmt=ReadmeFormat.RESTRUCTUREDTEXT)
+    assert readme.badges == {"has_pypi_badge", "has_zenodo_badge", "has_core_infrastructures_badge"}
+
+
+def test_badges_on_one_line():
+    text = "[![ascl](https://img.shields.io/badge/ascl-1234-blue)](https://ascl.net) " + \
+           "[![conda](https://anaconda.org/conda-forge/x/badges/version.svg)](https://anaconda.org) " + \
+           "[![npm](https://badge.fury.io/js/x.svg)](https://badge.fury.io/js/x) " + \
+           "[![rsd](https://img.shields.io/badge/rsd-x-00a3e3.svg)](https://research-software.nl)"
+    readme = Readme(filename="README.md", text=text, fmt=ReadmeFormat.MARKDOWN)
+    assert readme.badges == {"has_ascl_badge", "has_conda_badge", "has_npm_badge", "has_rsd_badge"}
+
+
+def test_overlapping_patterns():
+    badge_matcher = BadgeMatcher({"a": [r"https://example\.org/.*"], "b": [r"https://example\.org/b"]})
+    assert badge_matcher.match(index_links("![](https://example.org/b)", ReadmeFormat.MARKDOWN)) == {"a", "b"}
+
+
+def test_pattern_without_host():
+    with pytest.raises(ValueError):
+        BadgeMatcher({"a": [r".*\.svg"]})
+
+
+def test_nothing():
+    assert Readme(filename="README.md", text="only [a link](https://example.org)",
+                  fmt=ReadmeFormat.MARKDOWN).badges == set()
+    assert Readme(filename=None, text=None, fmt=None).badges == set()
+
+
+def test_url_in_prose_is_a_badge():
+    readme = Readme(filename="README.md", text="see https://img.shields.io/cran/v/x", fmt=ReadmeFormat.MARKDOWN)
+    assert readme.badges == {"has_cran_badge"}
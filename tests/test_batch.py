@@ -0,0 +1,110 @@
+import json
+import pytest
+import requests
+from click.testing import CliRunner
+from howfairis import Compliance
+from howfairis.batch import check_repositories
+from howfairis.batch import check_repository
+from howfairis.batch import get_pool_maxsize
+from howfairis.cli import cli
+from howfairis.session import Session
+from tests.github.fair_software.does_not_exist.mocker import mocker
+
+
+@pytest.fixture
+def mocked_does_not_exist(mocker):
+    with mocker:
+        yield mocker
+
+
+def test_check_repository(mocked_does_not_exist):
+    result = check_repository('https://github.com/fair-software/does-not-exist')
+    assert result.ok
+    assert result.compliance == Compliance(repository=False, license_=False, registry=False, citation=False,
+                                           checklist=False)
+    assert "(1/5) repository" in result.output
+
+
+def test_check_repository_records_error():
+    result = check_repository('https://example.com/fair-software/does-not-exist')
+    assert not result.ok
+    assert isinstance(result.error, AssertionError)
+    assert result.compliance is None
+
+
+def test_check_repository_deadline_covers_config(mocked_does_not_exist):
+    mocked_does_not_exist.get('https://raw.githubusercontent.com/fair-software/does-not-exist/main/.howfairis.yml',
+                              exc=requests.exceptions.ConnectTimeout)
+    result = check_repository('https://github.com/fair-software/does-not-exist', session=Session(retries=0),
+                              deadline=60)
+    assert result.ok
+    assert result.compliance.is_partial
+    assert "Could not retrieve the configuration file on the remote" in result.output
+
+
+def test_check_repositories_keeps_going(mocked_does_not_exist):
+    urls = ['https://github.com/fair-software/does-not-exist',
+            'https://example.com/fair-software/does-not-exist',
+            'https://github.com/fair-software/does-not-exist']
+    results = list(check_repositories(iter(urls), max_workers=2))
+    assert sorted(result.url for result in results) == sorted(urls)
+    assert [result.ok for result in results].count(True) == 2
+
+
+def test_get_pool_maxsize():
+    # enough connections for the requests that each check has in flight at the same time
+    assert get_pool_maxsize(8) == 8
+    assert get_pool_maxsize(8, parallel=True) == 72
+
+
+def test_cli_input_file(mocked_does_not_exist):
+    stdin = "# repositories\nhttps://github.com/fair-software/does-not-exist\n\n" + \
+            "https://github.com/fair-software/does-not-exist\n"
+    result = CliRunner().invoke(cli, ["--input-file", "-", "--jobs", "2"], input=stdin)
+    assert result.exit_code == 0
+    assert result.output.count("url: https://github.com/fair-software/does-not-exist") == 2
+    assert result.output.count("(1/5) repository") == 2
+
+
+def test_cli_input_file_jsonl(mocked_does_not_exist):
+    stdin = "https://github.com/fair-software/does-not-exist\nhttps://example.com/fair-software/does-not-exist\n"
+    result = CliRunner().invoke(cli, ["--input-file", "-", "--format", "jsonl"], input=stdin)
+    assert result.exit_code == 1
+    records = {record["url"]: record for record in map(json.loads, result.output.splitlines())}
+    assert len(records) == 2
+
+    record = records["https://github.com/fair-software/does-not-exist"]
+    assert record["error"] is None
+    assert record["branch"] == "main"
+    assert record["sha"] is None
+    assert record["compliance"] == dict(repository=False, license=False, registry=False, citation=False,
+                                        checklist=False)
+    assert record["sub_checks"]["has_pypi_badge"] is False
+    assert len(record["sub_checks"]) == 18
+    assert record["unfinished"] == []
+    assert record["badge"].startswith("https://img.shields.io/badge/fair--software.eu-")
+
+    record = records["https://example.com/fair-software/does-not-exist"]
+    assert record["error"].startswith("AssertionError")
+    assert record["compliance"] is None
+
+
+def test_cli_url_jsonl(mocked_does_not_exist):
+    result = CliRunner().invoke(cli, ["https://github.com/fair-software/does-not-exist", "--branch", "main",
+                                      "--format", "jsonl"])
+    assert result.exit_code == 0
+    lines = result.output.splitlines()
+    assert len(lines) == 1
+    record = json.loads(lines[0])
+    assert record["branch"] == "main"
+    assert record["sub_checks"]["has_open_repository"] is False
+
+
+@pytest.mark.parametrize("args", [["--input-file", "-", "--checkout", "."],
+                                  ["--input-file", "-", "--offline"],
+                                  ["https://github.com/fair-software", "--checkout", "."],
+                                  ["https://github.com/fair-software", "--checkout", ".", "--offline"]])
+def test_cli_batch_rejects_checkout(args):
+    result = CliRunner().invoke(cli, args, input="https://github.com/fair-software/does-not-exist\n")
+    assert result.exit_code != 0
+    assert "not with --input-file or the URL of an organisation" in str(result.exception)
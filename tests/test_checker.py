@@ -1,25 +1,38 @@
 import pytest
+import requests
 from requests_mock import Mocker
 from howfairis import Checker
 from howfairis import Compliance
 from howfairis import Config
 from howfairis import Repo
+from howfairis import Session
 from howfairis.readme import Readme
+from howfairis.readme import readme_filenames
+from howfairis.readme_format import ReadmeFormat
+from tests.github.fair_software.does_not_exist.mocker import mocker
 
 
 @pytest.fixture
 def badghurl_checker(requests_mock: Mocker):
     requests_mock.get('https://raw.githubusercontent.com/fair-software/does-not-exist/main/.howfairis.yml', status_code=404)
     requests_mock.get('https://raw.githubusercontent.com/fair-software/does-not-exist/main/.howfairis.yml', status_code=404)
-    requests_mock.get('https://raw.githubusercontent.com/fair-software/does-not-exist/main/README.md', status_code=404)
-    requests_mock.get('https://raw.githubusercontent.com/fair-software/does-not-exist/main/README.rst', status_code=404)
+    for readme_filename in readme_filenames:
+        requests_mock.get('https://raw.githubusercontent.com/fair-software/does-not-exist/main/' + readme_filename,
+                          status_code=404)
     requests_mock.get('https://api.github.com/repos/fair-software/does-not-exist', status_code=404)
     requests_mock.get('https://api.github.com/repos/fair-software/does-not-exist/license', status_code=404)
+    requests_mock.get('https://api.github.com/repos/fair-software/does-not-exist/contents', status_code=404)
     requests_mock.get('https://github.com/fair-software/does-not-exist', status_code=404)
     requests_mock.get('https://raw.githubusercontent.com/fair-software/does-not-exist/main/CITATION', status_code=404)
     requests_mock.get('https://raw.githubusercontent.com/fair-software/does-not-exist/main/CITATION.cff', status_code=404)
     requests_mock.get('https://raw.githubusercontent.com/fair-software/does-not-exist/main/codemeta.json', status_code=404)
     requests_mock.get('https://raw.githubusercontent.com/fair-software/does-not-exist/main/.zenodo.json', status_code=404)
+    requests_mock.head('https://api.github.com/repos/fair-software/does-not-exist', status_code=404)
+    requests_mock.head('https://api.github.com/repos/fair-software/does-not-exist/license', status_code=404)
+    requests_mock.head('https://raw.githubusercontent.com/fair-software/does-not-exist/main/CITATION', status_code=404)
+    requests_mock.head('https://raw.githubusercontent.com/fair-software/does-not-exist/main/CITATION.cff', status_code=404)
+    requests_mock.head('https://raw.githubusercontent.com/fair-software/does-not-exist/main/codemeta.json', status_code=404)
+    requests_mock.head('https://raw.githubusercontent.com/fair-software/does-not-exist/main/.zenodo.json', status_code=404)
 
     repo = Repo('https://github.com/fair-software/does-not-exist')
     config = Config(repo)
@@ -39,3 +52,128 @@ def test_checker_check_five_recommendations(badghurl_checker: Checker):
 
     expected_compliance = Compliance(repository=False, license_=False, registry=False, citation=False, checklist=False)
     assert actual_compliance == expected_compliance
+
+
+def test_checker_parallel_output_is_ordered(mocker, capsys):
+    mocker.head('https://raw.githubusercontent.com/fair-software/does-not-exist/main/CITATION.cff')
+    with mocker:
+        repo = Repo('https://github.com/fair-software/does-not-exist')
+        checker = Checker(Config(repo), repo)
+        assert checker.readme.text is None
+        capsys.readouterr()
+        serial_compliance = checker.check_five_recommendations()
+        serial_output = capsys.readouterr().out
+
+        checker.parallel = True
+        parallel_compliance = checker.check_five_recommendations()
+        parallel_output = capsys.readouterr().out
+
+    assert parallel_compliance == serial_compliance
+    assert parallel_compliance.citation is True
+    assert parallel_output == serial_output
+    assert serial_output.index("(1/5)") < serial_output.index("(4/5)") < serial_output.index("(5/5)")
+
+
+def test_checker_existence_probes_do_not_download(mocker):
+    url = 'https://raw.githubusercontent.com/fair-software/does-not-exist/main/codemeta.json'
+    with mocker:
+        mocker.head(url)
+        repo = Repo('https://github.com/fair-software/does-not-exist')
+        checker = Checker(Config(repo), repo)
+        assert checker.has_codemeta_file() is True
+        assert mocker.last_request.method == 'HEAD'
+
+        mocker.head(url, status_code=405)
+        mocker.get(url, text='{"@context": "https://doi.org/10.5063/schema/codemeta-2.0"}')
+        assert checker.has_codemeta_file() is True
+        assert [request.method for request in mocker.request_history[-2:]] == ['HEAD', 'GET']
+
+
+def test_checker_readme_from_listing(mocker):
+    raw = 'https://raw.githubusercontent.com/fair-software/does-not-exist/main/'
+    with mocker:
+        mocker.get('https://api.github.com/repos/fair-software/does-not-exist/contents',
+                   json=[dict(name='readme.md', type='file'), dict(name='README.txt', type='file')])
+        mocker.get(raw + 'README.txt', text='plain text')
+        repo = Repo('https://github.com/fair-software/does-not-exist')
+        checker = Checker(Config(repo), repo)
+        assert checker.readme == Readme(filename='README.txt', text='plain text', fmt=None)
+        readme_requests = [request.url for request in mocker.request_history if request.url.startswith(raw + 'R')]
+        assert readme_requests == [raw + 'README.txt']
+
+
+def test_checker_readme_from_probes(mocker):
+    raw = 'https://raw.githubusercontent.com/fair-software/does-not-exist/main/'
+    with mocker:
+        mocker.get(raw + 'README.markdown', text='# Title')
+        mocker.get(raw + 'README', text='Title')
+        repo = Repo('https://github.com/fair-software/does-not-exist')
+        checker = Checker(Config(repo), repo)
+        assert checker.readme == Readme(filename='README.markdown', text='# Title', fmt=ReadmeFormat.MARKDOWN)
+
+
+def test_checker_deadline_reached(mocker, capsys):
+    with mocker:
+        repo = Repo('https://github.com/fair-software/does-not-exist')
+        checker = Checker(Config(repo), repo, deadline=0)
+        compliance = checker.check_five_recommendations()
+
+    assert compliance == Compliance(repository=False, license_=False, registry=False, citation=False, checklist=False)
+    assert compliance.is_partial
+    assert 'has_license' in compliance.unfinished
+    assert 'has_core_infrastructures_badge' in compliance.unfinished
+    assert len(compliance.unfinished) == 18
+    assert 'has_license (did not finish)' in capsys.readouterr().out
+
+
+def test_checker_timed_out_request_is_unfinished(mocker):
+    with mocker:
+        mocker.head('https://api.github.com/repos/fair-software/does-not-exist/license',
+                    exc=requests.exceptions.ReadTimeout)
+        mocker.head('https://raw.githubusercontent.com/fair-software/does-not-exist/main/CITATION.cff')
+        repo = Repo('https://github.com/fair-software/does-not-exist', session=Session(retries=0))
+        compliance = Checker(Config(repo), repo, deadline=60).check_five_recommendations()
+
+    assert compliance.unfinished == ['has_license']
+    assert compliance.citation is True
+    assert compliance.license is False
+
+
+def test_checker_timed_out_readme_is_unfinished(mocker, capsys):
+    with mocker:
+        mocker.get('https://raw.githubusercontent.com/fair-software/does-not-exist/main/README.rst',
+                   exc=requests.exceptions.ReadTimeout)
+        repo = Repo('https://github.com/fair-software/does-not-exist', session=Session(retries=0))
+        checker = Checker(Config(repo), repo)
+        compliance = checker.check_five_recommendations()
+
+    assert checker.readme.text is None
+    assert 'has_pypi_badge' in compliance.unfinished
+    assert 'has_core_infrastructures_badge' in compliance.unfinished
+    assert 'has_license' not in compliance.unfinished
+    assert 'Could not retrieve the README' in capsys.readouterr().out
+
+
+def test_checker_readme_probes_keep_to_deadline(mocker):
+    with mocker:
+        repo = Repo('https://github.com/fair-software/does-not-exist')
+        checker = Checker(Config(repo), repo, deadline=0)
+        # the directory could not be listed, so the README names are probed
+        checker.files.filenames = None
+        compliance = checker.check_five_recommendations()
+        readme_requests = [request.url for request in mocker.request_history if '/README' in request.url]
+
+    assert readme_requests == []
+    assert 'has_pypi_badge' in compliance.unfinished
+
+
+def test_checker_timed_out_config_is_unfinished(mocker):
+    with mocker:
+        mocker.get('https://raw.githubusercontent.com/fair-software/does-not-exist/main/.howfairis.yml',
+                   exc=requests.exceptions.ReadTimeout)
+        repo = Repo('https://github.com/fair-software/does-not-exist', session=Session(retries=0))
+        config = Config(repo)
+        compliance = Checker(config, repo).check_five_recommendations()
+
+    assert not config.is_complete
+    assert len(compliance.unfinished) == 18
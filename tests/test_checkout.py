@@ -0,0 +1,114 @@
+import subprocess
+import pytest
+from requests_mock import Mocker
+from howfairis import Checker
+from howfairis import Compliance
+from howfairis import Config
+from howfairis import Repo
+from howfairis import Session
+from howfairis.checkout import Checkout
+from howfairis.result_cache import ResultCache
+
+
+readme = "[![PyPI](https://img.shields.io/pypi/v/badge.svg)](https://pypi.org/project/badge/)\n"
+
+
+def git(directory, *args):
+    subprocess.run(["git", "-C", str(directory)] + list(args), check=True, stdout=subprocess.DEVNULL,
+                   stderr=subprocess.DEVNULL)
+
+
+@pytest.fixture
+def working_copy(tmp_path):
+    directory = tmp_path / "badge"
+    directory.mkdir()
+    git(directory, "init", "-q")
+    git(directory, "checkout", "-q", "-b", "develop")
+    (directory / "README.md").write_text(readme)
+    (directory / "LICENSE").write_text("Apache License\n")
+    (directory / "CITATION.cff").write_text("cff-version: 1.1.0\n")
+    (directory / "docs").mkdir()
+    (directory / "docs" / "index.rst").write_text("Docs\n")
+    git(directory, "add", ".")
+    git(directory, "-c", "user.name=Test", "-c", "user.email=test@example.com", "commit", "-q", "-m", "Initial")
+    git(directory, "remote", "add", "origin", "git@github.com:fair-software/badge.git")
+    return directory
+
+
+@pytest.fixture
+def bare(working_copy, tmp_path):
+    directory = tmp_path / "badge.git"
+    subprocess.run(["git", "clone", "-q", "--bare", str(working_copy), str(directory)], check=True)
+    return directory
+
+
+def test_checkout_working_copy(working_copy):
+    checkout = Checkout(str(working_copy))
+    assert not checkout.is_bare
+    assert checkout.list_files() == {"README.md", "LICENSE", "CITATION.cff"}
+    assert checkout.list_files("docs") == {"index.rst"}
+    assert checkout.list_files("missing") is None
+    assert checkout.read_text("README.md") == readme
+    assert checkout.read_text("missing.md") is None
+    assert checkout.get_branch() == "develop"
+    assert len(checkout.get_sha()) == 40
+    assert checkout.get_remote_url() == "https://github.com/fair-software/badge"
+
+
+def test_checkout_working_copy_with_changes(working_copy):
+    (working_copy / "README.md").write_text("Changed\n")
+    checkout = Checkout(str(working_copy))
+    assert checkout.read_text("README.md") == "Changed\n"
+    assert checkout.get_sha() is None
+    # with a ref, the committed files are read instead
+    assert Checkout(str(working_copy), "develop").read_text("README.md") == readme
+
+
+def test_checkout_bare(bare):
+    checkout = Checkout(str(bare))
+    assert checkout.is_bare
+    assert checkout.list_files() == {"README.md", "LICENSE", "CITATION.cff"}
+    assert checkout.list_files("docs/") == {"index.rst"}
+    assert checkout.list_files("missing") is None
+    assert checkout.read_text("README.md") == readme
+    assert checkout.read_text("missing.md") is None
+    assert checkout.get_branch() == "develop"
+    assert len(checkout.get_sha()) == 40
+
+
+def test_checkout_not_a_directory(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        Checkout(str(tmp_path / "missing"))
+
+
+def test_checker_offline_makes_no_requests(working_copy, capsys):
+    (working_copy / ".howfairis.yml").write_text("include_comments: true\n")
+    with Mocker() as m:
+        repo = Repo(Checkout(str(working_copy)).get_remote_url(), session=Session(), checkout=str(working_copy))
+        config = Config(repo)
+        checker = Checker(config, repo, offline=True)
+        compliance = checker.check_five_recommendations()
+        assert m.call_count == 0
+
+    assert repo.default_branch == "develop"
+    assert config.include_comments is True
+    assert compliance == Compliance(repository=False, license_=True, registry=True, citation=True, checklist=False)
+    assert "has_open_repository (skipped when offline)" in capsys.readouterr().out
+
+
+def test_checker_offline_result_is_kept_apart(working_copy, tmp_path):
+    result_cache = ResultCache(str(tmp_path / "cache"))
+    repo = Repo(Checkout(str(working_copy)).get_remote_url(), session=Session(), checkout=str(working_copy))
+    config = Config(repo, ignore_remote_config=True)
+    compliance = Checker(config, repo, result_cache=result_cache, offline=True).check_five_recommendations()
+
+    assert compliance.repository is False
+    assert result_cache.get(ResultCache.key(repo, config, offline=True)).compliance == compliance
+    # an online check of the same commit does not take the skipped checks for failed ones
+    assert result_cache.get(ResultCache.key(repo, config)) is None
+
+
+def test_checker_offline_needs_checkout():
+    repo = Repo("https://github.com/fair-software/badge", branch="main", session=Session())
+    with pytest.raises(ValueError):
+        Checker(Config(repo, ignore_remote_config=True), repo, offline=True)
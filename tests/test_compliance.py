@@ -10,3 +10,21 @@ def test_get_compliance():
     expected_compliance = Compliance(repository=True, license_=True, registry=True, citation=True, checklist=False)
     assert actual_compliance == expected_compliance
 
+
+def test_calc_badge_without_markup():
+    compliance = Compliance(repository=True, license_=True, registry=False, citation=False, checklist=False)
+    assert compliance.calc_badge(None) == "https://img.shields.io/badge/fair--software.eu-" + \
+        "%E2%97%8F%20%20%E2%97%8F%20%20%E2%97%8B%20%20%E2%97%8B%20%20%E2%97%8B-orange"
+
+
+def test_partial_compliance():
+    compliance = Compliance(repository=True, unfinished=["has_license"])
+    assert compliance.is_partial
+    assert Compliance(repository=True) == compliance
+    assert not Compliance(repository=True).is_partial
+
+
+def test_as_dict():
+    compliance = Compliance(repository=True, license_=True, citation=True)
+    assert compliance.as_dict() == dict(repository=True, license=True, registry=False, citation=True,
+                                        checklist=False)
@@ -1,6 +1,7 @@
+import pytest
 from requests_mock import Mocker
 
-from howfairis import Config, Repo
+from howfairis import CollectingReporter, Config, Repo
 
 
 def test_config_withoutrepoconfig_shouldusedefault(requests_mock: Mocker):
@@ -16,3 +17,41 @@ def test_config_withoutrepoconfig_shouldusedefault(requests_mock: Mocker):
     assert config.force_citation is None, "config not same as `howfairis/data/.howfairis.yml`"
     assert config.force_checklist is None, "config not same as `howfairis/data/.howfairis.yml`"
     assert config.include_comments is False, "config not same as `howfairis/data/.howfairis.yml`"
+
+
+def test_default_config_is_shared_and_read_only():
+    config1 = Config(None)
+    config2 = Config(None)
+    assert config1._default is config2._default
+    with pytest.raises(TypeError):
+        config1._default['include_comments'] = True
+
+
+def test_remote_config_parsed_once_per_text(requests_mock: Mocker):
+    for name in ['howfairis', 'badge']:
+        requests_mock.get('https://raw.githubusercontent.com/fair-software/{0}/main/.howfairis.yml'.format(name),
+                          text='force_citation: true\n')
+    reporter = CollectingReporter()
+    config1 = Config(Repo('https://github.com/fair-software/howfairis', branch='main'), reporter=reporter)
+    config2 = Config(Repo('https://github.com/fair-software/badge', branch='main'), reporter=reporter)
+
+    assert config1.force_citation is True and config2.force_citation is True
+    assert config1._repo is config2._repo
+    # both still tell which file they use
+    assert len(reporter.events) == 2
+
+
+def test_local_config_reparsed_when_changed(tmp_path, monkeypatch):
+    monkeypatch.chdir(str(tmp_path))
+    (tmp_path / 'local.yml').write_text('force_license: true\n')
+    config1 = Config(None, 'local.yml')
+    config2 = Config(None, 'local.yml')
+    assert config1.force_license is True
+    assert config1._user is config2._user
+
+    (tmp_path / 'local.yml').write_text('force_license: false\n')
+    assert Config(None, 'local.yml').force_license is False
+
+    (tmp_path / 'local.yml').write_text('force_everything: true\n')
+    with pytest.raises(Exception, match='should follow the schema'):
+        Config(None, 'local.yml')
@@ -0,0 +1,62 @@
+import requests
+from click.testing import CliRunner
+from howfairis import NullReporter
+from howfairis import Organisation
+from howfairis import Session
+from howfairis.batch import check_repositories
+from howfairis.cli import cli
+from howfairis.ratelimit import RateLimiter
+from loadtests.fake_server import FakeServer
+
+
+def test_check_synthetic_repositories():
+    with FakeServer(n_repositories=10) as server:
+        session = Session(base_urls=server.base_urls)
+        for platform in ["github", "gitlab"]:
+            urls = list(Organisation("https://{0}.com/synthetic".format(platform), session,
+                                     per_page=3).get_repository_urls())
+            assert urls == server.get_repository_urls(platform)
+
+            for result in check_repositories(urls, max_workers=4, session=session, reporter=NullReporter()):
+                assert result.ok
+                assert result.compliance == server.get_repository("synthetic", result.url.rsplit("/", 1)[1]).compliance
+
+
+def test_rate_limit_and_errors():
+    with FakeServer(n_repositories=1, rate_limit=1, rate_limit_window=60) as server:
+        url = server.url + "/api.github.com/repos/synthetic/repo-00000"
+        response = requests.get(url)
+        assert response.status_code == 200
+        assert response.headers["X-RateLimit-Remaining"] == "0"
+        response = requests.get(url)
+        assert response.status_code == 403
+        response = requests.get(server.url + "/gitlab.com/api/v4/projects/synthetic%2Frepo-00000")
+        assert response.status_code == 200
+        response = requests.get(server.url + "/gitlab.com/api/v4/projects/synthetic%2Frepo-00000")
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) > 0
+
+    with FakeServer(n_repositories=1, error_rate=1) as server:
+        response = requests.get(server.url + "/raw.githubusercontent.com/synthetic/repo-00000/main/README.md")
+        assert response.status_code in FakeServer.error_status_codes
+
+
+def test_rate_limits_are_per_original_host():
+    with FakeServer(n_repositories=1, rate_limit=1, rate_limit_window=60) as server:
+        # would raise RateLimitExceeded rather than wait, if the quota of one host held up another
+        session = Session(base_urls=server.base_urls, rate_limiter=RateLimiter(max_wait=0))
+        assert session.get("https://api.github.com/repos/synthetic/repo-00000").status_code == 200
+        assert session.get("https://raw.githubusercontent.com/synthetic/repo-00000/main/README.md").status_code == 200
+        assert session.get("https://gitlab.com/api/v4/projects/synthetic%2Frepo-00000").status_code == 200
+
+
+def test_cli_base_url():
+    with FakeServer(n_repositories=5) as server:
+        args = []
+        for base_url, replacement in server.base_urls.items():
+            args.extend(["--base-url", base_url + "=" + replacement])
+        result = CliRunner().invoke(cli, args + ["--format", "jsonl", "https://github.com/synthetic"])
+
+    assert result.exit_code == 0
+    assert len(result.output.splitlines()) == 5
+    assert server.stats[("api.github.com", 200)] > 0
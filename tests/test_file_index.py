@@ -0,0 +1,50 @@
+from requests_mock import Mocker
+from howfairis import Checker
+from howfairis import Config
+from howfairis import Repo
+from howfairis.file_index import FileIndex
+
+
+def test_github_listing_answers_citation_checks(requests_mock: Mocker):
+    api = "https://api.github.com/repos/fair-software/badge"
+    raw = "https://raw.githubusercontent.com/fair-software/badge/master/"
+    requests_mock.get(api, json=dict(default_branch="master"))
+    requests_mock.get(raw + "sub/.howfairis.yml", status_code=404)
+    requests_mock.get(api + "/contents/sub?ref=master", json=[dict(name="CITATION.cff", type="file"),
+                                                              dict(name=".zenodo.json", type="symlink"),
+                                                              dict(name="CITATION", type="dir")])
+    repo = Repo("https://github.com/fair-software/badge", path="sub")
+    checker = Checker(Config(repo), repo)
+
+    results = [checker.has_citation_file(), checker.has_citationcff_file(), checker.has_codemeta_file(),
+               checker.has_zenodo_metadata_file()]
+
+    assert results == [False, True, False, True]
+    assert [request.url for request in requests_mock.request_history][-1] == api + "/contents/sub?ref=master"
+    assert requests_mock.call_count == 3
+
+
+def test_gitlab_listing_is_paginated(requests_mock: Mocker):
+    api = "https://gitlab.com/api/v4/projects/jspaaks%2Fbadge-test"
+    requests_mock.get(api, json=dict(default_branch="master"))
+    requests_mock.get(api + "/repository/tree?page=1", json=[dict(name="README.md", type="blob")],
+                      headers={"X-Next-Page": "2"})
+    requests_mock.get(api + "/repository/tree?page=2", json=[dict(name="CITATION.cff", type="blob"),
+                                                             dict(name="docs", type="tree")],
+                      headers={"X-Next-Page": ""})
+    files = FileIndex(Repo("https://gitlab.com/jspaaks/badge-test"))
+
+    assert files.filenames == {"README.md", "CITATION.cff"}
+    assert files.exists("docs") is False
+    assert requests_mock.call_count == 3
+
+
+def test_listing_not_available(requests_mock: Mocker):
+    api = "https://api.github.com/repos/fair-software/badge"
+    requests_mock.get(api, json=dict(default_branch="master"))
+    requests_mock.get(api + "/contents", status_code=403)
+    files = FileIndex(Repo("https://github.com/fair-software/badge"))
+
+    assert files.exists("CITATION.cff") is None
+    assert files.exists("CITATION") is None
+    assert requests_mock.call_count == 2
@@ -0,0 +1,112 @@
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+import pytest
+import requests_mock
+from howfairis import Compliance
+from howfairis import Repo
+from howfairis import Session
+from howfairis.batch import check_repositories
+from howfairis.github_graphql import GitHubGraphQL
+
+
+readme = "[![PyPI](https://img.shields.io/pypi/v/badge.svg)](https://pypi.org/project/badge/)\n"
+
+# what the stand-in server knows, by owner and name
+repositories = {
+    ("fair-software", "badge"): {
+        "defaultBranchRef": {"name": "master"},
+        "isPrivate": False,
+        "licenseInfo": {"spdxId": "Apache-2.0"},
+        "commit": {"oid": "b3f90ec9c2b1be604f482c2d9e46a9aeca3ee45a"},
+        "tree": {"entries": [{"name": "README.md", "type": "blob"}, {"name": "CITATION.cff", "type": "blob"},
+                             {"name": "docs", "type": "tree"}]},
+        "readme1": {"text": readme}
+    },
+    ("fair-software", "no-license"): {
+        "defaultBranchRef": {"name": "main"},
+        "isPrivate": False,
+        "licenseInfo": None,
+        "commit": {"oid": "472713282fde87fa4c8e5116e46229c094c3c4ec"},
+        "tree": {"entries": [{"name": "README", "type": "blob"}]},
+        "readme4": {"text": "Nothing to see here."}
+    }
+}
+
+
+class GraphQLHandler(BaseHTTPRequestHandler):
+
+    queries = []
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        GraphQLHandler.queries.append((self.headers.get("Authorization"), body["query"]))
+        data = dict()
+        for alias, owner, name in re.findall(r'(r\d+): repository\(owner: "([^"]*)", name: "([^"]*)"\)',
+                                             body["query"]):
+            data[alias] = repositories.get((owner, name))
+        payload = json.dumps(dict(data=data)).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+@pytest.fixture
+def endpoint():
+    GraphQLHandler.queries = []
+    server = HTTPServer(("127.0.0.1", 0), GraphQLHandler)
+    thread = threading.Thread(target=server.serve_forever, kwargs=dict(poll_interval=0.05), daemon=True)
+    thread.start()
+    yield "http://127.0.0.1:{0}/graphql".format(server.server_address[1])
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch(endpoint):
+    graphql = GitHubGraphQL("abc", session=Session(), endpoint=endpoint)
+    repos = [Repo("https://github.com/fair-software/badge"),
+             Repo("https://github.com/fair-software/does-not-exist"),
+             Repo("https://github.com/fair-software/no-license", branch="main", path="sub")]
+    badge, missing, no_license = graphql.fetch(repos)
+
+    assert len(GraphQLHandler.queries) == 1
+    authorization, query = GraphQLHandler.queries[0]
+    assert authorization == "bearer abc"
+    assert 'object(expression: "main:sub/README.md")' in query
+
+    assert badge.default_branch == "master"
+    assert badge.sha == "b3f90ec9c2b1be604f482c2d9e46a9aeca3ee45a"
+    assert badge.has_license is True
+    assert badge.filenames == {"README.md", "CITATION.cff"}
+    assert badge.readme_filename == "README.md"
+    assert missing is None
+    assert no_license.has_license is False
+    assert no_license.readme_filename == "README"
+
+
+def test_check_repositories_with_graphql(endpoint):
+    urls = ["https://github.com/fair-software/badge", "https://github.com/fair-software/no-license",
+            "https://gitlab.com/jspaaks/badge-test"]
+    with requests_mock.Mocker(real_http=True) as m:
+        m.register_uri(requests_mock.ANY, re.compile("^https://gitlab.com/"), status_code=404)
+        session = Session()
+        graphql = GitHubGraphQL("abc", session=session, endpoint=endpoint, batch_size=2)
+        results = {result.url: result for result in check_repositories(iter(urls), max_workers=2,
+                                                                        session=session, graphql=graphql)}
+        github_requests = [request.url for request in m.request_history if "github" in request.url]
+
+    # one query for the two GitHub repositories, the GitLab repository is left out
+    assert len(GraphQLHandler.queries) == 1
+    assert github_requests == []
+    assert results[urls[0]].compliance == Compliance(repository=True, license_=True, registry=True, citation=True,
+                                                     checklist=False)
+    assert results[urls[1]].compliance == Compliance(repository=True)
+    assert results[urls[1]].readme.filename == "README"
+    assert results[urls[2]].ok
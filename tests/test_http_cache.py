@@ -0,0 +1,162 @@
+import pytest
+from requests_mock import Mocker
+from howfairis import Session
+from howfairis.http_cache import HttpCache
+
+
+url = 'https://raw.githubusercontent.com/fair-software/badge/master/README.md'
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return HttpCache(str(tmp_path), ttl=600, negative_ttl=600)
+
+
+def test_fresh_response_is_served_from_cache(requests_mock: Mocker, cache):
+    requests_mock.get(url, text='# badge', headers={'ETag': '"abc"'})
+    session = Session(cache=cache)
+
+    assert session.get(url).text == '# badge'
+    response = session.get(url)
+
+    assert response.text == '# badge'
+    assert response.from_cache is True
+    assert requests_mock.call_count == 1
+
+
+def test_stale_response_is_revalidated(requests_mock: Mocker, cache):
+    cache.ttl = 0
+    session = Session(cache=cache)
+    requests_mock.get(url, text='# badge', headers={'ETag': '"abc"'})
+    session.get(url)
+
+    requests_mock.get(url, status_code=304, headers={'ETag': '"abc"'})
+    response = session.get(url)
+
+    assert response.status_code == 200
+    assert response.text == '# badge'
+    assert requests_mock.last_request.headers['If-None-Match'] == '"abc"'
+    assert requests_mock.call_count == 2
+
+
+def test_changed_response_replaces_cached(requests_mock: Mocker, cache):
+    cache.ttl = 0
+    session = Session(cache=cache)
+    requests_mock.get(url, text='# badge', headers={'ETag': '"abc"'})
+    session.get(url)
+
+    requests_mock.get(url, text='# new badge', headers={'ETag': '"def"'})
+    assert session.get(url).text == '# new badge'
+    assert cache.get(cache.key(requests_mock.last_request)).etag == '"def"'
+
+
+def test_not_found_is_cached(requests_mock: Mocker, cache):
+    requests_mock.get(url, status_code=404)
+    session = Session(cache=cache)
+
+    assert session.get(url).status_code == 404
+    assert session.get(url).status_code == 404
+    assert requests_mock.call_count == 1
+
+
+def test_cache_persists(requests_mock: Mocker, tmp_path):
+    requests_mock.get(url, text='# badge')
+    Session(cache=HttpCache(str(tmp_path))).get(url)
+
+    assert Session(cache=HttpCache(str(tmp_path))).get(url).text == '# badge'
+    assert requests_mock.call_count == 1
+
+
+def test_least_recently_used_is_evicted(requests_mock: Mocker, cache):
+    cache.max_size = 2500
+    session = Session(cache=cache)
+    for name in ['a', 'b', 'c']:
+        requests_mock.get(url + name, text=name * 1000)
+    session.get(url + 'a')
+    session.get(url + 'b')
+    session.get(url + 'a')
+    session.get(url + 'c')
+
+    assert requests_mock.call_count == 3
+    session.get(url + 'a')
+    assert requests_mock.call_count == 3
+    session.get(url + 'b')
+    assert requests_mock.call_count == 4
+
+
+def test_head_not_found_is_cached(requests_mock: Mocker, cache):
+    requests_mock.head(url, status_code=404)
+    session = Session(cache=cache)
+
+    assert session.head(url).status_code == 404
+    assert session.head(url).status_code == 404
+    assert session.get(url).status_code == 404
+    assert requests_mock.call_count == 1
+
+
+def test_head_is_cached_and_revalidated(requests_mock: Mocker, cache):
+    requests_mock.head(url, headers={'ETag': '"abc"'})
+    requests_mock.get(url, text='# badge')
+    session = Session(cache=cache)
+
+    assert session.head(url).status_code == 200
+    assert session.head(url).from_cache is True
+    assert requests_mock.call_count == 1
+
+    cache.ttl = 0
+    requests_mock.head(url, status_code=304, headers={'ETag': '"abc"'})
+    assert session.head(url).status_code == 200
+    assert requests_mock.last_request.headers['If-None-Match'] == '"abc"'
+
+    # the body is not known from a HEAD request
+    assert session.get(url).text == '# badge'
+    assert requests_mock.last_request.method == 'GET'
+
+
+def test_streamed_body_is_cached_when_read(requests_mock: Mocker, cache):
+    requests_mock.get(url, text='# badge' * 1000, headers={'ETag': '"abc"'})
+    session = Session(cache=cache)
+
+    with session.get(url, stream=True) as response:
+        next(response.iter_content(chunk_size=10))
+    # only part of the body was read, so it has to be fetched again
+    assert cache.get(cache.key(requests_mock.last_request)).has_body is False
+
+    with session.get(url, stream=True) as response:
+        assert b''.join(response.iter_content(chunk_size=10)) == b'# badge' * 1000
+    assert requests_mock.call_count == 2
+
+    with session.get(url, stream=True) as response:
+        assert response.from_cache is True
+        assert b''.join(response.iter_content(chunk_size=10)) == b'# badge' * 1000
+    assert session.get(url).text == '# badge' * 1000
+    assert requests_mock.call_count == 2
+
+
+def test_credentials_are_cached_apart(requests_mock: Mocker, cache):
+    requests_mock.get(url, text='# badge')
+    session = Session(cache=cache)
+
+    session.get(url, headers={'Authorization': 'token a'})
+    session.get(url, headers={'Authorization': 'token b'})
+    session.get(url)
+    assert requests_mock.call_count == 3
+
+    session.get(url, headers={'Authorization': 'token a'})
+    assert requests_mock.call_count == 3
+    assert 'token a' not in cache.key(requests_mock.last_request)
+
+
+def test_replaced_response_is_counted_once(requests_mock: Mocker, cache):
+    cache.max_size = 2500
+    cache.ttl = 0
+    session = Session(cache=cache)
+    for name in ['a', 'b']:
+        requests_mock.get(url + name, text=name * 1000)
+    for _ in range(5):
+        session.get(url + 'a')
+    session.get(url + 'b')
+
+    cache.ttl = 600
+    session.get(url + 'a')
+    assert requests_mock.call_count == 6
@@ -0,0 +1,49 @@
+from howfairis.links import index_links
+from howfairis.readme import Readme
+from howfairis.readme_format import ReadmeFormat
+
+
+def test_markdown():
+    text = "[![pypi](https://img.shields.io/pypi/v/x.svg)](https://pypi.org/project/x/)\n" + \
+           "<img src=\"https://zenodo.org/badge/1.svg\">\n" + \
+           "See <https://pypi.org/project/x/>.\n" + \
+           "[ref]: https://example.org/ref\n"
+    assert index_links(text, ReadmeFormat.MARKDOWN) == {
+        "img.shields.io": ["https://img.shields.io/pypi/v/x.svg"],
+        "pypi.org": ["https://pypi.org/project/x/"],
+        "zenodo.org": ["https://zenodo.org/badge/1.svg"],
+        "example.org": ["https://example.org/ref"]
+    }
+
+
+def test_restructuredtext():
+    text = ".. image:: https://img.shields.io/pypi/v/x.svg\n" + \
+           "   :target: https://pypi.org/project/x/\n" + \
+           "\n" + \
+           ".. |zenodo| image:: https://zenodo.org/badge/1.svg\n" + \
+           "\n" + \
+           "Read `the docs <https://x.readthedocs.io>`_.\n" + \
+           ".. _home: https://example.org\n"
+    assert index_links(text, ReadmeFormat.RESTRUCTUREDTEXT) == {
+        "img.shields.io": ["https://img.shields.io/pypi/v/x.svg"],
+        "pypi.org": ["https://pypi.org/project/x/"],
+        "zenodo.org": ["https://zenodo.org/badge/1.svg"],
+        "x.readthedocs.io": ["https://x.readthedocs.io"],
+        "example.org": ["https://example.org"]
+    }
+
+
+def test_unknown_format():
+    text = "![](https://a.org/1.svg)\n.. image:: https://b.org/2.svg\n"
+    assert index_links(text, None) == {"a.org": ["https://a.org/1.svg"], "b.org": ["https://b.org/2.svg"]}
+
+
+def test_bare_url_is_a_link():
+    text = "Install from https://pypi.python.org/pypi/foo. See https://example.org/(x), or https://example.org/y!\n"
+    for fmt in [ReadmeFormat.MARKDOWN, ReadmeFormat.RESTRUCTUREDTEXT, None]:
+        assert index_links(text, fmt) == {
+            "pypi.python.org": ["https://pypi.python.org/pypi/foo"],
+            "example.org": ["https://example.org/", "https://example.org/y"]
+        }
+        readme = Readme(filename="README", text=text, fmt=fmt)
+        assert readme.badges == {"has_pypi_badge"}
@@ -0,0 +1,109 @@
+import re
+import pytest
+import requests
+from click.testing import CliRunner
+from requests_mock import Mocker
+from howfairis import Organisation
+from howfairis import Repo
+from howfairis import Session
+from howfairis.cli import cli
+from tests.github.fair_software.does_not_exist.mocker import mocker
+
+
+def make_github_page(m, api, page, names, n_pages=None):
+    headers = dict()
+    if n_pages is not None and page < n_pages:
+        headers["Link"] = '<{0}?page={1}>; rel="next", <{0}?page={2}>; rel="last"'.format(api, page + 1, n_pages)
+    m.get(re.compile(re.escape(api) + r"\?.*&page={0}$".format(page)), headers=headers,
+          json=[dict(html_url="https://github.com/" + name, private=False) for name in names])
+
+
+@pytest.mark.parametrize("url, name", [("https://github.com/fair-software", "fair-software"),
+                                       ("https://github.com/orgs/fair-software/", "fair-software"),
+                                       ("https://gitlab.com/jspaaks", "jspaaks"),
+                                       ("https://gitlab.com/groups/jspaaks", "jspaaks")])
+def test_organisation_url(url, name):
+    assert Organisation.is_organisation_url(url)
+    assert Organisation(url).name == name
+
+
+@pytest.mark.parametrize("url", ["https://github.com/fair-software/howfairis",
+                                 "https://gitlab.com/jspaaks/badge-test",
+                                 "https://example.com/fair-software"])
+def test_organisation_url_is_not(url):
+    assert not Organisation.is_organisation_url(url)
+
+
+def test_repo_rejects_organisation_url():
+    with pytest.raises(AssertionError, match="organisation"):
+        Repo("https://github.com/fair-software")
+
+
+def test_organisation_github_pages():
+    api = "https://api.github.com/orgs/fair-software/repos"
+    with Mocker() as m:
+        make_github_page(m, api, 1, ["fair-software/a", "fair-software/b"], n_pages=3)
+        make_github_page(m, api, 2, ["fair-software/c", "fair-software/d"], n_pages=3)
+        make_github_page(m, api, 3, ["fair-software/e"], n_pages=3)
+        organisation = Organisation("https://github.com/fair-software", session=Session(), per_page=2)
+        urls = list(organisation.get_repository_urls())
+        assert m.call_count == 3
+        assert all(request.qs["type"] == ["public"] for request in m.request_history)
+
+    assert urls == ["https://github.com/fair-software/" + name for name in ["a", "b", "c", "d", "e"]]
+
+
+def test_organisation_github_user():
+    with Mocker() as m:
+        m.get(re.compile(r"^https://api.github.com/orgs/"), status_code=404)
+        make_github_page(m, "https://api.github.com/users/jspaaks/repos", 1, ["jspaaks/a"])
+        urls = list(Organisation("https://github.com/jspaaks", session=Session()).get_repository_urls())
+        # the repositories endpoint of users knows no type public
+        assert m.last_request.qs["type"] == ["owner"]
+
+    assert urls == ["https://github.com/jspaaks/a"]
+
+
+def test_organisation_gitlab_pages_of_unknown_number():
+    # large listings do not report the number of pages, so pages are retrieved until one is not full
+    api = "https://gitlab.com/api/v4/groups/jspaaks/projects"
+    with Mocker() as m:
+        for page, names in enumerate([["a", "b"], ["c", "d"], ["e"], [], []], start=1):
+            m.get(re.compile(re.escape(api) + r"\?.*&page={0}$".format(page)),
+                  json=[dict(web_url="https://gitlab.com/jspaaks/" + name) for name in names])
+        organisation = Organisation("https://gitlab.com/jspaaks", session=Session(), per_page=2, prefetch=2)
+        urls = list(organisation.get_repository_urls())
+
+    assert urls == ["https://gitlab.com/jspaaks/" + name for name in ["a", "b", "c", "d", "e"]]
+
+
+def test_organisation_stops_listing_when_closed():
+    api = "https://api.github.com/orgs/fair-software/repos"
+    with Mocker() as m:
+        for page in range(1, 11):
+            make_github_page(m, api, page, ["fair-software/{0}-{1}".format(page, i) for i in range(2)], n_pages=10)
+        organisation = Organisation("https://github.com/fair-software", session=Session(), per_page=2, prefetch=2)
+        urls = organisation.get_repository_urls()
+        assert next(urls) == "https://github.com/fair-software/1-0"
+        assert next(urls) == "https://github.com/fair-software/1-1"
+        assert next(urls) == "https://github.com/fair-software/2-0"
+        urls.close()
+        assert m.call_count <= 4
+
+
+def test_organisation_not_found():
+    with Mocker() as m:
+        m.get(re.compile(r"^https://api.github.com/"), status_code=404)
+        with pytest.raises(requests.HTTPError):
+            list(Organisation("https://github.com/does-not-exist", session=Session()).get_repository_urls())
+
+
+def test_cli_organisation(mocker):
+    with mocker:
+        make_github_page(mocker, "https://api.github.com/orgs/fair-software/repos", 1,
+                         ["fair-software/does-not-exist", "fair-software/does-not-exist"])
+        result = CliRunner().invoke(cli, ["https://github.com/fair-software", "--jobs", "2"])
+
+    assert result.exit_code == 0
+    assert result.output.count("url: https://github.com/fair-software/does-not-exist") == 2
+    assert result.output.count("(1/5) repository") == 2
@@ -0,0 +1,97 @@
+import json
+import os
+import pstats
+import tracemalloc
+from click.testing import CliRunner
+from requests_mock import Mocker
+from howfairis import Session
+from howfairis.batch import check_repository
+from howfairis.cli import cli
+from howfairis.http_cache import HttpCache
+from howfairis.profiling import Profile
+from howfairis.profiling import measure
+from howfairis.profiling import record
+from tests.github.fair_software.does_not_exist.mocker import mocker
+
+
+def test_measure_without_profile_does_nothing():
+    with measure("phase") as measurement:
+        record(requests=1)
+    assert measurement is None
+
+
+def test_requests_count_towards_innermost_phase():
+    profile = Profile()
+    with profile.measure("outer"):
+        record(requests=1)
+        with measure("inner"):
+            record(requests=2, bytes_=10)
+        with measure("inner"):
+            record(retries=1)
+    record(requests=100)
+
+    assert profile.measurements["outer"].requests == 1
+    assert profile.measurements["inner"].count == 2
+    assert profile.measurements["inner"].requests == 2
+    assert profile.measurements["inner"].bytes == 10
+    assert profile.measurements["inner"].retries == 1
+    assert profile.measurements["outer"].wall_time >= profile.measurements["inner"].wall_time
+    assert list(profile.as_dict().keys()) == ["outer", "inner"]
+
+
+def test_session_records_retries_and_bytes(requests_mock: Mocker):
+    url = "https://raw.githubusercontent.com/fair-software/badge/main/README.md"
+    requests_mock.get(url, [dict(status_code=503), dict(text="# badge")])
+    profile = Profile()
+    with profile.measure("get"):
+        Session(backoff=0).get(url)
+
+    measurement = profile.measurements["get"]
+    assert (measurement.requests, measurement.retries, measurement.bytes) == (2, 1, 7)
+
+
+def test_session_records_cache_hits(requests_mock: Mocker, tmp_path):
+    url = "https://raw.githubusercontent.com/fair-software/badge/main/README.md"
+    requests_mock.get(url, text="# badge", headers={"Cache-Control": "max-age=600"})
+    session = Session(cache=HttpCache(str(tmp_path)))
+    session.get(url)
+    profile = Profile()
+    with profile.measure("get"):
+        session.get(url)
+
+    assert profile.measurements["get"].cache_hits == 1
+    assert profile.measurements["get"].requests == 0
+
+
+def test_check_repository_measures_sub_checks(mocker):
+    for parallel in [False, True]:
+        profile = Profile()
+        with mocker:
+            result = check_repository("https://github.com/fair-software/does-not-exist", session=Session(),
+                                      parallel=parallel, profile=profile)
+        assert result.ok
+
+        measurements = profile.measurements
+        assert measurements["check_repository"].count == 1
+        assert measurements["has_license"].requests == 1
+        assert measurements["has_pypi_badge"].requests == 0
+        assert measurements["readme"].requests > 0
+        assert measurements["default_branch"].requests == 1
+        assert sum(m.requests for m in measurements.values()) == mocker.call_count
+        mocker.reset_mock()
+
+
+def test_cli_profile_dir(mocker, tmp_path):
+    profile_dir = str(tmp_path / "profile")
+    with mocker:
+        result = CliRunner().invoke(cli, ["https://github.com/fair-software/does-not-exist", "--profile-dir",
+                                          profile_dir])
+
+    assert result.exit_code == 1
+    # stderr is part of the output
+    assert "phase" in result.output
+    assert "has_license" in result.output
+    with open(os.path.join(profile_dir, "profile.json")) as f:
+        assert json.load(f)["has_license"]["requests"] == 1
+    assert pstats.Stats(os.path.join(profile_dir, "howfairis.pstats")).total_calls > 0
+    tracemalloc.Snapshot.load(os.path.join(profile_dir, "howfairis.tracemalloc"))
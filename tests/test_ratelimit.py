@@ -0,0 +1,102 @@
+import threading
+import time
+import pytest
+from requests_mock import Mocker
+from howfairis import Session
+from howfairis.ratelimit import RateLimiter
+from howfairis.ratelimit import RateLimitExceeded
+
+
+url = "https://api.github.com/repos/fair-software/badge"
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr(time, "sleep", slept.append)
+    return slept
+
+
+def test_no_waiting_with_quota_left(requests_mock: Mocker, sleeps):
+    requests_mock.get(url, headers={"X-RateLimit-Remaining": "59", "X-RateLimit-Reset": str(time.time() + 600)})
+    session = Session()
+    assert session.get(url).status_code == 200
+    assert session.get(url).status_code == 200
+    assert sleeps == []
+
+
+def test_wait_for_reset_when_quota_runs_out(requests_mock: Mocker, sleeps):
+    reset = time.time() + 600
+    requests_mock.get(url, headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(reset)})
+    session = Session()
+    session.get(url)
+    assert sleeps == []
+    session.get(url)
+    assert len(sleeps) == 1 and 590 < sleeps[0] <= 600
+
+
+def test_retry_after_forbidden(requests_mock: Mocker, sleeps):
+    requests_mock.get(url, [dict(status_code=403, headers={"X-RateLimit-Remaining": "0",
+                                                           "X-RateLimit-Reset": str(time.time() + 30)}),
+                            dict(status_code=200, json=dict(default_branch="main"))])
+    response = Session().get(url)
+    assert response.status_code == 200
+    assert requests_mock.call_count == 2
+    assert len(sleeps) == 1 and 20 < sleeps[0] <= 30
+
+
+def test_retry_after_too_many_requests(requests_mock: Mocker, sleeps):
+    requests_mock.get(url, [dict(status_code=429, headers={"Retry-After": "5"}), dict(status_code=200)])
+    assert Session().get(url).status_code == 200
+    assert len(sleeps) == 1 and 4 < sleeps[0] <= 5
+
+
+def test_forbidden_without_rate_limit_is_not_retried(requests_mock: Mocker, sleeps):
+    requests_mock.get(url, status_code=403, headers={"X-RateLimit-Remaining": "10"})
+    assert Session().get(url).status_code == 403
+    assert requests_mock.call_count == 1
+    assert sleeps == []
+
+
+def test_gitlab_reset_in_seconds(requests_mock: Mocker, sleeps):
+    gitlab = "https://gitlab.com/api/v4/projects/jspaaks%2Fbadge-test"
+    requests_mock.get(gitlab, headers={"RateLimit-Remaining": "0", "RateLimit-Reset": "10"})
+    session = Session()
+    session.get(gitlab)
+    session.get(gitlab)
+    assert len(sleeps) == 1 and 9 < sleeps[0] <= 10
+
+
+def test_quotas_are_per_host(requests_mock: Mocker, sleeps):
+    requests_mock.get(url, headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(time.time() + 600)})
+    requests_mock.get("https://raw.githubusercontent.com/fair-software/badge/master/README.md")
+    session = Session()
+    session.get(url)
+    session.get("https://raw.githubusercontent.com/fair-software/badge/master/README.md")
+    assert sleeps == []
+
+
+def test_give_up_when_waiting_too_long(requests_mock: Mocker, sleeps):
+    requests_mock.get(url, status_code=403, headers={"X-RateLimit-Remaining": "0",
+                                                     "X-RateLimit-Reset": str(time.time() + 7200)})
+    with pytest.raises(RateLimitExceeded):
+        Session(rate_limiter=RateLimiter(max_wait=3600)).get(url)
+    assert sleeps == []
+
+
+def test_concurrent_requests_all_wait_for_reset(requests_mock: Mocker):
+    reset = time.time() + 1
+    requests_mock.get(url, headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(reset)})
+    session = Session()
+    session.get(url)
+
+    sent = []
+    requests_mock.get(url, text="", additional_matcher=lambda request: sent.append(time.time()) or True)
+    threads = [threading.Thread(target=session.get, args=(url,)) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(sent) == 5
+    assert min(sent) >= reset
@@ -0,0 +1,57 @@
+from howfairis import Checker
+from howfairis import Config
+from howfairis import Repo
+from howfairis.mixins.registry_mixin import MarkerScanner
+from howfairis.mixins.registry_mixin import marketplace_markers
+from tests.github.fair_software.does_not_exist.mocker import mocker
+
+
+url = "https://github.com/fair-software/does-not-exist"
+contents = "https://api.github.com/repos/fair-software/does-not-exist/contents"
+page = "<html>" + "x" * 100000 + "Use this GitHub Action with your project" + "y" * 100000 + \
+       "Add this Action to an existing workflow or create a new one." + "z" * 100000 + "</html>"
+
+
+def test_scanner_markers_across_chunks():
+    scanner = MarkerScanner([b"abcdef"])
+    assert scanner.feed(b"xxabc") is False
+    assert scanner.feed(b"defxx") is True
+    assert scanner.found_all is True
+
+
+def test_scanner_gives_up():
+    scanner = MarkerScanner(marketplace_markers, max_bytes=10)
+    assert scanner.feed(b"0123456789") is True
+    assert scanner.found_all is False
+
+
+def test_marketplace_page(mocker):
+    with mocker:
+        mocker.get(url, text=page)
+        repo = Repo(url)
+        assert Checker(Config(repo), repo).is_on_github_marketplace() is True
+
+
+def test_marketplace_page_over_budget(mocker, monkeypatch):
+    monkeypatch.setattr(MarkerScanner, "max_bytes", 1000)
+    with mocker:
+        mocker.get(url, text=page)
+        repo = Repo(url)
+        assert Checker(Config(repo), repo).is_on_github_marketplace() is False
+
+
+def test_marketplace_skipped_without_action(mocker):
+    with mocker:
+        mocker.get(contents, json=[dict(name="README.md", type="file")])
+        mocker.get(url, text=page)
+        repo = Repo(url)
+        assert Checker(Config(repo), repo).is_on_github_marketplace() is False
+        assert url not in [request.url for request in mocker.request_history]
+
+
+def test_marketplace_with_action(mocker):
+    with mocker:
+        mocker.get(contents, json=[dict(name="action.yml", type="file")])
+        mocker.get(url, text=page)
+        repo = Repo(url)
+        assert Checker(Config(repo), repo).is_on_github_marketplace() is True
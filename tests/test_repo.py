@@ -15,3 +15,19 @@ def test_github_platform(requests_mock: Mocker):
 
     repo = Repo('https://github.com/fair-software/howfairis')
     assert repo.platform == Platform.GITHUB, 'platform not GitHub'
+
+
+def test_no_requests_on_construction(requests_mock: Mocker):
+    requests_mock.get('https://api.github.com/repos/fair-software/howfairis', json={'default_branch': 'master'})
+
+    repo = Repo('https://github.com/fair-software/howfairis')
+    assert requests_mock.call_count == 0
+    assert repo.raw_url_format_string == 'https://raw.githubusercontent.com/fair-software/howfairis/master/{0}'
+    assert repo.default_branch == 'master'
+    assert requests_mock.call_count == 1
+
+
+def test_no_default_branch_request_when_branch_given(requests_mock: Mocker):
+    repo = Repo('https://github.com/fair-software/howfairis', branch='develop')
+    assert repo.raw_url_format_string == 'https://raw.githubusercontent.com/fair-software/howfairis/develop/{0}'
+    assert requests_mock.call_count == 0
@@ -0,0 +1,75 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+from colorama import Fore
+from colorama import Style
+from howfairis import Checker
+from howfairis import CollectingReporter
+from howfairis import Compliance
+from howfairis import Config
+from howfairis import ConsoleReporter
+from howfairis import NullReporter
+from howfairis import Repo
+from tests.github.fair_software.does_not_exist.mocker import mocker
+
+
+def test_console_reporter():
+    stream = io.StringIO()
+    reporter = ConsoleReporter(stream)
+    reporter.message("Using the configuration file .howfairis.yml")
+    reporter.recommendation(1, "repository")
+    reporter.sub_check("has_open_repository", True)
+    reporter.recommendation(2, "license", False)
+    reporter.sub_check("is_on_github_marketplace", None)
+    reporter.sub_check_skipped("has_open_repository", "offline")
+    assert stream.getvalue().splitlines() == [
+        "Using the configuration file .howfairis.yml",
+        "(1/5) repository",
+        "      " + Style.BRIGHT + Fore.GREEN + "\u2713 " + Style.RESET_ALL + "has_open_repository",
+        "(2/5) license: force False",
+        "      " + Style.BRIGHT + Fore.YELLOW + "? " + Style.RESET_ALL + "is_on_github_marketplace (did not finish)",
+        "      " + Style.DIM + "- " + Style.RESET_ALL + "has_open_repository (skipped when offline)"
+    ]
+
+
+def test_collecting_reporter_replay():
+    collector = CollectingReporter()
+    collector.recommendation(3, "registry")
+    collector.sub_check("has_pypi_badge", False)
+    assert collector.events == [("recommendation", 3, "registry", None), ("sub_check", "has_pypi_badge", False)]
+
+    stream = io.StringIO()
+    collector.replay(ConsoleReporter(stream))
+    assert stream.getvalue().startswith("(3/5) registry\n")
+
+
+def test_checker_null_reporter_prints_nothing(mocker, capsys):
+    with mocker:
+        repo = Repo("https://github.com/fair-software/does-not-exist")
+        reporter = NullReporter()
+        compliance = Checker(Config(repo, reporter=reporter), repo, parallel=True,
+                             reporter=reporter).check_five_recommendations()
+
+    assert compliance == Compliance()
+    assert capsys.readouterr().out == ""
+
+
+def test_checker_collecting_reporter(mocker):
+    with mocker:
+        repo = Repo("https://github.com/fair-software/does-not-exist")
+        serial = CollectingReporter()
+        Checker(Config(repo, reporter=NullReporter()), repo, reporter=serial).check_five_recommendations()
+        parallel = CollectingReporter()
+        Checker(Config(repo, reporter=NullReporter()), repo, parallel=True,
+                reporter=parallel).check_five_recommendations()
+
+    assert parallel.events == serial.events
+    assert [event[1] for event in serial.events if event[0] == "recommendation"] == [1, 2, 3, 4, 5]
+    assert ("sub_check", "has_pypi_badge", False) in serial.events
+
+
+def test_compliance_iteration_is_reentrant():
+    compliance = Compliance(repository=True, citation=True)
+    assert [(a, b) for a in compliance for b in compliance].count((True, True)) == 4
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: list(compliance), range(100)))
+    assert all(result == [True, False, False, True, False] for result in results)
@@ -0,0 +1,125 @@
+import pytest
+from requests_mock import Mocker
+from howfairis import Checker
+from howfairis import Compliance
+from howfairis import Config
+from howfairis import Repo
+from howfairis.batch import check_repository
+from howfairis.readme_format import ReadmeFormat
+from howfairis.result_cache import ResultCache
+
+
+sha = "b3f90ec9c2b1be604f482c2d9e46a9aeca3ee45a"
+api = "https://api.github.com/repos/fair-software/badge"
+raw = "https://raw.githubusercontent.com/fair-software/badge/master/"
+pinned = "https://raw.githubusercontent.com/fair-software/badge/" + sha + "/"
+badge = "https://img.shields.io/badge/fair--software.eu-" + \
+        "%E2%97%8F%20%20%E2%97%8F%20%20%E2%97%8B%20%20%E2%97%8B%20%20%E2%97%8B-orange"
+
+
+@pytest.fixture
+def mocked_badge(requests_mock: Mocker):
+    requests_mock.get(api, json=dict(default_branch="master"))
+    requests_mock.get(api + "/commits/HEAD", text=sha, request_headers={"Accept": "application/vnd.github.sha"})
+    requests_mock.head(api + "/license")
+    requests_mock.get(api + "/contents", json=[dict(name="README.md", type="file"), dict(name="docs", type="dir")])
+    requests_mock.get("https://github.com/fair-software/badge")
+    requests_mock.get(raw + ".howfairis.yml", status_code=404)
+    requests_mock.get(pinned + "README.rst", status_code=404)
+    requests_mock.get(pinned + "README.md",
+                      text="![pypi](https://img.shields.io/pypi/v/badge.svg)\n![fair](" + badge + ")")
+    for filename in [".howfairis.yml", "CITATION", "CITATION.cff", "codemeta.json", ".zenodo.json"]:
+        requests_mock.get(pinned + filename, status_code=404)
+    return requests_mock
+
+
+def test_github_sha(mocked_badge):
+    assert Repo("https://github.com/fair-software/badge").sha == sha
+
+
+def test_sha_given_as_branch(mocked_badge):
+    repo = Repo("https://github.com/fair-software/badge", branch=sha)
+    n_requests = mocked_badge.call_count
+    assert repo.sha == sha
+    assert mocked_badge.call_count == n_requests
+
+
+def test_gitlab_sha(requests_mock: Mocker):
+    gitlab_api = "https://gitlab.com/api/v4/projects/jspaaks%2Fbadge-test"
+    requests_mock.get(gitlab_api, json=dict(default_branch="master"))
+    requests_mock.get(gitlab_api + "/repository/commits/feature%2Fx", json=dict(id=sha))
+    assert Repo("https://gitlab.com/jspaaks/badge-test", branch="feature/x").sha == sha
+
+
+def test_unchanged_commit_is_not_checked_again(mocked_badge, tmp_path):
+    result_cache = ResultCache(str(tmp_path))
+    repo = Repo("https://github.com/fair-software/badge")
+    compliance = Checker(Config(repo), repo, result_cache=result_cache).check_five_recommendations()
+    assert compliance == Compliance(repository=True, license_=True, registry=True)
+
+    mocked_badge.reset_mock()
+    repo = Repo("https://github.com/fair-software/badge")
+    checker = Checker(Config(repo), repo, result_cache=result_cache)
+    cached_compliance = checker.check_five_recommendations()
+
+    assert cached_compliance.registry is True
+    assert cached_compliance.citation is False
+    # what the badge needs is stored with the result, so the README is not retrieved again
+    assert checker.readme.filename == "README.md"
+    assert checker.readme.fmt == ReadmeFormat.MARKDOWN
+    assert checker.readme.get_compliance() == Compliance(repository=True, license_=True)
+    assert [request.url for request in mocked_badge.request_history] == [api, raw + ".howfairis.yml",
+                                                                         api + "/commits/HEAD"]
+
+
+def test_cache_hit_takes_two_requests(mocked_badge, tmp_path):
+    result_cache = ResultCache(str(tmp_path))
+    check_repository("https://github.com/fair-software/badge", result_cache=result_cache)
+
+    mocked_badge.reset_mock()
+    result = check_repository("https://github.com/fair-software/badge", result_cache=result_cache)
+
+    assert result.compliance == Compliance(repository=True, license_=True, registry=True)
+    assert result.branch == "master"
+    assert [request.url for request in mocked_badge.request_history] == [api + "/commits/HEAD",
+                                                                         pinned + ".howfairis.yml"]
+
+
+def test_failed_request_is_not_stored(mocked_badge, tmp_path):
+    result_cache = ResultCache(str(tmp_path))
+    mocked_badge.get(pinned + "README.md", status_code=500)
+    repo = Repo("https://github.com/fair-software/badge")
+    compliance = Checker(Config(repo), repo, result_cache=result_cache).check_five_recommendations()
+
+    assert "has_pypi_badge" in compliance.unfinished
+    assert result_cache.get(ResultCache.key(repo, Config(repo))) is None
+
+
+def test_old_result_is_not_used(mocked_badge, tmp_path):
+    repo = Repo("https://github.com/fair-software/badge")
+    key = ResultCache.key(repo, Config(repo))
+    ResultCache(str(tmp_path)).put(key, Compliance(repository=True))
+    assert ResultCache(str(tmp_path)).get(key) is not None
+    assert ResultCache(str(tmp_path), max_age=-1).get(key) is None
+
+
+def test_files_are_read_at_the_commit(mocked_badge, tmp_path):
+    repo = Repo("https://github.com/fair-software/badge")
+    Checker(Config(repo), repo, result_cache=ResultCache(str(tmp_path))).check_five_recommendations()
+
+    assert repo.is_pinned
+    readme_requests = [request.url for request in mocked_badge.request_history if "README" in request.url]
+    assert readme_requests == [pinned + "README.md"]
+    contents_request = [request for request in mocked_badge.request_history if request.url.startswith(api + "/c")][-1]
+    assert contents_request.qs["ref"] == [sha]
+
+
+def test_different_config_is_checked_again(mocked_badge, tmp_path):
+    result_cache = ResultCache(str(tmp_path))
+    repo = Repo("https://github.com/fair-software/badge")
+    config = Config(repo)
+    key = ResultCache.key(repo, config)
+    config._merged["force_citation"] = True  # pylint: disable=protected-access
+    assert ResultCache.key(repo, config) != key
+    Checker(config, repo, result_cache=result_cache).check_five_recommendations()
+    assert result_cache.get(key) is None
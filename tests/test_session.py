@@ -0,0 +1,114 @@
+import time
+import pytest
+import requests
+from requests_mock import Mocker
+from howfairis import Checker
+from howfairis import Config
+from howfairis import Repo
+from howfairis import Session
+from howfairis.session import DeadlineExceeded
+from howfairis.session import get_default_session
+from howfairis.session import within_deadline
+from tests.github.fair_software.does_not_exist.mocker import mocker
+
+
+def test_default_session_is_shared(requests_mock: Mocker):
+    requests_mock.get('https://api.github.com/repos/fair-software/howfairis', json={'default_branch': 'master'})
+    requests_mock.get('https://api.github.com/repos/fair-software/badge', json={'default_branch': 'master'})
+
+    repo1 = Repo('https://github.com/fair-software/howfairis')
+    repo2 = Repo('https://github.com/fair-software/badge')
+    assert repo1.session is repo2.session
+    assert repo1.session is get_default_session()
+
+
+def test_session_headers():
+    session = Session(headers={'Authorization': 'token abc'})
+    assert session.headers['Authorization'] == 'token abc'
+    assert session.headers['User-Agent'].startswith('howfairis/')
+
+
+def test_custom_session_used_for_all_requests(mocker):
+    with mocker:
+        session = Session(headers={'X-Custom': 'yes'})
+        repo = Repo('https://github.com/fair-software/does-not-exist', session=session)
+        config = Config(repo)
+        checker = Checker(config, repo)
+        checker.check_five_recommendations()
+
+        assert mocker.call_count == 19
+        assert all(request.headers.get('X-Custom') == 'yes' for request in mocker.request_history)
+
+
+def test_default_timeout(requests_mock: Mocker):
+    requests_mock.get('https://api.github.com/repos/fair-software/howfairis')
+    Session(connect_timeout=2, read_timeout=7).get('https://api.github.com/repos/fair-software/howfairis')
+    assert requests_mock.last_request.timeout == (2, 7)
+    Session().get('https://api.github.com/repos/fair-software/howfairis', timeout=1)
+    assert requests_mock.last_request.timeout == 1
+
+
+def test_timeout_capped_by_deadline(requests_mock: Mocker):
+    requests_mock.get('https://api.github.com/repos/fair-software/howfairis')
+    with within_deadline(time.monotonic() + 3):
+        Session(connect_timeout=2, read_timeout=7).get('https://api.github.com/repos/fair-software/howfairis')
+    connect_timeout, read_timeout = requests_mock.last_request.timeout
+    assert connect_timeout == 2
+    assert 2 < read_timeout <= 3
+
+
+def test_no_request_past_deadline(requests_mock: Mocker):
+    requests_mock.get('https://api.github.com/repos/fair-software/howfairis')
+    with within_deadline(time.monotonic() + 60), within_deadline(time.monotonic()):
+        with pytest.raises(DeadlineExceeded):
+            Session().get('https://api.github.com/repos/fair-software/howfairis')
+    assert requests_mock.call_count == 0
+
+
+def test_no_retry_past_deadline(requests_mock: Mocker, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(time, 'sleep', sleeps.append)
+    url = 'https://api.github.com/repos/fair-software/howfairis'
+    requests_mock.get(url, status_code=503)
+    with within_deadline(time.monotonic() + 5):
+        assert Session(retries=2, backoff=1000).get(url).status_code == 503
+    assert requests_mock.call_count == 1
+    assert sleeps == []
+
+
+def test_retry_server_errors(requests_mock: Mocker, monkeypatch):
+    monkeypatch.setattr(time, 'sleep', lambda seconds: None)
+    url = 'https://api.github.com/repos/fair-software/howfairis'
+    requests_mock.get(url, [dict(status_code=502), dict(exc=requests.exceptions.ConnectTimeout), dict(status_code=200)])
+    assert Session(retries=2).get(url).status_code == 200
+    assert requests_mock.call_count == 3
+
+
+def test_retries_are_bounded(requests_mock: Mocker, monkeypatch):
+    monkeypatch.setattr(time, 'sleep', lambda seconds: None)
+    url = 'https://api.github.com/repos/fair-software/howfairis'
+    requests_mock.get(url, exc=requests.exceptions.ReadTimeout)
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        Session(retries=2).get(url)
+    assert requests_mock.call_count == 3
+
+
+def test_only_idempotent_requests_are_retried(requests_mock: Mocker, monkeypatch):
+    monkeypatch.setattr(time, 'sleep', lambda seconds: None)
+    url = 'https://api.github.com/graphql'
+    requests_mock.post(url, status_code=503)
+    assert Session(retries=2).post(url).status_code == 503
+    assert requests_mock.call_count == 1
+
+
+def test_base_urls(requests_mock: Mocker):
+    requests_mock.get('http://localhost:8000/api.github.com/repos/fair-software/badge', json={'default_branch': 'main'})
+    requests_mock.get('http://localhost:8000/raw/fair-software/badge/main/README.md', text='# badge')
+    session = Session(base_urls={'https://api.github.com': 'http://localhost:8000/api.github.com/',
+                                 'https://raw.githubusercontent.com/': 'http://localhost:8000/raw'})
+
+    repo = Repo('https://github.com/fair-software/badge', session=session)
+    assert repo.default_branch == 'main'
+    assert repo.get_text('README.md') == '# badge'
+    assert session.rebase('https://api.github.company.com/repos') == 'https://api.github.company.com/repos'
+    assert session.rebase('https://gitlab.com/jspaaks/badge-test') == 'https://gitlab.com/jspaaks/badge-test'